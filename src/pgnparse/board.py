@@ -0,0 +1,417 @@
+import random
+from typing import Final, final, override
+
+from pgnparse.san import InvalidSANError, decode_san
+
+__all__ = [
+    "BISHOP",
+    "BLACK",
+    "BLACK_KINGSIDE",
+    "BLACK_QUEENSIDE",
+    "EMPTY",
+    "KING",
+    "KNIGHT",
+    "PAWN",
+    "QUEEN",
+    "ROOK",
+    "WHITE",
+    "WHITE_KINGSIDE",
+    "WHITE_QUEENSIDE",
+    "Board",
+    "IllegalMoveError",
+    "parse_square",
+    "square_name",
+]
+
+# Pieces are packed into a single small integer: the lower 3 bits hold the piece kind,
+# and the 4th bit holds the color. This allows storing the whole board in a 64 byte bytearray.
+EMPTY: Final = 0
+PAWN: Final = 1
+KNIGHT: Final = 2
+BISHOP: Final = 3
+ROOK: Final = 4
+QUEEN: Final = 5
+KING: Final = 6
+
+WHITE: Final = 0
+BLACK: Final = 8
+
+# Castling rights bits
+WHITE_KINGSIDE: Final = 1
+WHITE_QUEENSIDE: Final = 2
+BLACK_KINGSIDE: Final = 4
+BLACK_QUEENSIDE: Final = 8
+
+_PIECE_LETTERS: Final = {"P": PAWN, "N": KNIGHT, "B": BISHOP, "R": ROOK, "Q": QUEEN, "K": KING}
+
+_STARTING_SQUARES: Final = bytes(
+    [ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK]
+    + [PAWN] * 8
+    + [EMPTY] * 32
+    + [PAWN | BLACK] * 8
+    + [ROOK | BLACK, KNIGHT | BLACK, BISHOP | BLACK, QUEEN | BLACK, KING | BLACK, BISHOP | BLACK, KNIGHT | BLACK]
+    + [ROOK | BLACK],
+)
+
+
+def square_name(square: int) -> str:
+    """Get the algebraic name of a square index (0 = a1, 63 = h8)."""
+    return "abcdefgh"[square & 7] + "12345678"[square >> 3]
+
+
+def parse_square(name: str) -> int:
+    """Get the square index (0 = a1, 63 = h8) from an algebraic square name."""
+    return (ord(name[1]) - ord("1")) * 8 + (ord(name[0]) - ord("a"))
+
+
+def _targets(square: int, offsets: tuple[tuple[int, int], ...]) -> tuple[int, ...]:
+    file, rank = square & 7, square >> 3
+    return tuple((rank + dr) * 8 + file + df for df, dr in offsets if 0 <= file + df < 8 and 0 <= rank + dr < 8)
+
+
+def _ray(square: int, df: int, dr: int) -> tuple[int, ...]:
+    file, rank = square & 7, square >> 3
+    ray: list[int] = []
+    while 0 <= (file := file + df) < 8 and 0 <= (rank := rank + dr) < 8:
+        ray.append(rank * 8 + file)
+    return tuple(ray)
+
+
+_KNIGHT_OFFSETS: Final = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+_KING_OFFSETS: Final = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+# Orthogonal directions come first (rook-like), followed by the diagonal ones (bishop-like)
+_RAY_DIRECTIONS: Final = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+_KNIGHT_TARGETS: Final = tuple(_targets(sq, _KNIGHT_OFFSETS) for sq in range(64))
+_KING_TARGETS: Final = tuple(_targets(sq, _KING_OFFSETS) for sq in range(64))
+_RAYS: Final = tuple(tuple(_ray(sq, df, dr) for df, dr in _RAY_DIRECTIONS) for sq in range(64))
+# Squares from which a pawn of given color would attack the indexed square
+_PAWN_ATTACKERS: Final = {
+    WHITE: tuple(_targets(sq, ((-1, -1), (1, -1))) for sq in range(64)),
+    BLACK: tuple(_targets(sq, ((-1, 1), (1, 1))) for sq in range(64)),
+}
+
+# Castling rights which remain after a piece moves from/to the indexed square
+_CASTLING_MASKS: Final = tuple(
+    {
+        0: ~WHITE_QUEENSIDE,
+        4: ~(WHITE_KINGSIDE | WHITE_QUEENSIDE),
+        7: ~WHITE_KINGSIDE,
+        56: ~BLACK_QUEENSIDE,
+        60: ~(BLACK_KINGSIDE | BLACK_QUEENSIDE),
+        63: ~BLACK_KINGSIDE,
+    }.get(sq, ~0)
+    & 0b1111
+    for sq in range(64)
+)
+
+# Zobrist keys are generated from a fixed seed, so that the hashes are stable across runs
+# (and can therefore be persisted to disk).
+_rng = random.Random(0x50474E_5A4F42)  # noqa: S311
+# Indexed by (piece << 6 | square); keys for the EMPTY piece are zeroes, so that they can be XORed freely
+_PIECE_KEYS: Final = tuple(0 if piece & 7 == EMPTY else _rng.getrandbits(64) for piece in range(16) for _ in range(64))
+_CASTLING_BASE_KEYS: Final = tuple(_rng.getrandbits(64) for _ in range(4))
+_CASTLING_KEYS: Final = tuple(
+    _CASTLING_BASE_KEYS[0] * (rights & 1)
+    ^ _CASTLING_BASE_KEYS[1] * (rights >> 1 & 1)
+    ^ _CASTLING_BASE_KEYS[2] * (rights >> 2 & 1)
+    ^ _CASTLING_BASE_KEYS[3] * (rights >> 3 & 1)
+    for rights in range(16)
+)
+_EN_PASSANT_KEYS: Final = tuple(_rng.getrandbits(64) for _ in range(8))
+_TURN_KEY: Final = _rng.getrandbits(64)
+del _rng
+
+
+class IllegalMoveError(ValueError):
+    """Raised when a move can't be played in the current position."""
+
+
+@final
+class Board:
+    """A compact chess board, capable of replaying SAN moves.
+
+    The squares are stored in a 64 byte bytearray, indexed from a1 (0) to h8 (63), with
+    each square holding a packed piece value (piece kind | color), or EMPTY.
+
+    The board also tracks a 64-bit Zobrist hash of the position, which is updated
+    incrementally as moves are played. The en-passant square only contributes to the
+    hash if an en-passant capture is actually possible, so that transpositions hash
+    to the same value regardless of the move order.
+    """
+
+    __slots__ = ("castling", "ep_square", "fullmove_number", "halfmove_clock", "squares", "turn", "zobrist")
+
+    squares: bytearray
+    turn: int
+    castling: int
+    ep_square: int
+    halfmove_clock: int
+    fullmove_number: int
+    zobrist: int
+
+    # The board is mutable, so it's compared by its position, but can't be hashed (use the zobrist hash instead)
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(
+        self,
+        squares: bytes | None = None,
+        turn: int = WHITE,
+        castling: int = WHITE_KINGSIDE | WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE,
+        ep_square: int = -1,
+        halfmove_clock: int = 0,
+        fullmove_number: int = 1,
+    ):
+        self.squares = bytearray(_STARTING_SQUARES if squares is None else squares)
+        self.turn = turn
+        self.castling = castling
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self.zobrist = self.compute_zobrist()
+
+    @override
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} zobrist={self.zobrist:#018x}>"
+
+    @override
+    def __eq__(self, other: object, /) -> bool:
+        if not isinstance(other, Board):
+            return NotImplemented
+
+        return (
+            self.squares == other.squares
+            and self.turn == other.turn
+            and self.castling == other.castling
+            and self.ep_square == other.ep_square
+            and self.halfmove_clock == other.halfmove_clock
+            and self.fullmove_number == other.fullmove_number
+        )
+
+    def copy(self) -> "Board":
+        """Create an independent copy of this board."""
+        board = Board.__new__(Board)
+        board.squares = self.squares[:]
+        board.turn = self.turn
+        board.castling = self.castling
+        board.ep_square = self.ep_square
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        board.zobrist = self.zobrist
+        return board
+
+    def compute_zobrist(self) -> int:
+        """Compute the Zobrist hash of the position from scratch.
+
+        This is mostly useful for verification, the hash is otherwise kept up to date
+        incrementally in the `zobrist` attribute.
+        """
+        h = 0
+        squares = self.squares
+        for square in range(64):
+            h ^= _PIECE_KEYS[squares[square] << 6 | square]
+        h ^= _CASTLING_KEYS[self.castling] ^ self._ep_key()
+        if self.turn == BLACK:
+            h ^= _TURN_KEY
+        return h
+
+    def _ep_key(self) -> int:
+        """Get the Zobrist key of the en-passant square, if an en-passant capture is possible."""
+        ep = self.ep_square
+        if ep == -1:
+            return 0
+
+        capturer = PAWN | self.turn
+        for square in _PAWN_ATTACKERS[self.turn][ep]:
+            if self.squares[square] == capturer:
+                return _EN_PASSANT_KEYS[ep & 7]
+        return 0
+
+    def king_square(self, color: int) -> int:
+        """Get the square of the king of given color (-1 if there is no such king)."""
+        return self.squares.find(KING | color)
+
+    def is_attacked(self, square: int, by: int) -> bool:
+        """Check whether the given square is attacked by any piece of given color."""
+        squares = self.squares
+
+        knight = KNIGHT | by
+        if any(squares[s] == knight for s in _KNIGHT_TARGETS[square]):
+            return True
+        king = KING | by
+        if any(squares[s] == king for s in _KING_TARGETS[square]):
+            return True
+        pawn = PAWN | by
+        if any(squares[s] == pawn for s in _PAWN_ATTACKERS[by][square]):
+            return True
+
+        queen = QUEEN | by
+        for direction, ray in enumerate(_RAYS[square]):
+            slider = ROOK | by if direction < 4 else BISHOP | by
+            for s in ray:
+                piece = squares[s]
+                if piece != EMPTY:
+                    if piece in (slider, queen):
+                        return True
+                    break
+        return False
+
+    def is_check(self) -> bool:
+        """Check whether the side to move is in check."""
+        king = self.king_square(self.turn)
+        return king != -1 and self.is_attacked(king, self.turn ^ BLACK)
+
+    def push_san(self, san: str) -> None:
+        """Play a move given in Standard Algebraic Notation (SAN).
+
+        Check and mate indicators are accepted, but not verified. The move is otherwise
+        validated only as far as needed to resolve it unambiguously.
+        """
+        try:
+            move = decode_san(san)
+        except InvalidSANError:
+            raise IllegalMoveError(f"Invalid SAN move: {san!r}") from None
+
+        if move.castling is not None:
+            self._castle(kingside=move.castling == "kingside", san=san)
+            return
+
+        promotion = 0 if move.promotion is None else _PIECE_LETTERS[move.promotion]
+        if move.piece == "P":
+            self._push_pawn(move.to, move.from_file, promotion, san)
+        else:
+            self._push_piece(_PIECE_LETTERS[move.piece], move.to, move.from_file, move.from_rank, san)
+
+    def _push_pawn(self, to: int, from_file: int, promotion: int, san: str) -> None:
+        squares = self.squares
+        pawn = PAWN | self.turn
+        forward = 8 if self.turn == WHITE else -8
+
+        if from_file == -1 or from_file == to & 7:
+            # Regular (single or double) push
+            if squares[to] != EMPTY:
+                raise IllegalMoveError(f"Pawn push to an occupied square: {san!r}")
+            frm = to - forward
+            if squares[frm] != pawn:
+                if squares[frm] != EMPTY or to >> 3 != (3 if self.turn == WHITE else 4):
+                    raise IllegalMoveError(f"No pawn can be pushed to the target square: {san!r}")
+                frm -= forward
+        else:
+            # Capture (including en-passant)
+            if abs(from_file - (to & 7)) != 1:
+                raise IllegalMoveError(f"Invalid pawn capture: {san!r}")
+            frm = ((to - forward) & ~7) | from_file
+            target = squares[to]
+            if to != self.ep_square and (target == EMPTY or target & BLACK == self.turn):
+                raise IllegalMoveError(f"Pawn capture without a capturable piece: {san!r}")
+
+        if squares[frm] != pawn:
+            raise IllegalMoveError(f"No pawn can make the move: {san!r}")
+        if (to >> 3 in (0, 7)) != (promotion != 0):
+            raise IllegalMoveError(f"Invalid pawn promotion: {san!r}")
+
+        self._make_move(frm, to, promotion)
+
+    def _push_piece(self, kind: int, to: int, from_file: int, from_rank: int, san: str) -> None:
+        squares = self.squares
+        piece = kind | self.turn
+
+        target = squares[to]
+        if target != EMPTY and target & BLACK == self.turn:
+            raise IllegalMoveError(f"Target square is occupied by own piece: {san!r}")
+
+        # Look for the pieces that could reach the target square, by searching outwards from it
+        candidates: list[int]
+        if kind == KNIGHT:
+            candidates = [s for s in _KNIGHT_TARGETS[to] if squares[s] == piece]
+        elif kind == KING:
+            candidates = [s for s in _KING_TARGETS[to] if squares[s] == piece]
+        else:
+            rays = _RAYS[to]
+            if kind == ROOK:
+                rays = rays[:4]
+            elif kind == BISHOP:
+                rays = rays[4:]
+            candidates = []
+            for ray in rays:
+                for s in ray:
+                    if squares[s] != EMPTY:
+                        if squares[s] == piece:
+                            candidates.append(s)
+                        break
+
+        if from_file != -1:
+            candidates = [s for s in candidates if s & 7 == from_file]
+        if from_rank != -1:
+            candidates = [s for s in candidates if s >> 3 == from_rank]
+
+        # SAN doesn't disambiguate between pieces, if the other piece is pinned
+        if len(candidates) > 1:
+            candidates = [s for s in candidates if self._is_safe_move(s, to)]
+
+        if len(candidates) != 1:
+            reason = "No piece" if len(candidates) == 0 else "Ambiguous move, multiple pieces"
+            raise IllegalMoveError(f"{reason} can make the move: {san!r}")
+
+        self._make_move(candidates[0], to)
+
+    def _is_safe_move(self, frm: int, to: int) -> bool:
+        """Check whether moving a piece doesn't leave own king in check (ignores en-passant)."""
+        squares = self.squares
+        moving, captured = squares[frm], squares[to]
+        squares[to], squares[frm] = moving, EMPTY
+        try:
+            king = to if moving & 7 == KING else self.king_square(self.turn)
+            return not self.is_attacked(king, self.turn ^ BLACK)
+        finally:
+            squares[frm], squares[to] = moving, captured
+
+    def _castle(self, *, kingside: bool, san: str) -> None:
+        squares = self.squares
+        king = self.king_square(self.turn)
+        back_rank = 0 if self.turn == WHITE else 56
+        if king != back_rank + 4:
+            raise IllegalMoveError(f"King can't castle from its current square: {san!r}")
+
+        rook_from, rook_to, king_to = (
+            (back_rank + 7, back_rank + 5, back_rank + 6) if kingside else (back_rank, back_rank + 3, back_rank + 2)
+        )
+        rook = ROOK | self.turn
+        between = range(king + 1, rook_from) if kingside else range(rook_from + 1, king)
+        if squares[rook_from] != rook or any(squares[s] != EMPTY for s in between):
+            raise IllegalMoveError(f"Castling is not possible: {san!r}")
+
+        squares[rook_from], squares[rook_to] = EMPTY, rook
+        self.zobrist ^= _PIECE_KEYS[rook << 6 | rook_from] ^ _PIECE_KEYS[rook << 6 | rook_to]
+        self._make_move(king, king_to)
+
+    def _make_move(self, frm: int, to: int, promotion: int = 0) -> None:
+        """Move a piece, updating all of the board state (including the Zobrist hash).
+
+        This doesn't perform any validation, it expects a valid move.
+        """
+        squares = self.squares
+        moving = squares[frm]
+        captured = squares[to]
+        h = self.zobrist ^ self._ep_key() ^ _CASTLING_KEYS[self.castling] ^ _TURN_KEY
+
+        if moving & 7 == PAWN and to == self.ep_square:
+            victim = to - 8 if self.turn == WHITE else to + 8
+            captured = squares[victim]
+            h ^= _PIECE_KEYS[captured << 6 | victim]
+            squares[victim] = EMPTY
+        else:
+            h ^= _PIECE_KEYS[captured << 6 | to]
+
+        placed = promotion | self.turn if promotion else moving
+        h ^= _PIECE_KEYS[moving << 6 | frm] ^ _PIECE_KEYS[placed << 6 | to]
+        squares[frm], squares[to] = EMPTY, placed
+
+        self.castling &= _CASTLING_MASKS[frm] & _CASTLING_MASKS[to]
+        self.ep_square = (frm + to) // 2 if moving & 7 == PAWN and abs(to - frm) == 16 else -1
+        self.halfmove_clock = 0 if moving & 7 == PAWN or captured != EMPTY else self.halfmove_clock + 1
+        if self.turn == BLACK:
+            self.fullmove_number += 1
+        self.turn ^= BLACK
+
+        self.zobrist = h ^ _CASTLING_KEYS[self.castling] ^ self._ep_key()
@@ -0,0 +1,249 @@
+import importlib
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from enum import IntEnum
+from os import PathLike
+from typing import Any, BinaryIO, Final, Literal
+
+from pgnparse.pgn import PGN, SEVEN_TAG_ROSTER
+
+__all__ = ["Batch", "iter_batches", "read_columnar", "write_columnar"]
+
+Batch = dict[str, list[Any]]
+"""A batch of games, as columns: the column names mapped to the lists of their values for each game."""
+
+_MAGIC: Final = b"PGNCOL01"
+_U8: Final = struct.Struct("<B")
+_U32: Final = struct.Struct("<I")
+_U64: Final = struct.Struct("<Q")
+
+
+class _Kind(IntEnum):
+    STRING = 0
+    STRING_LIST = 1
+    INT_LIST_LIST = 2
+
+
+_MOVE_COLUMNS: Final = {
+    "result": _Kind.STRING,
+    "moves": _Kind.STRING_LIST,
+    "annotations": _Kind.STRING_LIST,
+    "nags": _Kind.INT_LIST_LIST,
+    "comments": _Kind.STRING_LIST,
+    "movetext": _Kind.STRING,
+}
+
+
+def _schema(tags: Sequence[str]) -> dict[str, _Kind]:
+    schema = dict.fromkeys(tags, _Kind.STRING)
+    if duplicates := schema.keys() & _MOVE_COLUMNS.keys():
+        raise ValueError(f"Tags conflict with the move columns: {sorted(duplicates)}")
+    return schema | _MOVE_COLUMNS
+
+
+def iter_batches(
+    games: Iterable[PGN],
+    batch_size: int = 10_000,
+    tags: Sequence[str] = SEVEN_TAG_ROSTER,
+) -> Iterator[Batch]:
+    """Convert a stream of games into columnar batches of (at most) given size.
+
+    Each of the given tags becomes a column (with None for the games without the tag), followed
+    by the columns of the mainline moves of each game: "result", "moves" (a list of the move
+    strings), "annotations" (a list of the basic annotation, such as "!?", or None, for each
+    move), "nags" (a list of the numeric annotations of each move), "comments" (a list of the
+    comment, or None, for each move) and "movetext" (the full movetext, including the variations).
+    """
+    if batch_size < 1:
+        raise ValueError("The batch size must be positive")
+
+    names = list(_schema(tags))
+    batch: Batch = {name: [] for name in names}
+    tag_columns = [(tag, batch[tag]) for tag in tags]
+    results, moves, annotations, nags, comments, movetexts = (batch[name] for name in _MOVE_COLUMNS)
+
+    for game in games:
+        for tag, column in tag_columns:
+            column.append(game.tags.get(tag))
+
+        mainline = list(game.turns.mainline_moves())
+        results.append(game.result.value)
+        moves.append([move.move_string for move in mainline])
+        annotations.append([None if move.annotation is None else move.annotation.value for move in mainline])
+        nags.append([list(move.numeric_annotations) for move in mainline])
+        comments.append([move.comment for move in mainline])
+        movetexts.append(str(game.turns))
+
+        if len(results) == batch_size:
+            yield batch
+            batch = {name: [] for name in names}
+            tag_columns = [(tag, batch[tag]) for tag in tags]
+            results, moves, annotations, nags, comments, movetexts = (batch[name] for name in _MOVE_COLUMNS)
+
+    if results:
+        yield batch
+
+
+def write_columnar(
+    games: Iterable[PGN],
+    path: str | PathLike[str],
+    batch_size: int = 10_000,
+    tags: Sequence[str] = SEVEN_TAG_ROSTER,
+    file_format: Literal["auto", "parquet", "builtin"] = "auto",
+) -> int:
+    """Write a stream of games into a columnar file, in row groups of given size, returning the amount of games.
+
+    Only a single row group is held in memory at a time. The columns are described in `iter_batches`.
+
+    The file is written in the Parquet format when the optional `pyarrow` dependency is installed
+    (available as the `parquet` extra, i.e. `pip install pgnparse[parquet]`).
+    Otherwise (or when the "builtin" format is requested explicitly), a simple built-in columnar
+    format is used, which can be read back with `read_columnar`.
+    """
+    if file_format == "auto":
+        try:
+            _ = importlib.import_module("pyarrow")
+        except ImportError:
+            file_format = "builtin"
+        else:
+            file_format = "parquet"
+
+    batches = iter_batches(games, batch_size, tags)
+    if file_format == "parquet":
+        return _write_parquet(batches, path, tags, batch_size)
+
+    schema = _schema(tags)
+    count = 0
+    with open(path, "wb") as f:  # noqa: PTH123
+        _ = f.write(_MAGIC)
+        _ = f.write(_U32.pack(len(schema)))
+        for name, kind in schema.items():
+            _write_buffer(f, name.encode())
+            _ = f.write(_U8.pack(kind))
+
+        for batch in batches:
+            rows = len(batch["result"])
+            _ = f.write(_U64.pack(rows))
+            for name, kind in schema.items():
+                _write_column(f, kind, batch[name])
+            count += rows
+    return count
+
+
+def _write_parquet(batches: Iterable[Batch], path: str | PathLike[str], tags: Sequence[str], batch_size: int) -> int:
+    try:
+        pa = importlib.import_module("pyarrow")
+        pq = importlib.import_module("pyarrow.parquet")
+    except ImportError as exc:
+        raise ImportError(
+            "Writing Parquet files requires the optional pyarrow dependency (pgnparse[parquet])",
+        ) from exc
+
+    types = {
+        _Kind.STRING: pa.string(),
+        _Kind.STRING_LIST: pa.list_(pa.string()),
+        _Kind.INT_LIST_LIST: pa.list_(pa.list_(pa.int64())),
+    }
+    schema = pa.schema([(name, types[kind]) for name, kind in _schema(tags).items()])
+
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pydict(batch, schema), row_group_size=batch_size)
+            count += len(batch["result"])
+    return count
+
+
+def read_columnar(path: str | PathLike[str]) -> Iterator[Batch]:
+    """Read the row groups of a file written by `write_columnar` in the built-in format, as batches."""
+    with open(path, "rb") as f:  # noqa: PTH123
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Not a columnar games file: {path!s}")
+
+        schema: dict[str, _Kind] = {}
+        for _ in range(_read_struct(f, _U32)):
+            name = _read_buffer(f).decode()
+            schema[name] = _Kind(_read_struct(f, _U8))
+
+        while header := f.read(_U64.size):
+            (rows,) = _U64.unpack(header)
+            yield {name: _read_column(f, kind, rows) for name, kind in schema.items()}
+
+
+# The built-in format stores each column chunk as a few length-prefixed buffers, similarly to Arrow:
+# strings as a validity mask, offsets and the concatenated UTF-8 data, and lists as the offsets into
+# the flattened values, which are then stored as a column of their own.
+
+
+def _offsets(lengths: Iterable[int]) -> array[int]:
+    offsets = array("q", [0])
+    total = 0
+    for length in lengths:
+        total += length
+        offsets.append(total)
+    return offsets
+
+
+def _write_column(f: BinaryIO, kind: _Kind, values: list[Any]) -> None:
+    if kind is _Kind.STRING:
+        encoded = [b"" if value is None else value.encode() for value in values]
+        _write_buffer(f, bytes(value is not None for value in values))
+        _write_array(f, _offsets(map(len, encoded)))
+        _write_buffer(f, b"".join(encoded))
+    elif kind is _Kind.STRING_LIST:
+        _write_array(f, _offsets(map(len, values)))
+        _write_column(f, _Kind.STRING, [item for value in values for item in value])
+    else:
+        inner = [item for value in values for item in value]
+        _write_array(f, _offsets(map(len, values)))
+        _write_array(f, _offsets(map(len, inner)))
+        _write_array(f, array("q", [number for item in inner for number in item]))
+
+
+def _read_column(f: BinaryIO, kind: _Kind, rows: int) -> list[Any]:
+    if kind is _Kind.STRING:
+        validity = _read_buffer(f)
+        offsets = _read_array(f)
+        data = _read_buffer(f)
+        return [data[offsets[i] : offsets[i + 1]].decode() if validity[i] else None for i in range(rows)]
+
+    offsets = _read_array(f)
+    if kind is _Kind.STRING_LIST:
+        flat = _read_column(f, _Kind.STRING, offsets[-1])
+        return [flat[offsets[i] : offsets[i + 1]] for i in range(rows)]
+
+    inner_offsets = _read_array(f)
+    numbers = _read_array(f)
+    inner = [numbers[inner_offsets[i] : inner_offsets[i + 1]].tolist() for i in range(len(inner_offsets) - 1)]
+    return [inner[offsets[i] : offsets[i + 1]] for i in range(rows)]
+
+
+def _write_buffer(f: BinaryIO, data: bytes) -> None:
+    _ = f.write(_U64.pack(len(data)))
+    _ = f.write(data)
+
+
+def _read_buffer(f: BinaryIO) -> bytes:
+    return f.read(_read_struct(f, _U64))
+
+
+def _read_struct(f: BinaryIO, fmt: struct.Struct) -> int:
+    (value,) = fmt.unpack(f.read(fmt.size))
+    return value
+
+
+def _write_array(f: BinaryIO, values: array[int]) -> None:
+    if sys.byteorder == "big":
+        values = array("q", values)
+        values.byteswap()
+    _write_buffer(f, values.tobytes())
+
+
+def _read_array(f: BinaryIO) -> array[int]:
+    values = array("q")
+    values.frombytes(_read_buffer(f))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
@@ -0,0 +1,104 @@
+import math
+import re
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Final, final
+
+from pgnparse.pgn import PGN, PGNTurnList
+
+__all__ = ["GameCommands", "commands_from_comments", "extract_commands", "parse_commands"]
+
+_COMMAND_RE: Final = re.compile(r"\[%(\w+)\s+([^\]]*?)\s*\]")
+_STRIP_RE: Final = re.compile(r"\s*\[%\w+\s+[^\]]*\]")
+_NAN: Final = math.nan
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class GameCommands:
+    """The clock and engine data embedded in the comments of the mainline moves of a game.
+
+    Each array holds a value per mainline ply (indexed from 0, i.e. the same way as the
+    `pgnparse.pgn.Mainline` view), with NaN for the plies where the value is missing.
+    """
+
+    clocks: array[float]
+    """The remaining clock time after the move, in seconds (`[%clk 0:03:12]`)."""
+    elapsed: array[float]
+    """The time spent on the move, in seconds (`[%emt 0:00:05]`)."""
+    evals: array[float]
+    """The engine evaluation after the move, in pawns, from white's perspective (`[%eval 0.34]`).
+
+    The forced mates are recorded in `mates` instead, and are NaN here.
+    """
+    mates: array[float]
+    """The number of moves to a forced mate, positive if white mates, negative if black mates (`[%eval #-3]`)."""
+
+
+def parse_commands(comment: str) -> dict[str, str]:
+    """Get the embedded commands of a comment (e.g. `[%clk 0:03:12]`), as the command names mapped to the values."""
+    if "[%" not in comment:
+        return {}
+    return dict(_COMMAND_RE.findall(comment))
+
+
+def _parse_time(value: str) -> float:
+    seconds = 0.0
+    for part in value.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def commands_from_comments(comments: Iterable[str | None]) -> GameCommands:
+    """Extract the clock and engine data from the comments of the consecutive plies of a game.
+
+    This works with any source of the comments, e.g. with the `pgnparse.spans.MoveSpans` moves.
+    The malformed values are treated as missing.
+    """
+    commands = GameCommands(array("d"), array("d"), array("d"), array("d"))
+    clocks, elapsed, evals, mates = commands.clocks, commands.elapsed, commands.evals, commands.mates
+
+    for comment in comments:
+        clock = emt = evaluation = mate = _NAN
+        if comment and "[%" in comment:
+            for name, value in _COMMAND_RE.findall(comment):
+                try:
+                    if name == "clk":
+                        clock = _parse_time(value)
+                    elif name == "emt":
+                        emt = _parse_time(value)
+                    elif name == "eval":
+                        # The evaluation can be followed by the search depth (e.g. "0.34,18")
+                        value = value.partition(",")[0]  # noqa: PLW2901
+                        if value.startswith("#"):
+                            mate = float(int(value[1:]))
+                        else:
+                            evaluation = float(value)
+                except ValueError:
+                    continue
+
+        clocks.append(clock)
+        elapsed.append(emt)
+        evals.append(evaluation)
+        mates.append(mate)
+
+    return commands
+
+
+def extract_commands(game: PGN | PGNTurnList, *, strip: bool = False) -> GameCommands:
+    """Extract the clock and engine data from the comments of the mainline moves of a game.
+
+    The comments are scanned once, producing a value per mainline ply (see `GameCommands`).
+    With `strip`, all of the embedded commands are removed from the stored comments of the
+    mainline moves, with the comments left empty by that being removed entirely.
+    """
+    mainline = (game.turns if isinstance(game, PGN) else game).mainline()
+    commands = commands_from_comments(move.comment for move in mainline)
+
+    if strip:
+        for move in mainline:
+            if move.comment and "[%" in move.comment:
+                move.comment = _STRIP_RE.sub("", move.comment).strip() or None
+
+    return commands
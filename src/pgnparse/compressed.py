@@ -0,0 +1,202 @@
+import bz2
+import gzip
+import importlib
+import io
+import lzma
+import queue
+import threading
+import zipfile
+from collections.abc import Buffer, Callable
+from typing import BinaryIO, Final, cast, final, override
+
+__all__ = ["Decompressor", "detect_decompressor", "peekable", "prefetch", "register_decompressor"]
+
+Decompressor = Callable[[BinaryIO], BinaryIO]
+"""A function wrapping a compressed binary stream into a stream of the decompressed data."""
+
+_DECOMPRESSORS: Final[dict[bytes, Decompressor]] = {}
+_MAGIC_LENGTH: Final = 8
+
+
+def register_decompressor(magic: bytes, decompressor: Decompressor) -> None:
+    """Register a decompressor for the streams starting with given magic bytes.
+
+    This can be used to support additional formats (or to override the built-in decompressors),
+    e.g. the zstd format on Python versions before 3.14, through a third-party library:
+
+        register_decompressor(b"\\x28\\xb5\\x2f\\xfd", zstandard.ZstdDecompressor().stream_reader)
+    """
+    if not 0 < len(magic) <= _MAGIC_LENGTH:
+        raise ValueError(f"The magic bytes must be 1 to {_MAGIC_LENGTH} bytes long")
+    _DECOMPRESSORS[magic] = decompressor
+
+
+def _peek(f: BinaryIO, size: int) -> bytes | None:
+    """Get the first bytes of a stream, without consuming them (None if that's not possible)."""
+    peek: Callable[[int], bytes] | None = getattr(f, "peek", None)
+    if peek is not None:
+        return peek(size)[:size]
+    if f.seekable():
+        position = f.tell()
+        head = f.read(size)
+        _ = f.seek(position)
+        return head
+    return None
+
+
+def detect_decompressor(f: BinaryIO) -> Decompressor | None:
+    """Find the decompressor for a stream based on its magic bytes (None if the stream isn't compressed).
+
+    The stream must be peekable (buffered, or seekable), see `peekable`. Streams which can't be
+    peeked into are considered uncompressed.
+    """
+    head = _peek(f, _MAGIC_LENGTH)
+    if not head:
+        return None
+    for magic, decompressor in _DECOMPRESSORS.items():
+        if head.startswith(magic):
+            return decompressor
+    return None
+
+
+@final
+class _RawStream(io.RawIOBase):
+    """A raw stream reading from another (unbuffered) stream, allowing it to be buffered.
+
+    Closing this stream doesn't close the original one.
+    """
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+
+    @override
+    def readable(self) -> bool:
+        return True
+
+    @override
+    def readinto(self, buffer: Buffer, /) -> int:
+        data = self._f.read(memoryview(buffer).nbytes)
+        memoryview(buffer).cast("B")[: len(data)] = data
+        return len(data)
+
+
+def peekable(f: BinaryIO) -> BinaryIO:
+    """Make a stream peekable, so that its compression can be detected (see `detect_decompressor`).
+
+    The seekable streams and the streams with a `peek` method (e.g. `io.BufferedReader`) are
+    returned as they are. Other streams (e.g. HTTP responses or raw pipes) are wrapped into
+    a buffered reader, which doesn't close the original stream.
+    """
+    if hasattr(f, "peek") or f.seekable():
+        return f
+    return _as_binary_io(io.BufferedReader(_RawStream(f)))
+
+
+def _as_binary_io(stream: object) -> BinaryIO:
+    # The stdlib (de)compression streams are binary file objects, but they're not typed as BinaryIO
+    return cast("BinaryIO", stream)
+
+
+def _open_gzip(f: BinaryIO) -> BinaryIO:
+    return _as_binary_io(gzip.GzipFile(fileobj=f, mode="rb"))
+
+
+def _open_bz2(f: BinaryIO) -> BinaryIO:
+    return _as_binary_io(bz2.BZ2File(f))
+
+
+def _open_xz(f: BinaryIO) -> BinaryIO:
+    return _as_binary_io(lzma.LZMAFile(f))
+
+
+def _open_zstd(f: BinaryIO) -> BinaryIO:
+    try:
+        zstd = importlib.import_module("compression.zstd")
+    except ImportError:
+        raise ValueError(
+            "Reading zstd-compressed sources requires Python 3.14+, or registering a decompressor "
+            "from a third-party library (see register_decompressor)",
+        ) from None
+    return _as_binary_io(zstd.ZstdFile(f))
+
+
+def _open_zip(f: BinaryIO) -> BinaryIO:
+    """Open the PGN file inside of a zip archive (or the first file, if there's no .pgn file)."""
+    archive = zipfile.ZipFile(f)
+    members = [info for info in archive.infolist() if not info.is_dir()]
+    if not members:
+        raise ValueError("The zip archive is empty")
+    member = next((info for info in members if info.filename.lower().endswith(".pgn")), members[0])
+    return _as_binary_io(archive.open(member))
+
+
+register_decompressor(b"\x1f\x8b", _open_gzip)
+register_decompressor(b"BZh", _open_bz2)
+register_decompressor(b"\xfd7zXZ\x00", _open_xz)
+register_decompressor(b"\x28\xb5\x2f\xfd", _open_zstd)
+register_decompressor(b"PK\x03\x04", _open_zip)
+
+
+@final
+class _PrefetchStream(io.RawIOBase):
+    """A raw stream reading the chunks of another stream ahead of time, in a background thread."""
+
+    def __init__(self, f: BinaryIO, chunk_size: int, depth: int):
+        self._chunks: queue.Queue[bytes | BaseException] = queue.Queue(depth)
+        self._stop = threading.Event()
+        self._buffer = memoryview(b"")
+        self._done = False
+        self._thread = threading.Thread(target=self._produce, args=(f, chunk_size), daemon=True)
+        self._thread.start()
+
+    def _produce(self, f: BinaryIO, chunk_size: int) -> None:
+        item: bytes | BaseException
+        while not self._stop.is_set():
+            try:
+                item = f.read(chunk_size)
+            except BaseException as exc:  # noqa: BLE001 # re-raised in the reading thread
+                item = exc
+            while not self._stop.is_set():
+                try:
+                    self._chunks.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if not item or isinstance(item, BaseException):
+                return
+
+    @override
+    def readable(self) -> bool:
+        return True
+
+    @override
+    def readinto(self, buffer: Buffer, /) -> int:
+        if not self._buffer and not self._done:
+            item = self._chunks.get()
+            if isinstance(item, BaseException):
+                self._done = True
+                raise item
+            self._done = not item
+            self._buffer = memoryview(item)
+
+        size = min(len(self._buffer), memoryview(buffer).nbytes)
+        memoryview(buffer).cast("B")[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    @override
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+        super().close()
+
+
+def prefetch(f: BinaryIO, chunk_size: int = 1 << 20, depth: int = 4) -> BinaryIO:
+    """Wrap a stream, reading it ahead of time in a background thread.
+
+    This allows the reading (and the decompression, which releases the GIL) to overlap with
+    the processing of the already read data. Up to `depth` chunks are read ahead. Closing the
+    returned stream stops the background thread, but doesn't close the original stream.
+    """
+    return _as_binary_io(io.BufferedReader(_PrefetchStream(f, chunk_size, depth), chunk_size))
@@ -0,0 +1,159 @@
+import hashlib
+import math
+import mmap
+import os
+import re
+from collections.abc import Iterable, Iterator
+from os import PathLike
+from types import TracebackType
+from typing import Final, Self, final
+
+from pgnparse.pgn import PGN, PGNTurnList
+from pgnparse.reader import GameSource, RawGame, iter_games
+
+__all__ = ["BloomFilter", "Deduplicator", "canonical_movetext", "game_fingerprint"]
+
+_CASTLING_RE: Final = re.compile(r"[Oo0]-[Oo0](-[Oo0])?")
+
+
+def canonical_movetext(turns: PGNTurnList) -> str:
+    """Get a normalized representation of the mainline moves.
+
+    The representation only consists of the moves (no turn numbers, comments, annotations
+    or variations), with check/mate indicators removed, and castling written as "O-O".
+    """
+    moves: list[str] = []
+    for move in turns.mainline_moves():
+        move_string = move.move_string.rstrip("+#")
+        if move_string[0] in "Oo0":
+            move_string = _CASTLING_RE.sub(lambda m: "O-O-O" if m[1] else "O-O", move_string)
+        moves.append(move_string)
+    return " ".join(moves)
+
+
+def game_fingerprint(game: PGN, tags: Iterable[str] = ()) -> bytes:
+    """Compute a 16 byte fingerprint identifying a game by its (normalized) mainline moves.
+
+    The values of the given tags (stripped of surrounding whitespace) are included in the
+    fingerprint too, which can be used to tell apart games with the same moves, like short draws.
+    """
+    digest = hashlib.blake2b(canonical_movetext(game.turns).encode(), digest_size=16)
+    for tag in tags:
+        digest.update(b"\0" + game.tags.get(tag, "").strip().encode())
+    return digest.digest()
+
+
+@final
+class BloomFilter:
+    """A Bloom filter over fingerprints (at least 16 bytes long, such as the ones from `game_fingerprint`).
+
+    The filter needs a fixed amount of memory, based on the expected capacity and the acceptable
+    false positive rate. If a path is given, the bits are kept in a memory-mapped file instead,
+    allowing the filter to grow beyond the available memory (and to be reused later).
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001, path: str | PathLike[str] | None = None):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("Capacity must be positive and the error rate must be between 0 and 1")
+
+        self.bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        size = (self.bit_count + 7) // 8
+
+        if path is None:
+            self._bits: bytearray | mmap.mmap = bytearray(size)
+        else:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+                self._bits = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+
+    def _positions(self, fingerprint: bytes) -> Iterator[int]:
+        # Double hashing: derive all of the bit positions from two independent 64-bit halves
+        h1 = int.from_bytes(fingerprint[:8], "little")
+        h2 = int.from_bytes(fingerprint[8:16], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.bit_count
+
+    def __contains__(self, fingerprint: bytes) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(fingerprint))
+
+    def add(self, fingerprint: bytes) -> bool:
+        """Add a fingerprint, returning whether it was (probably) already present."""
+        bits = self._bits
+        present = True
+        for pos in self._positions(fingerprint):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                present = False
+                bits[pos >> 3] |= mask
+        return present
+
+    def close(self) -> None:
+        """Release the memory-mapped file, if one is used."""
+        if isinstance(self._bits, mmap.mmap):
+            self._bits.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+@final
+class Deduplicator:
+    """Detects duplicate games in a single streaming pass, based on their fingerprints.
+
+    By default, the fingerprints of all seen games are kept in a set, making the detection exact,
+    with the memory usage being proportional to the amount of unique games (though much lower than
+    holding the games themselves). For bounded memory usage, a `BloomFilter` can be given instead,
+    at the cost of occasionally reporting a unique game as a duplicate (with the configured rate).
+    """
+
+    def __init__(self, tags: Iterable[str] = (), bloom_filter: BloomFilter | None = None):
+        self.tags = tuple(tags)
+        self.unique_count = 0
+        self.duplicate_count = 0
+        self._bloom_filter = bloom_filter
+        self._seen: set[int] = set()
+
+    def add(self, game: PGN) -> bool:
+        """Record a game, returning whether it's a duplicate of one recorded before."""
+        fingerprint = game_fingerprint(game, self.tags)
+        if self._bloom_filter is not None:
+            duplicate = self._bloom_filter.add(fingerprint)
+        else:
+            key = int.from_bytes(fingerprint, "little")
+            duplicate = key in self._seen
+            self._seen.add(key)
+
+        if duplicate:
+            self.duplicate_count += 1
+        else:
+            self.unique_count += 1
+        return duplicate
+
+    def unique(self, games: Iterable[PGN]) -> Iterator[PGN]:
+        """Filter out the duplicate games."""
+        return (game for game in games if not self.add(game))
+
+    def unique_raw(self, source: GameSource) -> Iterator[RawGame]:
+        """Filter out the duplicate games of a multi-game source, producing the unique games as they are in the source.
+
+        This makes it possible to write out a deduplicated source, without re-serializing the games.
+        """
+        return (game for game in iter_games(source) if not self.add(game.parse()))
+
+    def duplicates_raw(self, source: GameSource) -> Iterator[RawGame]:
+        """Produce the duplicate games of a multi-game source (e.g. for reporting)."""
+        return (game for game in iter_games(source) if self.add(game.parse()))
@@ -0,0 +1,151 @@
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from operator import attrgetter
+from typing import Final, final
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as exc:
+    raise ImportError("The pgnparse.encoding module requires the optional NumPy dependency (pgnparse[numpy])") from exc
+
+from pgnparse.pgn import PGN, PGNGameResult
+
+__all__ = ["RESULT_LABELS", "EncodedGames", "MoveVocabulary", "encode_games", "iter_encoded_games"]
+
+RESULT_LABELS: Final = tuple(PGNGameResult)
+"""The game results, indexed by their labels (see `EncodedGames.results`)."""
+
+_RESULT_LABEL: Final = {result: label for label, result in enumerate(RESULT_LABELS)}
+_move_string: Final = attrgetter("move_string")
+_MAX_ELO: Final = (1 << 31) - 1
+
+
+@final
+class MoveVocabulary(dict[str, int]):
+    """A mapping of the move strings to their ids, used to encode the moves.
+
+    The id 0 is reserved for padding, and 1 for the unknown moves. The new moves are given
+    the next free ids as they are encountered, unless the vocabulary is frozen (e.g. when
+    encoding evaluation data with the vocabulary of the training data), in which case they
+    are encoded as unknown.
+    """
+
+    PAD: Final = 0
+    UNKNOWN: Final = 1
+
+    frozen: bool
+
+    def __init__(self, moves: Iterable[str] = (), *, frozen: bool = False):
+        super().__init__()
+        self.frozen = False
+        for move in moves:
+            _ = self[move]
+        self.frozen = frozen
+
+    def __missing__(self, move: str) -> int:
+        if self.frozen:
+            return self.UNKNOWN
+        move_id = self[move] = len(self) + 2
+        return move_id
+
+    def moves(self) -> list[str | None]:
+        """Get the move strings, indexed by their ids (None for the reserved ids)."""
+        moves: list[str | None] = [None] * (len(self) + 2)
+        for move, move_id in self.items():
+            moves[move_id] = move
+        return moves
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class EncodedGames:
+    """A batch of games, encoded into NumPy arrays (one row per game)."""
+
+    moves: npt.NDArray[np.int32]
+    """The ids of the mainline moves (see `MoveVocabulary`), as a `(n_games, max_plies)` array padded with 0."""
+    lengths: npt.NDArray[np.int32]
+    """The amount of the (encoded) mainline moves of each game."""
+    results: npt.NDArray[np.int8]
+    """The labels of the game results, as the indices into `RESULT_LABELS`."""
+    white_elo: npt.NDArray[np.int32]
+    """The Elo rating of the white player, from the WhiteElo tag (-1 if missing or not a number)."""
+    black_elo: npt.NDArray[np.int32]
+    """The Elo rating of the black player, from the BlackElo tag (-1 if missing or not a number)."""
+
+
+def _elo(tags: dict[str, str], tag: str) -> int:
+    value = tags.get(tag, "")
+    # The ratings which don't fit into the (int32) column are treated as missing
+    if not value.isdecimal() or len(value) > len(str(_MAX_ELO)):
+        return -1
+    elo = int(value)
+    return elo if elo <= _MAX_ELO else -1
+
+
+def encode_games(
+    games: Iterable[PGN],
+    vocabulary: MoveVocabulary | None = None,
+    max_plies: int | None = None,
+) -> EncodedGames:
+    """Encode a batch of games into NumPy arrays (see `EncodedGames`).
+
+    The move ids of all of the games are collected into a single flat buffer, which is then
+    scattered into the padded array at once. The games longer than `max_plies` are truncated
+    (by default, the array is as wide as the longest game).
+
+    Without a vocabulary, a new one is created for the batch. To encode multiple batches (or
+    a large stream of games, see `iter_encoded_games`) consistently, pass the same vocabulary.
+    """
+    if vocabulary is None:
+        vocabulary = MoveVocabulary()
+    lookup = vocabulary.__getitem__
+
+    flat = array("i")
+    lengths = array("i")
+    results = array("b")
+    white_elo = array("i")
+    black_elo = array("i")
+
+    for game in games:
+        mainline = game.turns.mainline()
+        if max_plies is not None:
+            mainline = mainline[:max_plies]
+        flat.extend(map(lookup, map(_move_string, mainline)))
+        lengths.append(len(mainline))
+        results.append(_RESULT_LABEL[game.result])
+        white_elo.append(_elo(game.tags, "WhiteElo"))
+        black_elo.append(_elo(game.tags, "BlackElo"))
+
+    lengths_array = np.frombuffer(lengths, dtype=np.int32)
+    width = int(lengths_array.max(initial=0)) if max_plies is None else max_plies
+    moves = np.zeros((len(lengths_array), width), dtype=np.int32)
+    # The mask selects the first `length` cells of each row, in the row-major order of the flat buffer
+    moves[np.arange(width) < lengths_array[:, np.newaxis]] = np.frombuffer(flat, dtype=np.int32)
+
+    return EncodedGames(
+        moves,
+        lengths_array,
+        np.frombuffer(results, dtype=np.int8),
+        np.frombuffer(white_elo, dtype=np.int32),
+        np.frombuffer(black_elo, dtype=np.int32),
+    )
+
+
+def iter_encoded_games(
+    games: Iterable[PGN],
+    batch_size: int = 1024,
+    vocabulary: MoveVocabulary | None = None,
+    max_plies: int | None = None,
+) -> Iterator[EncodedGames]:
+    """Encode a (large) stream of games into batches of given size, sharing a single vocabulary."""
+    if batch_size < 1:
+        raise ValueError("The batch size must be positive")
+    if vocabulary is None:
+        vocabulary = MoveVocabulary()
+
+    iterator = iter(games)
+    while batch := list(islice(iterator, batch_size)):
+        yield encode_games(batch, vocabulary, max_plies)
@@ -0,0 +1,138 @@
+from typing import Final
+
+from pgnparse.board import (
+    BLACK,
+    BLACK_KINGSIDE,
+    BLACK_QUEENSIDE,
+    Board,
+    EMPTY,
+    KING,
+    PAWN,
+    ROOK,
+    WHITE,
+    WHITE_KINGSIDE,
+    WHITE_QUEENSIDE,
+    parse_square,
+    square_name,
+)
+from pgnparse.pgn import PGN
+
+__all__ = ["STARTING_FEN", "InvalidFENError", "format_fen", "parse_fen", "starting_board"]
+
+STARTING_FEN: Final = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+_PIECE_CHARS: Final = "PNBRQK"
+_INVALID: Final = 0xFF
+
+# Translation table expanding the empty square digits into runs of dots
+_EXPAND_TABLE: Final = str.maketrans({str(n): "." * n for n in range(1, 9)})
+
+
+def _build_tables() -> tuple[bytes, bytes]:
+    """Build the translation tables between the FEN piece characters and the packed piece values."""
+    pieces = bytearray([_INVALID]) * 256
+    symbols = bytearray(b"?") * 256
+    pieces[ord(".")], symbols[EMPTY] = EMPTY, ord(".")
+    for kind, char in enumerate(_PIECE_CHARS, 1):
+        pieces[ord(char)], symbols[kind | WHITE] = kind | WHITE, ord(char)
+        pieces[ord(char.lower())], symbols[kind | BLACK] = kind | BLACK, ord(char.lower())
+    return bytes(pieces), bytes(symbols)
+
+
+_PIECE_TABLE, _SYMBOL_TABLE = _build_tables()
+
+_CASTLING_RIGHTS: Final = {"K": WHITE_KINGSIDE, "Q": WHITE_QUEENSIDE, "k": BLACK_KINGSIDE, "q": BLACK_QUEENSIDE}
+# The squares on which the king and the rook need to stand for each castling right
+_CASTLING_SQUARES: Final = {
+    WHITE_KINGSIDE: (4, 7, WHITE),
+    WHITE_QUEENSIDE: (4, 0, WHITE),
+    BLACK_KINGSIDE: (60, 63, BLACK),
+    BLACK_QUEENSIDE: (60, 56, BLACK),
+}
+
+
+class InvalidFENError(ValueError):
+    """Raised when a FEN string is malformed, or it describes an invalid position."""
+
+
+def parse_fen(fen: str) -> Board:
+    """Parse a FEN string into a board.
+
+    The halfmove clock and fullmove number fields are optional (defaulting to 0 and 1),
+    everything else is required and validated.
+    """
+    fields = fen.split()
+    if not 4 <= len(fields) <= 6:
+        raise InvalidFENError(f"Expected 4 to 6 space separated fields: {fen!r}")
+
+    ranks = fields[0].translate(_EXPAND_TABLE).split("/")
+    if len(ranks) != 8 or any(len(rank) != 8 for rank in ranks):
+        raise InvalidFENError(f"Piece placement doesn't describe 8 ranks of 8 squares: {fen!r}")
+
+    # FEN lists the ranks from the 8th down, the board squares are indexed from a1
+    ranks.reverse()
+    squares = "".join(ranks).encode("ascii", "replace").translate(_PIECE_TABLE)
+    if _INVALID in squares:
+        raise InvalidFENError(f"Invalid character in piece placement: {fen!r}")
+    if squares.count(KING | WHITE) != 1 or squares.count(KING | BLACK) != 1:
+        raise InvalidFENError(f"Each side must have exactly one king: {fen!r}")
+    if any(piece & 7 == PAWN for piece in squares[:8] + squares[56:]):
+        raise InvalidFENError(f"Pawns can't be placed on the first or last rank: {fen!r}")
+
+    if fields[1] not in ("w", "b"):
+        raise InvalidFENError(f"Invalid side to move: {fen!r}")
+    turn = WHITE if fields[1] == "w" else BLACK
+
+    castling = 0
+    if fields[2] != "-":
+        for char in fields[2]:
+            if (right := _CASTLING_RIGHTS.get(char, 0)) == 0 or castling & right:
+                raise InvalidFENError(f"Invalid castling availability: {fen!r}")
+            king, rook, color = _CASTLING_SQUARES[right]
+            if squares[king] != KING | color or squares[rook] != ROOK | color:
+                raise InvalidFENError(f"Castling right {char!r} without king and rook on their squares: {fen!r}")
+            castling |= right
+
+    ep_square = -1
+    if fields[3] != "-":
+        field = fields[3]
+        if len(field) != 2 or field[0] not in "abcdefgh" or field[1] != ("6" if turn == WHITE else "3"):
+            raise InvalidFENError(f"Invalid en-passant target square: {fen!r}")
+        ep_square = parse_square(field)
+        pawn_square = ep_square - 8 if turn == WHITE else ep_square + 8
+        if squares[pawn_square] != PAWN | (turn ^ BLACK):
+            raise InvalidFENError(f"En-passant target square without a pawn that passed it: {fen!r}")
+
+    try:
+        halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+        fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+    except ValueError:
+        raise InvalidFENError(f"Invalid move counters: {fen!r}") from None
+    if halfmove_clock < 0 or fullmove_number < 1:
+        raise InvalidFENError(f"Invalid move counters: {fen!r}")
+
+    return Board(squares, turn, castling, ep_square, halfmove_clock, fullmove_number)
+
+
+def format_fen(board: Board) -> str:
+    """Produce a FEN string describing the position on the board."""
+    symbols = bytes(board.squares).translate(_SYMBOL_TABLE).decode("ascii")
+    placement = "/".join(symbols[rank * 8 : rank * 8 + 8] for rank in range(7, -1, -1))
+    for n in range(8, 0, -1):
+        placement = placement.replace("." * n, str(n))
+
+    castling = "".join(char for char, right in _CASTLING_RIGHTS.items() if board.castling & right) or "-"
+    ep_square = "-" if board.ep_square == -1 else square_name(board.ep_square)
+    turn = "w" if board.turn == WHITE else "b"
+
+    return f"{placement} {turn} {castling} {ep_square} {board.halfmove_clock} {board.fullmove_number}"
+
+
+def starting_board(pgn: PGN) -> Board:
+    """Get the starting position of a game.
+
+    This is the position described by the FEN tag if present, or the standard starting position.
+    """
+    if (fen := pgn.tags.get("FEN")) is not None:
+        return parse_fen(fen)
+    return Board()
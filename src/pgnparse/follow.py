@@ -0,0 +1,170 @@
+import hashlib
+import io
+import json
+import os
+import re
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from os import PathLike
+from typing import Final, TypedDict, final
+
+from pgnparse.reader import RawGame, split_games, update_comment_state
+
+__all__ = ["CheckpointMismatchError", "FollowCheckpoint", "GameFollower"]
+
+# Matches a game termination marker at the very end of the movetext
+_RESULT_END_RE: Final = re.compile(rb"(?:^|\s)(?:1-0|0-1|1/2-1/2|\*)\s*\Z")
+
+
+class CheckpointMismatchError(ValueError):
+    """Raised when the followed file doesn't match the checkpoint (it was truncated or replaced)."""
+
+
+class _CheckpointDict(TypedDict):
+    offset: int
+    games: int
+    last_offset: int
+    digest: str
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class FollowCheckpoint:
+    """The position of a `GameFollower` in the followed file, persisted between the runs."""
+
+    offset: int = 0
+    """The byte offset right after the last consumed game."""
+    games: int = 0
+    """The amount of the consumed games."""
+    last_offset: int = 0
+    """The byte offset of the last consumed game (used to verify the file on resume)."""
+    digest: str = ""
+    """The hash of the raw data of the last consumed game (empty if no games were consumed yet)."""
+
+    def save(self, path: str | PathLike[str]) -> None:
+        """Persist the checkpoint into a JSON file (atomically, replacing the file)."""
+        data: _CheckpointDict = {
+            "offset": self.offset,
+            "games": self.games,
+            "last_offset": self.last_offset,
+            "digest": self.digest,
+        }
+        temporary = f"{os.fspath(path)}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:  # noqa: PTH123
+            json.dump(data, f)
+        os.replace(temporary, path)  # noqa: PTH105
+
+    @classmethod
+    def load(cls, path: str | PathLike[str]) -> "FollowCheckpoint":
+        """Load a checkpoint previously persisted with `save`."""
+        with open(path, encoding="utf-8") as f:  # noqa: PTH123
+            data: _CheckpointDict = json.load(f)
+        return cls(data["offset"], data["games"], data["last_offset"], data["digest"])
+
+
+def _is_complete(game: RawGame) -> bool:
+    """Check whether the (last) game of an append-only source is complete, i.e. its movetext ends with a result."""
+    if not game.data.endswith(b"\n") or _RESULT_END_RE.search(game.data) is None:
+        return False
+    # A result inside of an unterminated comment doesn't end the game
+    return not update_comment_state(game.data, in_comment=False)
+
+
+@final
+class GameFollower:
+    """Incrementally reads the games appended to a growing multi-game PGN file (like `tail -f`).
+
+    Each `poll` only reads the data appended since the previous one, producing the newly
+    completed games. A game is complete once the next game starts after it, or once its
+    (newline-terminated) movetext ends with a result. The incomplete game at the end of the
+    file is kept in memory and continued on the next poll.
+
+    The polled games are only marked as consumed with `commit`, once they were processed. With
+    a checkpoint path, the committed position is persisted (see `FollowCheckpoint`), so a
+    restarted follower resumes right after the last consumed game, without reading the earlier
+    games again, while the games polled but not committed are produced again (at-least-once
+    delivery). On resume, the last consumed game is verified against the file, raising
+    `CheckpointMismatchError` if the file was truncated or replaced (e.g. rotated).
+    """
+
+    def __init__(self, path: str | PathLike[str], checkpoint: str | PathLike[str] | None = None):
+        self.path = path
+        self.checkpoint_path = checkpoint
+        self.checkpoint = FollowCheckpoint()
+        if checkpoint is not None and os.path.exists(checkpoint):  # noqa: PTH110
+            self.checkpoint = FollowCheckpoint.load(checkpoint)
+            self._verify()
+
+        self.position = self.checkpoint
+        """The position after the last polled game (see `commit`)."""
+        self._pending = b""
+        self._read_offset = self.checkpoint.offset
+
+    def _verify(self) -> None:
+        checkpoint = self.checkpoint
+        with open(self.path, "rb") as f:  # noqa: PTH123
+            _ = f.seek(checkpoint.last_offset)
+            data = f.read(checkpoint.offset - checkpoint.last_offset)
+        if len(data) != checkpoint.offset - checkpoint.last_offset or (
+            checkpoint.digest and _digest(data) != checkpoint.digest
+        ):
+            raise CheckpointMismatchError(f"The file doesn't match the checkpoint: {self.path!s}")
+
+    def poll(self) -> list[RawGame]:
+        """Read the games completed since the last poll (in the order they appear in the file).
+
+        The games aren't marked as consumed until `commit` is called.
+        """
+        with open(self.path, "rb") as f:  # noqa: PTH123
+            size = f.seek(0, io.SEEK_END)
+            if size < self._read_offset:
+                raise CheckpointMismatchError(f"The file was truncated: {self.path!s}")
+            _ = f.seek(self._read_offset)
+            appended = f.read(size - self._read_offset)
+
+        self._read_offset += len(appended)
+        self._pending += appended
+        # Only the complete lines can be split, the last (partially written) line stays pending
+        data = self._pending[: self._pending.rfind(b"\n") + 1]
+
+        games = list(split_games(io.BytesIO(data), self.position.offset))
+        if games and not _is_complete(games[-1]):
+            _ = games.pop()
+        if not games:
+            return []
+
+        last = games[-1]
+        self._pending = self._pending[last.end - self.position.offset :]
+        self.position = FollowCheckpoint(
+            last.end,
+            self.position.games + len(games),
+            last.offset,
+            _digest(last.data),
+        )
+        return games
+
+    def commit(self) -> None:
+        """Mark the games polled so far as consumed, persisting their position into the checkpoint file (if any)."""
+        self.checkpoint = self.position
+        if self.checkpoint_path is not None:
+            self.checkpoint.save(self.checkpoint_path)
+
+    def follow(self, interval: float = 1.0, stop: Callable[[], bool] | None = None) -> Iterator[RawGame]:
+        """Keep polling the file for the new games, sleeping for `interval` seconds while there are none.
+
+        This runs until `stop` returns True (checked before each poll), or forever without it. The
+        games of each poll are committed once all of them were consumed (i.e. when the next game
+        is requested), so the games of an interrupted batch are produced again after a restart.
+        """
+        while stop is None or not stop():
+            games = self.poll()
+            if not games:
+                time.sleep(interval)
+                continue
+            yield from games
+            self.commit()
@@ -0,0 +1,214 @@
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any, cast, final, overload, override
+
+from pgnparse.pgn import PGNBasicAnnotation, PGNTurn, PGNTurnList, PGNTurnMove
+
+__all__ = ["FrozenTurn", "FrozenTurnList", "FrozenTurnMove", "freeze"]
+
+
+@final
+@dataclass(frozen=True, slots=True, eq=False)
+class FrozenTurnMove:
+    """An immutable, hashable variant of `PGNTurnMove`."""
+
+    move_string: str
+    annotation: PGNBasicAnnotation | None = None
+    numeric_annotations: tuple[int, ...] = ()
+    comment: str | None = None
+    _hash: int = field(init=False, repr=False)
+
+    def __post_init__(self):
+        key = (self.move_string, self.annotation, self.numeric_annotations, self.comment)
+        object.__setattr__(self, "_hash", hash(key))
+
+    @override
+    def __hash__(self) -> int:
+        return self._hash
+
+    @override
+    def __eq__(self, other: object, /) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, FrozenTurnMove):
+            return NotImplemented
+
+        return (
+            self._hash == other._hash
+            and self.move_string == other.move_string
+            and self.annotation == other.annotation
+            and self.numeric_annotations == other.numeric_annotations
+            and self.comment == other.comment
+        )
+
+    @override
+    def __str__(self) -> str:
+        return str(self.thaw())
+
+    @classmethod
+    def from_move(cls, move: PGNTurnMove) -> "FrozenTurnMove":
+        """Create a frozen copy of a mutable move."""
+        return cls(move.move_string, move.annotation, tuple(move.numeric_annotations), move.comment)
+
+    def thaw(self) -> PGNTurnMove:
+        """Create a mutable copy of this move."""
+        return PGNTurnMove(self.move_string, self.annotation, list(self.numeric_annotations), self.comment)
+
+
+@final
+@dataclass(frozen=True, slots=True, eq=False)
+class FrozenTurn:
+    """An immutable, hashable variant of `PGNTurn`."""
+
+    turn_number: int
+    white_move: FrozenTurnMove | None
+    black_move: FrozenTurnMove | None
+    _hash: int = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.white_move is None and self.black_move is None:
+            raise ValueError("Both white_move and black_move cannot be None")
+        object.__setattr__(self, "_hash", hash((self.turn_number, self.white_move, self.black_move)))
+
+    @override
+    def __hash__(self) -> int:
+        return self._hash
+
+    @override
+    def __eq__(self, other: object, /) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, FrozenTurn):
+            return NotImplemented
+
+        return (
+            self._hash == other._hash
+            and self.turn_number == other.turn_number
+            and self.white_move == other.white_move
+            and self.black_move == other.black_move
+        )
+
+    @override
+    def __str__(self) -> str:
+        return str(self.thaw())
+
+    def is_continuation(self) -> bool:
+        """Check if the turn is a continuation, i.e., the white move is omitted."""
+        return self.white_move is None
+
+    def thaw(self) -> PGNTurn:
+        """Create a mutable copy of this turn."""
+        return PGNTurn(
+            self.turn_number,
+            None if self.white_move is None else self.white_move.thaw(),
+            None if self.black_move is None else self.black_move.thaw(),
+        )
+
+
+@final
+class FrozenTurnList(Sequence["FrozenTurn | FrozenTurnList"]):
+    """An immutable, hashable variant of `PGNTurnList`.
+
+    The turns are stored in a tuple, so slicing shares the (immutable) turns and variations with
+    the original list, rather than copying them. The hash is computed once and cached, and the
+    comparisons short-circuit on identity and on differing hashes, making these cheap to use as
+    dict keys (e.g. to memoize analysis results per line).
+    """
+
+    __slots__ = ("_hash", "_turns")
+
+    def __init__(self, turns: Iterable["FrozenTurn | FrozenTurnList"] = ()):
+        self._turns = tuple(turns)
+        self._hash = hash(self._turns)
+
+    @overload
+    def __getitem__(self, index: int) -> "FrozenTurn | FrozenTurnList": ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "FrozenTurnList": ...
+
+    @override
+    def __getitem__(self, index: int | slice) -> "FrozenTurn | FrozenTurnList":
+        if isinstance(index, slice):
+            return FrozenTurnList(self._turns[index])
+        return self._turns[index]
+
+    @override
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    @override
+    def __iter__(self) -> Iterator["FrozenTurn | FrozenTurnList"]:
+        return iter(self._turns)
+
+    @override
+    def __hash__(self) -> int:
+        return self._hash
+
+    @override
+    def __eq__(self, other: object, /) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, FrozenTurnList):
+            return NotImplemented
+        return self._hash == other._hash and self._turns == other._turns
+
+    @override
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._turns})"
+
+    @override
+    def __str__(self) -> str:
+        return str(self.thaw())
+
+    def thaw(self) -> PGNTurnList:
+        """Create a mutable copy of this turn list."""
+        return PGNTurnList(turn.thaw() for turn in self)
+
+    def mainline_moves(self) -> Iterator[FrozenTurnMove]:
+        """Generate the moves of the mainline (in the order they were played), skipping all variations."""
+        for turn in self:
+            if isinstance(turn, FrozenTurn):
+                if turn.white_move is not None:
+                    yield turn.white_move
+                if turn.black_move is not None:
+                    yield turn.black_move
+
+
+@overload
+def freeze(obj: PGNTurnMove, interned: dict[Any, Any] | None = None) -> FrozenTurnMove: ...
+
+
+@overload
+def freeze(obj: PGNTurn, interned: dict[Any, Any] | None = None) -> FrozenTurn: ...
+
+
+@overload
+def freeze(obj: PGNTurnList, interned: dict[Any, Any] | None = None) -> FrozenTurnList: ...
+
+
+def freeze(
+    obj: PGNTurnMove | PGNTurn | PGNTurnList,
+    interned: dict[Any, Any] | None = None,
+) -> FrozenTurnMove | FrozenTurn | FrozenTurnList:
+    """Create a frozen copy of a move, turn, or a turn list (recursively, including the variations).
+
+    If an `interned` dict is given, equal frozen objects are shared: each created object is looked
+    up in the dict, and the already existing equal instance is reused if there is one. Passing the
+    same dict when freezing many games makes their common moves, turns and variations share the
+    same objects, reducing memory usage and making their comparisons identity checks.
+    """
+    if isinstance(obj, PGNTurnMove):
+        frozen = FrozenTurnMove.from_move(obj)
+    elif isinstance(obj, PGNTurn):
+        frozen = FrozenTurn(
+            obj.turn_number,
+            None if obj.white_move is None else freeze(obj.white_move, interned),
+            None if obj.black_move is None else freeze(obj.black_move, interned),
+        )
+    else:
+        frozen = FrozenTurnList(freeze(turn, interned) for turn in obj)
+
+    if interned is None:
+        return frozen
+    return cast("FrozenTurnMove | FrozenTurn | FrozenTurnList", interned.setdefault(frozen, frozen))
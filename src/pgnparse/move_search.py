@@ -0,0 +1,276 @@
+import fnmatch
+import re
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Final, final
+
+from pgnparse.pgn import PGN, PGNTurnList, PGNTurnMove
+from pgnparse.san import SANMove, decode_san
+
+__all__ = ["MoveIndex", "MovePattern", "MovePredicate"]
+
+MovePredicate = Callable[[SANMove], bool]
+"""A predicate over the structured decoding of a move (see `pgnparse.san.SANMove`)."""
+
+_GAP: Final = "*"
+_ANY: Final = "?"
+_GLOB_CHARS: Final = frozenset("*?[")
+
+
+def _strip_suffix(move_string: str) -> str:
+    return move_string.rstrip("+#")
+
+
+def _token_matcher(token: str) -> Callable[[str], bool]:
+    if token == _ANY:
+        return lambda _: True
+    if _GLOB_CHARS.intersection(token):
+        regex = re.compile(fnmatch.translate(token))
+        return lambda move_string: regex.match(move_string) is not None
+    if token.endswith(("+", "#")):
+        return lambda move_string: move_string == token
+    return lambda move_string: _strip_suffix(move_string) == token
+
+
+def _predicate_matcher(predicate: MovePredicate) -> Callable[[str], bool]:
+    return lambda move_string: predicate(decode_san(move_string))
+
+
+def _first_ply(turns: PGNTurnList) -> int:
+    return turns.mainline().ply_numbers.start
+
+
+@final
+class MovePattern:
+    """A pattern of a move sequence, compiled into an automaton matching the moves of the games.
+
+    The pattern is a sequence of elements (or a string of them, separated by whitespace):
+    - A move string, such as "Nxf7", matching the move exactly. The check and mate suffixes
+      are ignored, unless given in the pattern (so "Qh5" matches "Qh5+", but "Qh5+" doesn't
+      match "Qh5").
+    - A move string with glob wildcards (`fnmatch` style), such as "*=Q*" or "N?f7".
+    - "?", matching any single move, and "*", matching any number of moves (including none).
+    - A predicate over the structured decoding of the move (see `pgnparse.san.SANMove`), such
+      as `lambda move: move.promotion == "Q"` (only available when not using a string).
+
+    By default, the pattern can match anywhere in a line of moves; with `anchored`, it has to
+    match from the first move of the game (so a leading "*" allows any moves before the match).
+    With `before_ply`, the match has to end before given ply of the game (e.g. `before_ply=60`
+    for the matches within the first 59 plies).
+
+    The elements are compiled into a bit-parallel (Shift-And) automaton, with each distinct
+    move string only being tested against the elements once, so the matching itself is just
+    a dict lookup and a few integer operations per move.
+    """
+
+    def __init__(
+        self,
+        pattern: str | Sequence[str | MovePredicate],
+        *,
+        anchored: bool = False,
+        before_ply: int | None = None,
+    ):
+        elements = pattern.split() if isinstance(pattern, str) else list(pattern)
+        self.pattern = pattern
+        self.anchored = anchored
+        self.before_ply = before_ply
+
+        self._matchers: list[Callable[[str], bool]] = []
+        self._gaps = 0
+        self.required_runs: list[list[str]] = []
+        """The runs of the consecutive exact move strings (without their suffixes), required in each match."""
+
+        leading_gap = False
+        run: list[str] = []
+        for element in elements:
+            if element == _GAP:
+                if self._matchers:
+                    self._gaps |= 1 << (len(self._matchers) - 1)
+                else:
+                    leading_gap = True
+                run = []
+                continue
+
+            if isinstance(element, str):
+                self._matchers.append(_token_matcher(element))
+                if element != _ANY and not _GLOB_CHARS.intersection(element):
+                    if not run:
+                        self.required_runs.append(run)
+                    run.append(_strip_suffix(element))
+                    continue
+            else:
+                self._matchers.append(_predicate_matcher(element))
+            run = []
+
+        if not self._matchers:
+            raise ValueError("The pattern must contain at least one move")
+        self._final = 1 << (len(self._matchers) - 1)
+        # Without the anchoring (or with a leading gap), a match can start at any ply
+        self._start_anywhere = not anchored or leading_gap
+        self._masks: dict[str, int] = {}
+
+    def _mask(self, move_string: str) -> int:
+        """Get the bitmask of the pattern elements matching given move."""
+        mask = self._masks.get(move_string)
+        if mask is None:
+            mask = sum(1 << i for i, matcher in enumerate(self._matchers) if matcher(move_string))
+            self._masks[move_string] = mask
+        return mask
+
+    def _step(self, state: int, move: PGNTurnMove, start: bool) -> int:
+        return ((state << 1) | start) & self._mask(move.move_string) | state & self._gaps
+
+    def matches(self, game: PGN | PGNTurnList, *, variations: bool = False) -> bool:
+        """Check whether the mainline of a game (or any of its variations, too) matches the pattern."""
+        turns = game.turns if isinstance(game, PGN) else game
+        first_ply = _first_ply(turns)
+        if variations:
+            return self._match_tree(turns, [0], first_ply)
+
+        state = 0
+        final = self._final
+        before_ply = self.before_ply
+        mainline = turns.mainline()
+        for ply, move in zip(mainline.ply_numbers, mainline, strict=True):
+            if before_ply is not None and ply >= before_ply:
+                break
+            state = self._step(state, move, self._start_anywhere or ply == first_ply)
+            if state & final:
+                return True
+        return False
+
+    def _match_tree(self, turns: PGNTurnList, states: list[int], first_ply: int) -> bool:
+        # The states are the automaton states before each ply of the line, from the first ply of the game
+        for turn in turns:
+            if isinstance(turn, PGNTurnList):
+                # A variation is an alternative to the move at the ply of its first move, so it starts
+                # from the state before that ply
+                ply = turn.first_ply
+                if ply is not None and self._match_tree(turn, states[: max(ply - first_ply, 0) + 1], first_ply):
+                    return True
+                continue
+
+            for ply, move in ((2 * turn.turn_number - 1, turn.white_move), (2 * turn.turn_number, turn.black_move)):
+                if move is None or (self.before_ply is not None and ply >= self.before_ply):
+                    continue
+                del states[max(ply - first_ply, 0) + 1 :]
+                state = self._step(states[-1], move, self._start_anywhere or ply == first_ply)
+                if state & self._final:
+                    return True
+                states.append(state)
+        return False
+
+    def search(self, games: Iterable[PGN], *, variations: bool = False) -> Iterator[PGN]:
+        """Find the games matching the pattern (see `matches`)."""
+        return (game for game in games if self.matches(game, variations=variations))
+
+
+@final
+class MoveIndex:
+    """An n-gram inverted index over the moves of a game collection, speeding up the pattern searches.
+
+    Every run of `n` consecutive moves of the indexed games (in the mainline, and optionally in
+    the variations too) is mapped to the games containing it. A search then only runs the
+    pattern automaton over the candidate games, which contain all of the n-grams of the exact
+    move runs required by the pattern (see `MovePattern.required_runs`). The patterns without
+    any runs of at least `n` exact moves fall back to checking all of the games.
+
+    The moves are interned, with the n-grams being keyed by the tuples of the move ids, and
+    the postings (the indices of the games) kept in compact arrays.
+    """
+
+    def __init__(self, games: Iterable[PGN], n: int = 3, *, variations: bool = False):
+        if n < 1:
+            raise ValueError("The n-gram length must be positive")
+
+        self.n = n
+        self.variations = variations
+        self.games: list[PGN] = []
+        self._move_ids: dict[str, int] = {}
+        self._postings: dict[tuple[int, ...], array[int]] = {}
+
+        for game in games:
+            game_index = len(self.games)
+            self.games.append(game)
+            for ngram in self._ngrams(game.turns):
+                postings = self._postings.get(ngram)
+                if postings is None:
+                    postings = self._postings[ngram] = array("I")
+                if not postings or postings[-1] != game_index:
+                    postings.append(game_index)
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def _move_id(self, move: PGNTurnMove) -> int:
+        move_string = _strip_suffix(move.move_string)
+        move_id = self._move_ids.get(move_string)
+        if move_id is None:
+            move_id = self._move_ids[move_string] = len(self._move_ids)
+        return move_id
+
+    def _ngrams(self, turns: PGNTurnList) -> set[tuple[int, ...]]:
+        n = self.n
+        if not self.variations:
+            move_ids = list(map(self._move_id, turns.mainline()))
+            return {tuple(move_ids[i : i + n]) for i in range(len(move_ids) - n + 1)}
+
+        ngrams: set[tuple[int, ...]] = set()
+        self._collect_tree(turns, [()], _first_ply(turns), ngrams)
+        return ngrams
+
+    def _collect_tree(
+        self,
+        turns: PGNTurnList,
+        windows: list[tuple[int, ...]],
+        first_ply: int,
+        ngrams: set[tuple[int, ...]],
+    ) -> None:
+        # The windows are the last moves before each ply of the line, from the first ply of the game
+        for turn in turns:
+            if isinstance(turn, PGNTurnList):
+                # A variation is an alternative to the move at the ply of its first move, so it continues
+                # the window before that ply
+                ply = turn.first_ply
+                if ply is not None:
+                    self._collect_tree(turn, windows[: max(ply - first_ply, 0) + 1], first_ply, ngrams)
+                continue
+
+            for ply, move in ((2 * turn.turn_number - 1, turn.white_move), (2 * turn.turn_number, turn.black_move)):
+                if move is None:
+                    continue
+                del windows[max(ply - first_ply, 0) + 1 :]
+                window = (*windows[-1], self._move_id(move))[-self.n :]
+                if len(window) == self.n:
+                    ngrams.add(window)
+                windows.append(window)
+
+    def candidates(self, pattern: MovePattern) -> list[int]:
+        """Get the indices of the games which can match the pattern, based on the index alone."""
+        required: list[tuple[int, ...]] = []
+        for run in pattern.required_runs:
+            for start in range(len(run) - self.n + 1):
+                move_ids = [self._move_ids.get(move) for move in run[start : start + self.n]]
+                if any(move_id is None for move_id in move_ids):
+                    return []
+                required.append(tuple(move_id for move_id in move_ids if move_id is not None))
+
+        if not required:
+            return list(range(len(self.games)))
+
+        postings = sorted((self._postings.get(ngram, array("I")) for ngram in required), key=len)
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            candidates.intersection_update(other)
+            if not candidates:
+                break
+        return sorted(candidates)
+
+    def search(self, pattern: str | MovePattern) -> Iterator[PGN]:
+        """Find the indexed games matching the pattern, in the order they were indexed."""
+        if isinstance(pattern, str):
+            pattern = MovePattern(pattern)
+        for game_index in self.candidates(pattern):
+            game = self.games[game_index]
+            if pattern.matches(game, variations=self.variations):
+                yield game
@@ -0,0 +1,29 @@
+import json
+from collections.abc import Iterable, Iterator
+from typing import TextIO, cast
+
+from pgnparse.pgn import PGN, PGNDict
+
+__all__ = ["dump_ndjson", "load_ndjson"]
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dump_ndjson(games: Iterable[PGN], fp: TextIO) -> int:
+    """Write a stream of games as newline-delimited JSON (one `PGN.to_dict` object per line), returning the amount.
+
+    The games are written one by one, so the stream is never held in memory as a whole.
+    """
+    count = 0
+    for game in games:
+        _ = fp.write(_ENCODER.encode(game.to_dict()))
+        _ = fp.write("\n")
+        count += 1
+    return count
+
+
+def load_ndjson(fp: Iterable[str]) -> Iterator[PGN]:
+    """Read a stream of games written by `dump_ndjson` (the blank lines are skipped)."""
+    for line in fp:
+        if line.strip():
+            yield PGN.from_dict(cast("PGNDict", json.loads(line)))
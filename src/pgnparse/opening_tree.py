@@ -0,0 +1,251 @@
+import heapq
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from os import PathLike
+from typing import Final, final
+
+from pgnparse.pgn import PGN, PGNGameResult
+
+__all__ = ["OpeningStats", "OpeningTree"]
+
+_MAGIC: Final = b"PGNOTRE1"
+_HEADER: Final = struct.Struct("<8sIQQQ")
+_MAX_COUNT: Final = (1 << 64) - 1
+
+
+@final
+@dataclass
+class OpeningStats:
+    """Aggregated results of the games which went through a single move sequence."""
+
+    games: int = 0
+    white_wins: int = 0
+    draws: int = 0
+    black_wins: int = 0
+
+    @property
+    def score(self) -> float:
+        """The score from white's perspective (1 point for a win, 0.5 for a draw), over the decided games."""
+        decided = self.white_wins + self.draws + self.black_wins
+        return (self.white_wins + self.draws / 2) / decided if decided else 0.0
+
+
+@final
+class OpeningTree:
+    """A move tree aggregating the results of many games by their mainline move sequences.
+
+    Each node represents a move sequence (ply prefix) up to the configured depth. The nodes are
+    stored in flat arrays rather than as objects or dicts, with the children of each node kept
+    as a linked list of siblings, and with the moves interned, so a node only takes up a few
+    dozen bytes.
+
+    When `max_nodes` is set and the tree grows beyond it, the rarest sequences are pruned
+    (along with their continuations), making the memory usage bounded. The counts of the
+    remaining sequences are then lower bounds, see `prune_threshold`.
+
+    Trees built in parallel (e.g. in separate worker processes, over separate chunks of the
+    games) can be combined with `merge`, and persisted with `save` and `load`.
+    """
+
+    def __init__(self, max_depth: int = 20, max_nodes: int | None = None):
+        if max_nodes is not None and max_nodes < 1:
+            raise ValueError("The tree must be able to hold at least the root node")
+
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.prune_threshold = 0
+        """Sequences with fewer games than this may have been pruned (or had their counts reduced)."""
+
+        self._moves: list[str] = []
+        self._move_ids: dict[str, int] = {}
+        self._clear()
+        _ = self._add_node(-1, -1)
+
+    def _clear(self) -> None:
+        self._parent: array[int] = array("q")
+        self._move: array[int] = array("q")
+        self._first_child: array[int] = array("q")
+        self._next_sibling: array[int] = array("q")
+        self._games: array[int] = array("Q")
+        self._white_wins: array[int] = array("Q")
+        self._draws: array[int] = array("Q")
+        self._black_wins: array[int] = array("Q")
+
+    def __len__(self) -> int:
+        """Get the amount of nodes (move sequences) in the tree, including the root (empty sequence)."""
+        return len(self._parent)
+
+    def _add_node(self, parent: int, move: int) -> int:
+        node = len(self._parent)
+        self._parent.append(parent)
+        self._move.append(move)
+        self._first_child.append(-1)
+        self._next_sibling.append(-1 if parent == -1 else self._first_child[parent])
+        if parent != -1:
+            self._first_child[parent] = node
+        self._games.append(0)
+        self._white_wins.append(0)
+        self._draws.append(0)
+        self._black_wins.append(0)
+        return node
+
+    def _intern(self, move: str) -> int:
+        if (move_id := self._move_ids.get(move)) is None:
+            move_id = self._move_ids[move] = len(self._moves)
+            self._moves.append(move)
+        return move_id
+
+    def _child(self, node: int, move: int, create: bool) -> int:
+        child = self._first_child[node]
+        while child != -1:
+            if self._move[child] == move:
+                return child
+            child = self._next_sibling[child]
+        return self._add_node(node, move) if create else -1
+
+    def _find(self, moves: Sequence[str]) -> int:
+        node = 0
+        for move in moves:
+            if (move_id := self._move_ids.get(move)) is None:
+                return -1
+            node = self._child(node, move_id, create=False)
+            if node == -1:
+                return -1
+        return node
+
+    def _count(self, node: int, games: int, white_wins: int, draws: int, black_wins: int) -> None:
+        self._games[node] += games
+        self._white_wins[node] += white_wins
+        self._draws[node] += draws
+        self._black_wins[node] += black_wins
+
+    def _counts(self, node: int) -> tuple[int, int, int, int]:
+        return self._games[node], self._white_wins[node], self._draws[node], self._black_wins[node]
+
+    def add_game(self, game: PGN) -> None:
+        """Add the mainline moves (up to the maximum depth) and the result of a game to the tree."""
+        result = game.result
+        outcome = (
+            int(result is PGNGameResult.WHITE_WINS),
+            int(result is PGNGameResult.DRAW),
+            int(result is PGNGameResult.BLACK_WINS),
+        )
+
+        node = 0
+        self._count(node, 1, *outcome)
+        for depth, move in enumerate(game.turns.mainline_moves()):
+            if depth >= self.max_depth:
+                break
+            node = self._child(node, self._intern(move.move_string), create=True)
+            self._count(node, 1, *outcome)
+
+        self._enforce_budget()
+
+    def add_games(self, games: Iterable[PGN]) -> None:
+        """Add multiple games to the tree."""
+        for game in games:
+            self.add_game(game)
+
+    def merge(self, other: "OpeningTree") -> None:
+        """Add all of the sequences and results aggregated by another tree into this one."""
+        # Parents always precede their children, so they'll already be mapped when reached
+        mapping = [0] * len(other)
+        for node in range(1, len(other)):
+            move = self._intern(other._moves[other._move[node]])
+            mapped = mapping[node] = self._child(mapping[other._parent[node]], move, create=True)
+            self._count(mapped, *other._counts(node))
+        self._count(0, *other._counts(0))
+        self.prune_threshold = max(self.prune_threshold, other.prune_threshold)
+
+        self._enforce_budget()
+
+    def _enforce_budget(self) -> None:
+        if self.max_nodes is None or len(self) <= self.max_nodes:
+            return
+
+        # Prune down to half of the budget, to avoid pruning again after every few new nodes. A node is
+        # never played more often than its parent, so keeping the most played nodes keeps a valid tree.
+        keep = max(self.max_nodes // 2 - 1, 0)
+        counts = heapq.nlargest(keep + 1, self._games[1:])
+        self.prune(counts[keep] + 1 if keep < len(counts) else 1)
+
+    def prune(self, min_games: int) -> None:
+        """Remove all of the sequences (and their continuations) which were played in fewer than given games."""
+        old = (self._parent, self._move, self._games, self._white_wins, self._draws, self._black_wins)
+        parents, moves, games, white_wins, draws, black_wins = old
+        self._clear()
+
+        mapping = [-1] * len(parents)
+        for node in range(len(parents)):
+            parent = parents[node]
+            if node != 0 and (games[node] < min_games or mapping[parent] == -1):
+                continue
+            mapped = mapping[node] = self._add_node(-1 if parent == -1 else mapping[parent], moves[node])
+            self._count(mapped, games[node], white_wins[node], draws[node], black_wins[node])
+
+        self.prune_threshold = min(max(self.prune_threshold, min_games), _MAX_COUNT)
+
+    def stats(self, moves: Sequence[str] = ()) -> OpeningStats | None:
+        """Get the aggregated results of a move sequence (or None if it isn't in the tree)."""
+        node = self._find(moves)
+        if node == -1:
+            return None
+        return OpeningStats(*self._counts(node))
+
+    def continuations(self, moves: Sequence[str] = ()) -> list[tuple[str, OpeningStats]]:
+        """Get the moves played after a move sequence, with their aggregated results, most played first."""
+        node = self._find(moves)
+        if node == -1:
+            return []
+
+        result: list[tuple[str, OpeningStats]] = []
+        child = self._first_child[node]
+        while child != -1:
+            result.append((self._moves[self._move[child]], OpeningStats(*self._counts(child))))
+            child = self._next_sibling[child]
+
+        result.sort(key=lambda item: item[1].games, reverse=True)
+        return result
+
+    def save(self, path: str | PathLike[str]) -> None:
+        """Persist the tree into a binary file."""
+        moves = "\n".join(self._moves).encode()
+        with open(path, "wb") as f:  # noqa: PTH123
+            _ = f.write(_HEADER.pack(_MAGIC, self.max_depth, self.prune_threshold, len(self), len(moves)))
+            _ = f.write(moves)
+            for column in (self._parent, self._move, self._games, self._white_wins, self._draws, self._black_wins):
+                # The columns are stored in little-endian byte order
+                if sys.byteorder == "big":
+                    column = array(column.typecode, column)  # noqa: PLW2901
+                    column.byteswap()
+                column.tofile(f)
+
+    @classmethod
+    def load(cls, path: str | PathLike[str], max_nodes: int | None = None) -> "OpeningTree":
+        """Load a tree previously persisted with `save`."""
+        with open(path, "rb") as f:  # noqa: PTH123
+            magic, max_depth, prune_threshold, node_count, moves_length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"Not an opening tree file: {path!s}")
+
+            moves = f.read(moves_length).decode()
+            columns: list[array[int]] = [array(typecode) for typecode in "qqQQQQ"]
+            for column in columns:
+                column.fromfile(f, node_count)
+                if sys.byteorder == "big":
+                    column.byteswap()
+
+        tree = cls(max_depth, max_nodes)
+        tree.prune_threshold = prune_threshold
+        tree._moves = moves.split("\n") if moves else []
+        tree._move_ids = {move: move_id for move_id, move in enumerate(tree._moves)}
+        tree._clear()
+
+        parents, move_column, games, white_wins, draws, black_wins = columns
+        for node in range(node_count):
+            _ = tree._add_node(parents[node], move_column[node])
+            tree._count(node, games[node], white_wins[node], draws[node], black_wins[node])
+        return tree
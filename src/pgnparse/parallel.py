@@ -0,0 +1,137 @@
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import batched, chain
+from os import PathLike
+from typing import Final, Literal
+
+from pgnparse.compressed import detect_decompressor
+from pgnparse.pgn import PGN
+from pgnparse.reader import game_ranges, read_range
+
+__all__ = ["DEFAULT_CHUNK_SIZE", "parse_file", "parse_many"]
+
+DEFAULT_CHUNK_SIZE: Final = 32 << 20
+"""The default size of the byte ranges of a file parsed by a single task (32 MiB)."""
+
+
+def _map_bounded[T, R](executor: Executor, fn: Callable[[T], R], items: Iterable[T], window: int) -> Iterator[R]:
+    """Map a function over the items in an executor, producing the results in order.
+
+    Unlike `Executor.map`, this doesn't consume all of the items up front, only keeping at most
+    `window` tasks in flight, so the memory usage stays bounded for arbitrarily long inputs.
+    """
+    pending: deque[Future[R]] = deque()
+    try:
+        for item in items:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(executor.submit(fn, item))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            _ = future.cancel()
+
+
+def _window(max_workers: int | None) -> int:
+    return 2 * (max_workers or os.cpu_count() or 1)
+
+
+def _parse_batch(texts: tuple[str, ...]) -> list[PGN]:
+    return [PGN.from_string(text) for text in texts]
+
+
+def parse_many(
+    texts: Iterable[str],
+    executor: Literal["thread", "process"] | Executor | None = None,
+    max_workers: int | None = None,
+    chunksize: int = 16,
+) -> Iterator[PGN]:
+    """Parse multiple PGN games, optionally in parallel, producing the games in the original order.
+
+    The executor can be:
+    - `None`: the games are parsed one by one, in the current thread.
+    - `"thread"`: the games are parsed in a thread pool. Each thread uses its own parser instance
+      (see `pgnparse.pgn.get_parser`). On free-threaded Python builds, this scales across the cores,
+      without the overhead of sending the parsed games between processes.
+    - `"process"`: the games are parsed in a process pool, with the parsed games being pickled back.
+    - An existing executor, which is used as it is (and not shut down).
+
+    The games are sent to the workers in batches of `chunksize` games. The texts are consumed
+    lazily, with at most two batches per worker (`max_workers`, or the CPU count by default)
+    being in flight at once, so the memory usage doesn't grow with the amount of the games
+    (e.g. when parsing the games of a large file from `pgnparse.reader.iter_games`).
+    """
+    if executor is None:
+        return map(PGN.from_string, texts)
+
+    window = _window(max_workers)
+    if not isinstance(executor, str):
+        return chain.from_iterable(_map_bounded(executor, _parse_batch, batched(texts, chunksize), window))
+
+    if executor == "thread":
+        return _parse_in_pool(ThreadPoolExecutor(max_workers), texts, chunksize, window)
+    return _parse_in_pool(ProcessPoolExecutor(max_workers), texts, chunksize, window)
+
+
+def _parse_in_pool(pool: Executor, texts: Iterable[str], chunksize: int, window: int) -> Iterator[PGN]:
+    with pool:
+        for games in _map_bounded(pool, _parse_batch, batched(texts, chunksize), window):
+            yield from games
+
+
+def parse_file(
+    path: str | PathLike[str],
+    executor: Literal["thread", "process"] | Executor | None = "process",
+    max_workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[PGN]:
+    """Parse all games of a (large) multi-game PGN file in parallel, producing them in the original order.
+
+    The file is divided into byte ranges of roughly `chunk_size` bytes, aligned to the game starts
+    by a single lightweight scan (see `pgnparse.reader.game_ranges`), and each worker reads and
+    parses the games of its range independently. Unlike `parse_many`, there's no single reader
+    splitting the games in front of the workers, so the reading and splitting scales with the
+    workers too.
+
+    The ranges are submitted lazily, with at most two ranges per worker in flight at once, so the
+    memory usage depends on the chunk size and the amount of the workers, not on the file size.
+
+    The executor can be any of the ones supported by `parse_many`. The file can't be compressed,
+    as the compressed data can't be split into independent byte ranges (use `parse_many` over
+    `pgnparse.reader.iter_games` for those instead).
+    """
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be positive")
+    with open(path, "rb") as f:  # noqa: PTH123
+        if detect_decompressor(f) is not None:
+            raise ValueError("Compressed files can't be split into byte ranges")
+
+    ranges = ((path, start, end) for start, end in game_ranges(path, chunk_size))
+
+    if executor is None:
+        return chain.from_iterable(map(_parse_range, ranges))
+
+    window = _window(max_workers)
+    if not isinstance(executor, str):
+        return chain.from_iterable(_map_bounded(executor, _parse_range, ranges, window))
+
+    pool = ThreadPoolExecutor(max_workers) if executor == "thread" else ProcessPoolExecutor(max_workers)
+    return _parse_ranges_in_pool(pool, ranges, window)
+
+
+def _parse_range(byte_range: tuple[str | PathLike[str], int, int]) -> list[PGN]:
+    path, start, end = byte_range
+    return [game.parse() for game in read_range(path, start, end, aligned=True)]
+
+
+def _parse_ranges_in_pool(
+    pool: Executor,
+    ranges: Iterable[tuple[str | PathLike[str], int, int]],
+    window: int,
+) -> Iterator[PGN]:
+    with pool:
+        for games in _map_bounded(pool, _parse_range, ranges, window):
+            yield from games
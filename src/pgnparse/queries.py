@@ -0,0 +1,114 @@
+import operator
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, replace
+from fnmatch import fnmatchcase
+from functools import partial
+from typing import final
+
+from pgnparse.pgn import PGN
+from pgnparse.reader import GameSource, RawGame, iter_games
+
+__all__ = ["Query", "query"]
+
+TagPredicate = Callable[[str], bool]
+
+
+@final
+@dataclass(frozen=True)
+class Query:
+    """A lazily evaluated, composable query over the games of a multi-game PGN source.
+
+    Each of the refining methods returns a new query, leaving the original one unchanged.
+
+    The tag conditions are pushed down into a header-only scan of each game, so the movetext
+    is only parsed for the games which match all of them. Note that file object sources can
+    only be consumed once, so such queries can only be iterated once.
+    """
+
+    source: GameSource
+    tag_predicates: tuple[tuple[str, TagPredicate], ...] = ()
+    game_predicates: tuple[Callable[[PGN], bool], ...] = ()
+    max_results: int | None = None
+
+    def where(self, predicate: Callable[[PGN], bool] | None = None, /, **tags: str | TagPredicate) -> "Query":
+        """Only keep the games matching given conditions.
+
+        The keyword arguments are tag conditions, with the value being either the exact value
+        of the tag, or a predicate receiving the tag value. Games without the tag never match.
+
+        The optional positional predicate receives the fully parsed game. As it can't be pushed
+        down, it requires parsing all of the games which match the tag conditions.
+        """
+        tag_predicates = tuple(
+            (name, partial(operator.eq, condition) if isinstance(condition, str) else condition)
+            for name, condition in tags.items()
+        )
+        game_predicates = self.game_predicates if predicate is None else (*self.game_predicates, predicate)
+        return replace(
+            self,
+            tag_predicates=self.tag_predicates + tag_predicates,
+            game_predicates=game_predicates,
+        )
+
+    def where_tag(self, name: str, pattern: str) -> "Query":
+        """Only keep the games with given tag matching a (case-sensitive) glob pattern, like "Carlsen*"."""
+        return self.where(**{name: partial(fnmatchcase, pat=pattern)})
+
+    def where_eco(self, pattern: str) -> "Query":
+        """Only keep the games with an ECO code matching a glob pattern, like "B2*"."""
+        return self.where_tag("ECO", pattern)
+
+    def limit(self, count: int) -> "Query":
+        """Stop after given amount of matching games."""
+        if count < 0:
+            raise ValueError("Limit can't be negative")
+        if self.max_results is not None:
+            count = min(count, self.max_results)
+        return replace(self, max_results=count)
+
+    def _matching(self) -> Iterator[tuple[RawGame, PGN | None]]:
+        """Generate the matching raw games, along with the parsed game if parsing was already needed."""
+        remaining = self.max_results
+        if remaining == 0:
+            return
+
+        for raw in iter_games(self.source):
+            if self.tag_predicates:
+                tags = raw.tags()
+                if not all(name in tags and predicate(tags[name]) for name, predicate in self.tag_predicates):
+                    continue
+
+            pgn = None
+            if self.game_predicates:
+                pgn = raw.parse()
+                if not all(predicate(pgn) for predicate in self.game_predicates):
+                    continue
+
+            yield raw, pgn
+
+            if remaining is not None:
+                remaining -= 1
+                if remaining == 0:
+                    return
+
+    def __iter__(self) -> Iterator[PGN]:
+        for raw, pgn in self._matching():
+            yield raw.parse() if pgn is None else pgn
+
+    def raw(self) -> Iterator[RawGame]:
+        """Generate the matching games without parsing them (unless a game predicate needs it)."""
+        for raw, _ in self._matching():
+            yield raw
+
+    def count(self) -> int:
+        """Count the matching games (without parsing them, unless a game predicate needs it)."""
+        return sum(1 for _ in self._matching())
+
+    def first(self) -> PGN | None:
+        """Get the first matching game, or None if there isn't any."""
+        return next(iter(self.limit(1)), None)
+
+
+def query(source: GameSource) -> Query:
+    """Start a query over the games of a multi-game PGN source (file path, bytes or binary file object)."""
+    return Query(source)
@@ -0,0 +1,288 @@
+import io
+import re
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from os import PathLike
+from typing import BinaryIO, Final, final
+
+from pgnparse.compressed import detect_decompressor, peekable, prefetch as prefetch_stream
+from pgnparse.pgn import PGN
+
+__all__ = [
+    "GameSource",
+    "RawGame",
+    "game_ranges",
+    "iter_games",
+    "open_source",
+    "parse_tags",
+    "read_games_at",
+    "read_range",
+    "split_games",
+    "update_comment_state",
+]
+
+GameSource = str | PathLike[str] | bytes | BinaryIO
+"""A source of (possibly multiple) PGN games: a file path, the raw file content, or a binary file object."""
+
+# Matches the tag section (tag lines and blank lines) at the start of a game
+_TAG_SECTION_RE: Final = re.compile(rb"(?:[ \t]*(?:\[[^\n]*\])?[ \t]*(?:\r?\n|\Z))*")
+_TAG_RE: Final = re.compile(rb'\[([A-Za-z][A-Za-z0-9-]*)\s+"((?:[^"\\\n]|\\.)*)"\]')
+_BRACE_RE: Final = re.compile(rb"[{}]")
+
+
+def parse_tags(data: bytes) -> dict[str, str]:
+    """Extract the tags of a raw PGN game, without looking at its movetext.
+
+    The tag values are kept exactly as they are in the source (escape sequences are not
+    processed), matching the values produced by the full parser in `PGN.tags`. If a tag
+    is repeated, the first value is used.
+    """
+    header = _TAG_SECTION_RE.match(data)
+    tags: dict[str, str] = {}
+    for match in _TAG_RE.finditer(data, 0, header.end() if header else 0):
+        _ = tags.setdefault(match[1].decode(), match[2].decode("utf-8", "replace"))
+    return tags
+
+
+@final
+@dataclass
+class RawGame:
+    """A single unparsed game from a multi-game PGN source.
+
+    This holds the raw bytes of the game, along with the byte offset at which the game starts
+    in the source. The game can be parsed on demand, allowing cheap filtering before parsing.
+    """
+
+    offset: int
+    data: bytes
+
+    @property
+    def end(self) -> int:
+        """Byte offset right after the end of this game in the source."""
+        return self.offset + len(self.data)
+
+    @property
+    def text(self) -> str:
+        """The raw game, decoded as UTF-8."""
+        return self.data.decode("utf-8", "replace")
+
+    def tags(self) -> dict[str, str]:
+        """Extract the tags of the game, without parsing the movetext."""
+        return parse_tags(self.data)
+
+    def parse(self) -> PGN:
+        """Fully parse the game."""
+        return PGN.from_string(self.text)
+
+
+@contextmanager
+def open_source(source: GameSource, prefetch: bool = False) -> Generator[BinaryIO]:
+    """Open a game source as a binary file object.
+
+    Paths are opened (and closed on exit), raw bytes are wrapped in an in-memory stream,
+    and file objects are used as they are (they're not closed), except for being buffered if
+    they're neither buffered nor seekable (see `pgnparse.compressed.peekable`).
+
+    Compressed sources (gzip, bz2, xz, zip, and zstd on Python 3.14+, or any other format
+    registered with `pgnparse.compressed.register_decompressor`) are detected by their magic
+    bytes, and decompressed on the fly, in a streaming manner. With `prefetch`, the source
+    is read (and decompressed) ahead of time in a background thread, overlapping it with the
+    processing of the games.
+    """
+    with ExitStack() as stack:
+        if isinstance(source, bytes):
+            f: BinaryIO = io.BytesIO(source)
+        elif isinstance(source, (str, PathLike)):
+            f = stack.enter_context(open(source, "rb"))  # noqa: PTH123
+        else:
+            f = peekable(source)
+
+        if (decompressor := detect_decompressor(f)) is not None:
+            f = stack.enter_context(decompressor(f))
+        if prefetch:
+            f = stack.enter_context(prefetch_stream(f))
+        yield f
+
+
+def update_comment_state(line: bytes, in_comment: bool) -> bool:
+    """Check whether the line ends inside of a brace comment, given whether it started in one."""
+    pos = 0
+    while True:
+        pos = line.find(b"}" if in_comment else b"{", pos)
+        if pos == -1:
+            return in_comment
+        in_comment = not in_comment
+        pos += 1
+
+
+def split_games(lines: Iterable[bytes], offset: int = 0) -> Iterator[RawGame]:
+    """Split the lines of a multi-game PGN source into raw games.
+
+    A new game starts with a tag line (a line beginning with '[') which follows the movetext
+    of the previous game. Tag-like lines inside of multi-line brace comments are recognized
+    and don't start a new game. Blank lines before a game are skipped.
+
+    The offset is the byte position of the first line in the source.
+    """
+    chunk: list[bytes] = []
+    start = offset
+    in_movetext = in_comment = False
+
+    for line in lines:
+        stripped = line.strip()
+        if not chunk and not stripped:
+            offset += len(line)
+            start = offset
+            continue
+
+        is_tag = not in_comment and stripped.startswith(b"[")
+        if is_tag and in_movetext:
+            yield RawGame(start, b"".join(chunk))
+            chunk.clear()
+            start = offset
+            in_movetext = False
+
+        chunk.append(line)
+        offset += len(line)
+
+        if not is_tag and stripped:
+            in_movetext = True
+            if in_comment or b"{" in line:
+                in_comment = update_comment_state(line, in_comment)
+
+    if chunk:
+        yield RawGame(start, b"".join(chunk))
+
+
+def iter_games(source: GameSource, prefetch: bool = False) -> Iterator[RawGame]:
+    """Iterate over the (unparsed) games of a multi-game PGN source.
+
+    The source is read line by line, so arbitrarily large files can be processed. Compressed
+    sources are decompressed on the fly, see `open_source` (also for `prefetch`).
+    """
+    with open_source(source, prefetch) as f:
+        yield from split_games(f)
+
+
+def read_games_at(source: GameSource, offsets: Iterable[int]) -> Iterator[RawGame]:
+    """Read the games starting at given byte offsets of a seekable PGN source.
+
+    This is meant to be used with offsets obtained from `RawGame.offset` (e.g. through an index),
+    allowing random access to the games without scanning the whole source.
+    """
+    with open_source(source) as f:
+        for offset in offsets:
+            _ = f.seek(offset)
+            game = next(split_games(f, offset), None)
+            if game is None:
+                raise ValueError(f"No game found at offset {offset}")
+            yield game
+
+
+def _next_game_start(f: BinaryIO, pos: int) -> int:
+    """Find the offset of the first game starting after given position in a seekable source.
+
+    A game is considered to start at a tag line following a blank line, outside of a brace
+    comment, which itself must start after the given position. Games which aren't separated
+    by a blank line are not found, they're treated as a part of the preceding game. If there
+    is no such game, the offset of the end of the source is returned.
+
+    The position can be inside of a multi-line comment, which is only recognized once its
+    closing brace is found. A tag-like line found before the first closing brace is therefore
+    only a candidate, discarded if the brace turns out to be unmatched (closing a comment which
+    started before the position), and accepted on a matched closing brace or at the end of the
+    source. Without any closing brace after the position, the rest of the source is scanned
+    (see `game_ranges` for aligning many ranges in a single pass instead).
+    """
+    if pos <= 0:
+        return 0
+
+    # Skip to the start of the next line (unless already at a line start)
+    _ = f.seek(pos - 1)
+    offset = pos - 1 + len(f.readline())
+
+    candidate = -1
+    after_blank = in_comment = known = False
+    while line := f.readline():
+        stripped = line.strip()
+        if not in_comment and stripped.startswith(b"["):
+            if after_blank:
+                if known:
+                    return offset
+                # Further tag-like lines could still be inside of the same comment as the candidate
+                if candidate == -1:
+                    candidate = offset
+        elif b"{" in line or b"}" in line:
+            for brace in _BRACE_RE.findall(line):
+                if brace == b"{":
+                    in_comment = True
+                    continue
+                if not in_comment and not known:
+                    # An unmatched closing brace, the position was inside of a comment
+                    candidate = -1
+                in_comment = False
+                known = True
+            if known and candidate != -1:
+                return candidate
+
+        after_blank = not stripped
+        offset += len(line)
+    return offset if candidate == -1 else candidate
+
+
+def _lines_until(f: BinaryIO, end: int) -> Iterator[bytes]:
+    offset = f.tell()
+    while offset < end and (line := f.readline()):
+        offset += len(line)
+        yield line
+
+
+def read_range(source: GameSource, start: int, end: int, *, aligned: bool = False) -> Iterator[RawGame]:
+    """Read the games starting within given byte range of a seekable PGN source.
+
+    The range doesn't need to be aligned to the games: both of its ends are moved forward to the
+    nearest game start (a tag line following a blank line). Reading adjacent ranges therefore
+    produces each game exactly once, which allows splitting a single large source between
+    multiple workers, each reading its own part independently.
+
+    With `aligned`, both ends must already be game starts (e.g. the ranges from `game_ranges`),
+    and are used as they are.
+    """
+    with open_source(source) as f:
+        if not aligned:
+            start = _next_game_start(f, start)
+            end = _next_game_start(f, end)
+        _ = f.seek(start)
+        yield from split_games(_lines_until(f, end), start)
+
+
+def game_ranges(source: GameSource, size: int) -> Iterator[tuple[int, int]]:
+    """Divide a seekable PGN source into adjacent byte ranges of at least `size` bytes, each starting at a game.
+
+    The source is scanned once, tracking the brace comments from its start, so unlike aligning
+    independent ranges (see `read_range`), this never has to look ahead for the end of a comment
+    which may have started before a range. The games start where `split_games` starts them, so
+    the ranges can be read with `read_range(source, start, end, aligned=True)`.
+    """
+    if size < 1:
+        raise ValueError("The range size must be positive")
+
+    with open_source(source) as f:
+        start = offset = 0
+        in_movetext = in_comment = False
+        for line in f:
+            stripped = line.strip()
+            if not in_comment and stripped.startswith(b"["):
+                if in_movetext and offset - start >= size:
+                    yield start, offset
+                    start = offset
+                in_movetext = False
+            elif stripped:
+                in_movetext = True
+                if in_comment or b"{" in line:
+                    in_comment = update_comment_state(line, in_comment)
+            offset += len(line)
+
+        if offset > start:
+            yield start, offset
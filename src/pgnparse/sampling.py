@@ -0,0 +1,106 @@
+import math
+import random
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from itertools import islice
+from operator import attrgetter
+
+from pgnparse.reader import GameSource, RawGame, iter_games, read_games_at
+from pgnparse.sorting import GameKey
+
+__all__ = ["reservoir_sample", "sample_at", "sample_games", "stratified_sample"]
+
+_offset = attrgetter("offset")
+
+
+def _random(rng: random.Random) -> float:
+    """Get a random number in the open interval (0, 1)."""
+    while not (value := rng.random()):
+        pass
+    return value
+
+
+def _check_size(k: int) -> None:
+    if k < 0:
+        raise ValueError("The sample size can't be negative")
+
+
+def reservoir_sample[T](items: Iterable[T], k: int, rng: random.Random) -> list[T]:
+    """Uniformly sample k items from an iterable of unknown length, in a single pass.
+
+    This uses the reservoir sampling with geometric skips ("Algorithm L"), drawing only
+    O(k log(n / k)) random numbers, rather than one per item. The sampled items are returned
+    in the reservoir order (not the iteration order); if there are at most k items, all of
+    them are returned.
+    """
+    _check_size(k)
+    iterator = iter(items)
+    reservoir = list(islice(iterator, k))
+    if len(reservoir) < k or k == 0:
+        return reservoir
+
+    weight = math.exp(math.log(_random(rng)) / k)
+    while True:
+        skip = math.floor(math.log(_random(rng)) / math.log(1 - weight))
+        for item in islice(iterator, skip, skip + 1):
+            reservoir[rng.randrange(k)] = item
+            break
+        else:
+            return reservoir
+        weight *= math.exp(math.log(_random(rng)) / k)
+
+
+def sample_games(source: GameSource, k: int, *, seed: int | None = None) -> list[RawGame]:
+    """Uniformly sample k (unparsed) games from a multi-game PGN source, in a single pass.
+
+    The source is only split into the raw games (see `pgnparse.reader.iter_games`), with
+    none of them being parsed, so only the sampled games need to be parsed afterwards (see
+    `RawGame.parse`). The sampled games are returned in the order of the source.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    return sorted(reservoir_sample(iter_games(source), k, rng), key=_offset)
+
+
+def stratified_sample(
+    source: GameSource,
+    k: int,
+    key: GameKey,
+    *,
+    seed: int | None = None,
+) -> dict[str, list[RawGame]]:
+    """Uniformly sample up to k (unparsed) games from each stratum of a multi-game PGN source, in a single pass.
+
+    The strata are given by a tag key, such as "ECO" (the games without the tag have an empty
+    value), or by a function of the tags, e.g. `lambda tags: tags.get("WhiteElo", "")[:2]`.
+    Only the tags of the games are extracted (see `pgnparse.reader.parse_tags`), with each
+    stratum keeping its own reservoir. The sampled games of each stratum are returned in the
+    order of the source.
+    """
+    _check_size(k)
+    rng = random.Random(seed)  # noqa: S311
+    key_of: Callable[[Mapping[str, str]], str] = key if not isinstance(key, str) else lambda tags: tags.get(key, "")
+
+    reservoirs: dict[str, list[RawGame]] = {}
+    seen: dict[str, int] = {}
+    for game in iter_games(source):
+        stratum = key_of(game.tags())
+        count = seen[stratum] = seen.get(stratum, 0) + 1
+        reservoir = reservoirs.setdefault(stratum, [])
+        if len(reservoir) < k:
+            reservoir.append(game)
+        elif (index := rng.randrange(count)) < k:
+            reservoir[index] = game
+
+    return {stratum: sorted(reservoir, key=_offset) for stratum, reservoir in reservoirs.items()}
+
+
+def sample_at(source: GameSource, offsets: Sequence[int], k: int, *, seed: int | None = None) -> list[RawGame]:
+    """Uniformly sample k (unparsed) games out of the games at given offsets of a seekable PGN source.
+
+    This is meant to be used with an offset index (e.g. the offsets of the games matching a
+    `pgnparse.tag_index.TagIndex` lookup), only reading the sampled games, by seeking to them
+    directly (in the order of the source), rather than scanning the whole source.
+    """
+    _check_size(k)
+    rng = random.Random(seed)  # noqa: S311
+    chosen = sorted(rng.sample(offsets, k) if k < len(offsets) else offsets)
+    return list(read_games_at(source, chosen))
@@ -0,0 +1,129 @@
+import re
+from dataclasses import dataclass
+from itertools import product
+from typing import Any, Final, Literal, final
+
+__all__ = ["InvalidSANError", "SANMove", "decode_san"]
+
+_SAN_RE: Final = re.compile(
+    r"(?P<piece>[NBRQK])?(?P<file>[a-h])?(?P<rank>[1-8])?(?P<capture>x)?(?P<to>[a-h][1-8])(?:=(?P<promotion>[NBRQ]))?"
+    r"(?P<suffix>[+#])?"
+    r"|(?P<castling>[Oo0]-[Oo0](?:-[Oo0])?)(?P<castling_suffix>[+#])?",
+)
+
+
+class InvalidSANError(ValueError):
+    """Raised when a move string isn't a valid move in Standard Algebraic Notation (SAN)."""
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class SANMove:
+    """A structured decoding of a move in Standard Algebraic Notation (SAN).
+
+    The squares are indexed from 0 (a1) to 63 (h8), going through the files first, in the same
+    way as on the `pgnparse.board.Board`. The pieces are given by their (uppercase) SAN letters,
+    with "P" used for the pawns.
+    """
+
+    piece: str
+    """The letter of the moving piece ("K" for castling)."""
+    to: int
+    """The target square of the move (-1 for castling)."""
+    from_file: int = -1
+    """The file of the moving piece, if given for disambiguation (or for pawn captures), from 0 (a) to 7 (h)."""
+    from_rank: int = -1
+    """The rank of the moving piece, if given for disambiguation, from 0 (1st rank) to 7 (8th rank)."""
+    capture: bool = False
+    promotion: str | None = None
+    castling: Literal["kingside", "queenside"] | None = None
+    check: bool = False
+    """Whether the move is marked as a check (this includes the checkmates)."""
+    mate: bool = False
+
+
+_FILES: Final = "abcdefgh"
+_RANKS: Final = "12345678"
+
+
+def _parse_san(san: str) -> SANMove:
+    match = _SAN_RE.fullmatch(san)
+    if match is None:
+        raise InvalidSANError(f"Invalid SAN move: {san!r}")
+
+    if (castling := match["castling"]) is not None:
+        suffix = match["castling_suffix"]
+        return SANMove(
+            "K",
+            -1,
+            castling="kingside" if castling.count("-") == 1 else "queenside",
+            check=suffix is not None,
+            mate=suffix == "#",
+        )
+
+    to = match["to"]
+    suffix = match["suffix"]
+    return SANMove(
+        match["piece"] or "P",
+        (ord(to[0]) - ord("a")) | (ord(to[1]) - ord("1")) << 3,
+        -1 if match["file"] is None else ord(match["file"]) - ord("a"),
+        -1 if match["rank"] is None else ord(match["rank"]) - ord("1"),
+        capture=match["capture"] is not None,
+        promotion=match["promotion"],
+        check=suffix is not None,
+        mate=suffix == "#",
+    )
+
+
+def _common_moves() -> dict[str, SANMove]:
+    """Decode the move strings covering the vast majority of the moves seen in the games.
+
+    This includes all of the pawn moves and promotions, the piece moves (both with and without
+    captures) and castling, each with all of the check/mate suffixes. The (much less common, but
+    much more numerous) disambiguated moves are left out. The decodings are built directly,
+    without the regex.
+    """
+    moves: dict[str, SANMove] = {}
+
+    def add(san: str, piece: str, to: int, from_file: int = -1, from_rank: int = -1, **kwargs: Any) -> None:
+        moves[san] = SANMove(piece, to, from_file, from_rank, **kwargs)
+        moves[san + "+"] = SANMove(piece, to, from_file, from_rank, **kwargs, check=True)
+        moves[san + "#"] = SANMove(piece, to, from_file, from_rank, **kwargs, check=True, mate=True)
+
+    add("O-O", "K", -1, castling="kingside")
+    add("O-O-O", "K", -1, castling="queenside")
+
+    for to in range(64):
+        file, rank = to & 7, to >> 3
+        name = _FILES[file] + _RANKS[rank]
+
+        promotions = "NBRQ" if rank in (0, 7) else (None,)
+        for promotion in promotions:
+            suffix = "" if promotion is None else "=" + promotion
+            add(name + suffix, "P", to, promotion=promotion)
+            for from_file in (file - 1, file + 1):
+                if 0 <= from_file < len(_FILES):
+                    add(f"{_FILES[from_file]}x{name}{suffix}", "P", to, from_file, capture=True, promotion=promotion)
+
+        for piece, capture in product("NBRQK", (False, True)):
+            target = "x" + name if capture else name
+            add(piece + target, piece, to, capture=capture)
+
+    return moves
+
+
+_TABLE: Final = _common_moves()
+
+
+def decode_san(san: str) -> SANMove:
+    """Decode a move in Standard Algebraic Notation (SAN).
+
+    The decodings are looked up in a precomputed table of the common move strings, with
+    the other (valid) move strings being decoded and added to the table on their first use.
+    The decodings are therefore interned, i.e. the same move string always produces the same
+    `SANMove` instance.
+    """
+    move = _TABLE.get(san)
+    if move is None:
+        move = _TABLE.setdefault(san, _parse_san(san))
+    return move
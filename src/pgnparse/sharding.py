@@ -0,0 +1,125 @@
+import re
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from os import PathLike
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Final, Self, final
+
+from pgnparse.reader import GameSource, RawGame, iter_games
+from pgnparse.sorting import GameKey
+
+__all__ = ["ShardWriter", "shard_games", "shard_name"]
+
+_UNSAFE_RE: Final = re.compile(r"[^A-Za-z0-9._-]+")
+# The device names reserved on Windows (regardless of the case and the extension)
+_RESERVED_NAMES: Final = frozenset(
+    {"con", "prn", "aux", "nul", *(f"com{i}" for i in range(1, 10)), *(f"lpt{i}" for i in range(1, 10))},
+)
+
+
+def shard_name(value: str) -> str:
+    """Convert a key value into a safe file name.
+
+    The unsafe characters are replaced with underscores, and the names reserved on Windows
+    (such as "CON" or "nul.txt") get an underscore appended to their stem.
+    """
+    name = _UNSAFE_RE.sub("_", value).strip("._")
+    stem, dot, extension = name.partition(".")
+    if stem.lower() in _RESERVED_NAMES:
+        return f"{stem}_{dot}{extension}"
+    return name or "unknown"
+
+
+@final
+class ShardWriter:
+    """Writes the raw games into many shard files, keeping a bounded pool of the open file handles.
+
+    The shard files are opened on demand, with the least recently used file being closed once
+    there are `max_open` files open (it's reopened for appending when needed again). The files
+    are created (truncated) on the first write to them.
+
+    The file names are compared case-insensitively, so the shards whose names only differ in
+    case share a single file (named after the first of them) on all file systems, rather than
+    overwriting each other on the case-insensitive ones.
+    """
+
+    def __init__(self, directory: str | PathLike[str], *, max_open: int = 64, suffix: str = ".pgn"):
+        if max_open < 1:
+            raise ValueError("The maximum amount of the open files must be positive")
+
+        self.directory = Path(directory)
+        self.max_open = max_open
+        self.suffix = suffix
+        self.counts: dict[str, int] = {}
+        """The shard names mapped to the amount of the games written into them."""
+        self._files: OrderedDict[Path, BinaryIO] = OrderedDict()
+        self._created: set[Path] = set()
+        self._paths: dict[str, Path] = {}
+
+    def path(self, shard: str) -> Path:
+        """Get the path of the file of a shard."""
+        name = f"{shard_name(shard)}{self.suffix}"
+        return self._paths.setdefault(name.casefold(), self.directory / name)
+
+    def _file(self, shard: str) -> BinaryIO:
+        # The files are keyed by their paths, as multiple values can share a (sanitized) file name
+        path = self.path(shard)
+        f = self._files.get(path)
+        if f is not None:
+            self._files.move_to_end(path)
+            return f
+
+        if len(self._files) >= self.max_open:
+            _, evicted = self._files.popitem(last=False)
+            evicted.close()
+        f = self._files[path] = path.open("ab" if path in self._created else "wb")
+        self._created.add(path)
+        return f
+
+    def write(self, shard: str, game: RawGame | bytes) -> None:
+        """Write a game into a shard, copying its raw bytes."""
+        data = game.data if isinstance(game, RawGame) else game
+        _ = self._file(shard).write(data.rstrip() + b"\n\n")
+        self.counts[shard] = self.counts.get(shard, 0) + 1
+
+    def close(self) -> None:
+        """Close all of the open files."""
+        while self._files:
+            _, f = self._files.popitem()
+            f.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def shard_games(
+    source: GameSource,
+    directory: str | PathLike[str],
+    key: GameKey,
+    *,
+    max_open: int = 64,
+) -> dict[str, int]:
+    """Partition the games of a multi-game PGN source into shard files by a tag key, such as "Event".
+
+    The source is streamed once, only extracting the tags of the games, and their raw bytes are
+    copied into the shard files (see `ShardWriter`), named after the key values. The key can
+    also be a function of the tags, e.g. `lambda tags: tags.get("Date", "")[:7]` for monthly
+    shards. The directory is created if it doesn't exist.
+
+    Returns the shard names mapped to the amounts of the games written into them.
+    """
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    key_of: Callable[[Mapping[str, str]], str] = key if not isinstance(key, str) else lambda tags: tags.get(key, "")
+    with ShardWriter(directory, max_open=max_open) as writer:
+        for game in iter_games(source):
+            writer.write(key_of(game.tags()), game)
+    return writer.counts
@@ -0,0 +1,194 @@
+import hashlib
+import random
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from os import PathLike
+from typing import Final, final
+
+from pgnparse.dedup import canonical_movetext
+from pgnparse.pgn import PGN, PGNTurnList
+
+__all__ = ["LSHIndex", "MinHasher", "estimate_similarity"]
+
+_PRIME: Final = (1 << 31) - 1
+_MAGIC: Final = b"PGNLSH01"
+_HEADER: Final = struct.Struct("<8sIIQQ")
+
+
+def estimate_similarity(first: array[int], second: array[int]) -> float:
+    """Estimate the Jaccard similarity of the move n-grams of two games, from their MinHash signatures."""
+    if len(first) != len(second):
+        raise ValueError("The signatures must have the same length")
+    if not first:
+        return 0.0
+    return sum(a == b for a, b in zip(first, second, strict=True)) / len(first)
+
+
+@final
+class MinHasher:
+    """Computes the MinHash signatures of games, over the n-grams (shingles) of their mainline moves.
+
+    The games are compared by their normalized moves (see `pgnparse.dedup.canonical_movetext`),
+    so the games differing just in a few moves (or truncated) have similar signatures, with the
+    fraction of the equal signature values estimating the Jaccard similarity of their n-grams.
+
+    The permutations are derived from the seed, so only the signatures computed with the same
+    parameters can be compared.
+    """
+
+    def __init__(self, num_perm: int = 128, n: int = 3, seed: int = 1):
+        if num_perm < 1 or n < 1:
+            raise ValueError("The amount of permutations and the n-gram length must be positive")
+
+        self.num_perm = num_perm
+        self.n = n
+        self.seed = seed
+        rng = random.Random(seed)  # noqa: S311
+        self._permutations = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(num_perm)]
+
+    def shingles(self, turns: PGNTurnList) -> set[int]:
+        """Get the 32-bit hashes of the move n-grams of the mainline (the whole mainline, if it's shorter than n)."""
+        moves = canonical_movetext(turns).split()
+        if not moves:
+            return set()
+        n = min(self.n, len(moves))
+        return {
+            int.from_bytes(hashlib.blake2b(" ".join(moves[i : i + n]).encode(), digest_size=4).digest(), "little")
+            for i in range(len(moves) - n + 1)
+        }
+
+    def signature(self, game: PGN | PGNTurnList) -> array[int]:
+        """Compute the MinHash signature of a game (all of the values are `2**31 - 1` for games without moves)."""
+        shingles = self.shingles(game.turns if isinstance(game, PGN) else game)
+        if not shingles:
+            return array("I", [_PRIME] * self.num_perm)
+        return array("I", [min((a * x + b) % _PRIME for x in shingles) for a, b in self._permutations])
+
+
+@final
+class LSHIndex:
+    """A locality-sensitive hashing index over MinHash signatures, for near-neighbour queries.
+
+    The signatures are split into `bands` bands of equal size, with the games sharing all of the
+    values in any of the bands becoming the candidate neighbours. This finds the pairs with high
+    similarity with a high probability, without comparing all pairs; the candidates are then
+    ranked by their estimated similarity. The similarity threshold at which a pair becomes a
+    candidate with 50% probability is roughly `(1 / bands) ** (1 / rows)` (e.g. ~0.42 for
+    32 bands of 4 rows).
+
+    The games are identified by integer keys, such as `pgnparse.reader.RawGame.offset`. The
+    signatures are kept in flat arrays, and can be persisted with `save` and `load`.
+    """
+
+    def __init__(self, hasher: MinHasher | None = None, bands: int = 32):
+        self.hasher = MinHasher() if hasher is None else hasher
+        if bands < 1 or self.hasher.num_perm % bands:
+            raise ValueError("The amount of permutations must be divisible by the (positive) amount of bands")
+
+        self.bands = bands
+        self.rows = self.hasher.num_perm // bands
+        self._keys: array[int] = array("Q")
+        self._signatures: array[int] = array("I")
+        self._buckets: list[dict[int, array[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _band_hashes(self, signature: array[int]) -> list[int]:
+        rows = self.rows
+        return [hash(signature[band * rows : (band + 1) * rows].tobytes()) for band in range(self.bands)]
+
+    def add(self, key: int, game: PGN | PGNTurnList | array[int]) -> None:
+        """Add a game (or its signature, computed by the hasher of this index) under given key."""
+        signature = game if isinstance(game, array) else self.hasher.signature(game)
+        if len(signature) != self.hasher.num_perm:
+            raise ValueError("The signature doesn't match the hasher of the index")
+
+        position = len(self._keys)
+        self._keys.append(key)
+        self._signatures.extend(signature)
+        for buckets, band_hash in zip(self._buckets, self._band_hashes(signature), strict=True):
+            bucket = buckets.get(band_hash)
+            if bucket is None:
+                bucket = buckets[band_hash] = array("I")
+            bucket.append(position)
+
+    def add_all(self, games: Iterable[tuple[int, PGN | PGNTurnList]]) -> None:
+        """Add multiple games, given as the pairs of their keys and the games."""
+        for key, game in games:
+            self.add(key, game)
+
+    def signature(self, key: int) -> array[int]:
+        """Get the stored signature of a game by its key (the first one added under the key)."""
+        position = self._keys.index(key)
+        num_perm = self.hasher.num_perm
+        return self._signatures[position * num_perm : (position + 1) * num_perm]
+
+    def query(
+        self,
+        game: PGN | PGNTurnList | array[int],
+        threshold: float = 0.0,
+        limit: int | None = None,
+    ) -> list[tuple[int, float]]:
+        """Find the near neighbours of a game, as the pairs of their keys and the estimated similarities.
+
+        The neighbours are sorted by the similarity (the most similar first), only including the ones
+        with the similarity of at least `threshold`.
+        """
+        signature = game if isinstance(game, array) else self.hasher.signature(game)
+        positions: set[int] = set()
+        for buckets, band_hash in zip(self._buckets, self._band_hashes(signature), strict=True):
+            bucket = buckets.get(band_hash)
+            if bucket is not None:
+                positions.update(bucket)
+
+        num_perm = self.hasher.num_perm
+        results: list[tuple[int, float]] = []
+        for position in positions:
+            stored = self._signatures[position * num_perm : (position + 1) * num_perm]
+            similarity = estimate_similarity(signature, stored)
+            if similarity >= threshold:
+                results.append((self._keys[position], similarity))
+
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return results if limit is None else results[:limit]
+
+    def save(self, path: str | PathLike[str]) -> None:
+        """Persist the index (including the parameters of its hasher) into a binary file, in little-endian order."""
+        keys, signatures = self._keys, self._signatures
+        if sys.byteorder == "big":
+            keys, signatures = array("Q", keys), array("I", signatures)
+            keys.byteswap()
+            signatures.byteswap()
+
+        with open(path, "wb") as f:  # noqa: PTH123
+            hasher = self.hasher
+            _ = f.write(_HEADER.pack(_MAGIC, hasher.num_perm, hasher.n, hasher.seed, self.bands))
+            _ = f.write(struct.pack("<Q", len(self)))
+            keys.tofile(f)
+            signatures.tofile(f)
+
+    @classmethod
+    def load(cls, path: str | PathLike[str]) -> "LSHIndex":
+        """Load an index previously persisted with `save` (the band buckets are rebuilt from the signatures)."""
+        with open(path, "rb") as f:  # noqa: PTH123
+            magic, num_perm, n, seed, bands = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"Not an LSH index file: {path!s}")
+            (count,) = struct.unpack("<Q", f.read(8))
+
+            keys: array[int] = array("Q")
+            signatures: array[int] = array("I")
+            keys.fromfile(f, count)
+            signatures.fromfile(f, count * num_perm)
+
+        if sys.byteorder == "big":
+            keys.byteswap()
+            signatures.byteswap()
+
+        index = cls(MinHasher(num_perm, n, seed), bands)
+        for position, key in enumerate(keys):
+            index.add(key, signatures[position * num_perm : (position + 1) * num_perm])
+        return index
@@ -0,0 +1,150 @@
+import heapq
+import io
+import struct
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import ExitStack
+from os import PathLike
+from pathlib import Path
+from typing import BinaryIO, Final
+
+from pgnparse.compressed import detect_decompressor
+from pgnparse.reader import GameSource, iter_games, open_source
+from pgnparse.tag_index import DATE_TAGS
+
+__all__ = ["GameKey", "sort_games", "tag_sort_key"]
+
+GameKey = str | Callable[[Mapping[str, str]], str]
+"""A sort (or shard) key of the games: a tag name, or a function of the tags of a game."""
+
+_RECORD: Final = struct.Struct("<IQQ")
+_NUMBER_WIDTH: Final = 20
+_MAX_FAN_IN: Final = 128
+
+
+def tag_sort_key(tag: str, value: str) -> str:
+    """Get the key ordering the values of a tag naturally.
+
+    The unknown parts ("??") of the dates (see `pgnparse.tag_index.DATE_TAGS`) are ordered as
+    zeroes, and the numeric values (such as the ratings) are ordered by their numeric value,
+    rather than as strings.
+    """
+    if tag in DATE_TAGS:
+        return value.replace("?", "0")
+    if value.isdigit():
+        return value.rjust(_NUMBER_WIDTH, "0")
+    return value
+
+
+def _key_function(key: GameKey) -> Callable[[Mapping[str, str]], str]:
+    if isinstance(key, str):
+        return lambda tags: tag_sort_key(key, tags.get(key, ""))
+    return key
+
+
+def _write_run(records: Iterable[tuple[str, int, int]], directory: str) -> Path:
+    with tempfile.NamedTemporaryFile("wb", dir=directory, suffix=".run", delete=False) as f:
+        for key, offset, length in records:
+            encoded = key.encode()
+            _ = f.write(_RECORD.pack(len(encoded), offset, length))
+            _ = f.write(encoded)
+    return Path(f.name)
+
+
+def _read_run(path: Path) -> Iterator[tuple[str, int, int]]:
+    with path.open("rb") as f:
+        while header := f.read(_RECORD.size):
+            key_length, offset, length = _RECORD.unpack(header)
+            yield f.read(key_length).decode(), offset, length
+
+
+def _source_origin(source: GameSource) -> int:
+    """Get the position of the first game of a source, checking that the games can be read again at their offsets.
+
+    The source must be seekable and not compressed, as the games are copied from the raw source,
+    after it was already scanned for the keys.
+    """
+    if isinstance(source, (str, PathLike)):
+        with open(source, "rb") as f:  # noqa: PTH123
+            compressed = detect_decompressor(f) is not None
+        origin = 0
+    elif isinstance(source, bytes):
+        compressed = detect_decompressor(io.BytesIO(source)) is not None
+        origin = 0
+    else:
+        if not source.seekable():
+            raise ValueError("The source must be seekable, the games are copied from it by their offsets")
+        compressed = detect_decompressor(source) is not None
+        origin = source.tell()
+
+    if compressed:
+        raise ValueError("Compressed sources can't be sorted, as they can't be read at the game offsets")
+    return origin
+
+
+def _copy_game(source: BinaryIO, offset: int, length: int, output: BinaryIO) -> None:
+    _ = source.seek(offset)
+    _ = output.write(_terminated(source.read(length)))
+
+
+def _terminated(data: bytes) -> bytes:
+    """Strip the trailing whitespace of a raw game, separating it from the next one with a blank line."""
+    return data.rstrip() + b"\n\n"
+
+
+def sort_games(
+    source: GameSource,
+    output: str | PathLike[str] | BinaryIO,
+    key: GameKey = "Date",
+    *,
+    max_records: int = 1 << 20,
+    temp_dir: str | PathLike[str] | None = None,
+) -> int:
+    """Sort the games of a (large) multi-game PGN source by a tag key, writing them into the output.
+
+    This is an external merge sort with bounded memory: the source is scanned once, only
+    extracting the tags, with the (key, offset, length) records of at most `max_records`
+    games being sorted in memory at once, and spilled into a temporary run file. The runs
+    are then merged, and the raw bytes of the games are copied from the source in the sorted
+    order, without parsing them. The games with equal keys keep their original order.
+
+    By default (with a tag name), the values are ordered naturally, see `tag_sort_key`. The
+    source must be seekable and not compressed (raising a ValueError otherwise), as the games
+    are copied from it by their offsets. The file objects are sorted from their current position.
+
+    Returns the amount of the written games.
+    """
+    if max_records < 1:
+        raise ValueError("The maximum amount of records must be positive")
+    key_of = _key_function(key)
+    origin = _source_origin(source)
+
+    with tempfile.TemporaryDirectory(dir=temp_dir, prefix="pgnsort-") as directory:
+        runs: list[Path] = []
+        records: list[tuple[str, int, int]] = []
+        for game in iter_games(source):
+            records.append((key_of(game.tags()), game.offset, len(game.data)))
+            if len(records) >= max_records:
+                records.sort()
+                runs.append(_write_run(records, directory))
+                records = []
+
+        # Bound the amount of the runs open at once, by merging the oldest runs into larger ones first
+        while len(runs) >= _MAX_FAN_IN:
+            merged_run = _write_run(heapq.merge(*map(_read_run, runs[:_MAX_FAN_IN])), directory)
+            for run in runs[:_MAX_FAN_IN]:
+                run.unlink()
+            runs = [*runs[_MAX_FAN_IN:], merged_run]
+
+        # The last run is merged straight from memory
+        records.sort()
+        merged = heapq.merge(records, *map(_read_run, runs))
+
+        count = 0
+        with open_source(source) as f, ExitStack() as stack:
+            if isinstance(output, (str, PathLike)):
+                output = stack.enter_context(open(output, "wb"))  # noqa: PTH123
+            for _, offset, length in merged:
+                _copy_game(f, origin + offset, length, output)
+                count += 1
+        return count
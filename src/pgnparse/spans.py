@@ -0,0 +1,237 @@
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import Final, final, overload, override
+
+from lark import ParseTree, Token, Tree
+
+from pgnparse.pgn import InvalidPGNTreeError, PGNBasicAnnotation, PGNTurnMove, get_parser
+
+__all__ = ["MoveSpans", "SpanMove"]
+
+_ANNOTATIONS: Final = tuple(PGNBasicAnnotation)
+
+
+@final
+class SpanMove:
+    """A lightweight view of a single move in `MoveSpans`.
+
+    The move string and the comment are only sliced out of the source text when accessed.
+    """
+
+    __slots__ = ("_spans", "index")
+
+    def __init__(self, spans: "MoveSpans", index: int):
+        self._spans = spans
+        self.index = index
+
+    @override
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.move_string!r}, index={self.index})"
+
+    @property
+    def move_span(self) -> tuple[int, int]:
+        """The (start, end) offsets of the move string in the source text."""
+        return self._spans.move_starts[self.index], self._spans.move_ends[self.index]
+
+    @property
+    def comment_span(self) -> tuple[int, int] | None:
+        """The (start, end) offsets of the comment text (without the braces) in the source text, if any."""
+        start = self._spans.comment_starts[self.index]
+        return None if start == -1 else (start, self._spans.comment_ends[self.index])
+
+    @property
+    def move_string(self) -> str:
+        """The move string, like "Nf3"."""
+        start, end = self.move_span
+        return self._spans.source[start:end]
+
+    @property
+    def comment(self) -> str | None:
+        """The comment following the move, if any."""
+        span = self.comment_span
+        return None if span is None else self._spans.source[span[0] : span[1]]
+
+    @property
+    def annotation(self) -> PGNBasicAnnotation | None:
+        """The basic annotation of the move, like "!?", if any."""
+        annotation = self._spans.annotations[self.index]
+        return None if annotation == -1 else _ANNOTATIONS[annotation]
+
+    @property
+    def numeric_annotations(self) -> list[int]:
+        """The numeric annotations (NAGs) of the move."""
+        return list(self._spans.numeric_annotations.get(self.index, ()))
+
+    @property
+    def turn_number(self) -> int:
+        """The number of the turn in which the move was played."""
+        return self._spans.turn_numbers[self.index]
+
+    @property
+    def is_black(self) -> bool:
+        """Whether this is a black move."""
+        return bool(self._spans.black[self.index])
+
+    @property
+    def depth(self) -> int:
+        """The variation nesting level of the move (0 for the mainline moves)."""
+        return self._spans.depths[self.index]
+
+    def to_move(self) -> PGNTurnMove:
+        """Materialize the move as a regular `PGNTurnMove`."""
+        return PGNTurnMove(self.move_string, self.annotation, self.numeric_annotations, self.comment)
+
+
+@final
+class MoveSpans(Sequence[SpanMove]):
+    """The moves of a PGN game, stored as spans (offsets) into the shared source text.
+
+    Rather than holding the move strings and comments as separate strings, like `PGNTurnMove`
+    does, only their offsets into the source text are kept (in flat arrays), and the strings
+    are sliced out when accessed. This keeps the memory usage of parsed comment-heavy games
+    close to the size of the source text itself.
+
+    The moves are kept in the order they appear in the source, including the variation moves
+    (see `SpanMove.depth`). The tags are not included, see `pgnparse.reader.parse_tags`.
+
+    Besides accessing the moves through `SpanMove` views, the columns can be used directly
+    for bulk processing: `move_starts`, `move_ends`, `comment_starts` and `comment_ends` (-1
+    when there's no comment) hold the offsets, `turn_numbers`, `depths` and `black` (1 for
+    black moves) the move placement, and `annotations` the index of the basic annotation
+    among the `PGNBasicAnnotation` members (-1 when there's none). The numeric annotations
+    are sparse, so they're kept in the `numeric_annotations` dict, by move index.
+    """
+
+    __slots__ = (
+        "annotations",
+        "black",
+        "comment_ends",
+        "comment_starts",
+        "depths",
+        "move_ends",
+        "move_starts",
+        "numeric_annotations",
+        "source",
+        "turn_numbers",
+    )
+
+    def __init__(self, source: str):
+        self.source = source
+        self.move_starts: array[int] = array("q")
+        self.move_ends: array[int] = array("q")
+        self.comment_starts: array[int] = array("q")
+        self.comment_ends: array[int] = array("q")
+        self.turn_numbers: array[int] = array("I")
+        self.depths: array[int] = array("H")
+        self.annotations: array[int] = array("b")
+        self.black = bytearray()
+        self.numeric_annotations: dict[int, tuple[int, ...]] = {}
+
+    @classmethod
+    def from_string(cls, text: str) -> "MoveSpans":
+        """Parse a PGN game, recording the spans of its moves within the text."""
+        spans = cls(text)
+        tree = get_parser().parse(text)
+        for section in tree.children:
+            if isinstance(section, Tree) and section.data == "turn_section":
+                spans._add_turn_section(section, 0)
+        return spans
+
+    def _add_turn_section(self, tree: ParseTree, depth: int) -> None:
+        for el in tree.children:
+            if not isinstance(el, Tree):
+                continue
+
+            if el.data == "variant":
+                self._add_turn_section(_subtree(el.children[0]), depth + 1)
+                continue
+
+            turn_number = 0
+            for part in el.children:
+                # Non-trees (tokens) are just whitespace
+                if not isinstance(part, Tree):
+                    continue
+                if part.data in ("turn_number", "turn_number_continuation"):
+                    turn_number = int(_token(part.children[0]))
+                else:
+                    self._add_move(_subtree(part.children[0]), turn_number, part.data == "black_move", depth)
+
+    def _add_move(self, tree: ParseTree, turn_number: int, black: bool, depth: int) -> None:
+        index = len(self.move_starts)
+        comment_start = comment_end = annotation = -1
+        numeric_annotations: list[int] = []
+
+        for el in tree.children:
+            part = _subtree(el)
+            token = _token(part.children[0])
+            if part.data == "move_string":
+                self.move_starts.append(_start(token))
+                self.move_ends.append(_end(token))
+            elif part.data == "annotation":
+                annotation = _ANNOTATIONS.index(PGNBasicAnnotation(token))
+            elif part.data == "numeric_annotation":
+                numeric_annotations.append(int(token))
+            elif part.data == "block_comment":
+                comment_start, comment_end = _start(token), _end(token)
+
+        self.comment_starts.append(comment_start)
+        self.comment_ends.append(comment_end)
+        self.annotations.append(annotation)
+        self.turn_numbers.append(turn_number)
+        self.depths.append(depth)
+        self.black.append(black)
+        if numeric_annotations:
+            self.numeric_annotations[index] = tuple(numeric_annotations)
+
+    @overload
+    def __getitem__(self, index: int) -> SpanMove: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[SpanMove]: ...
+
+    @override
+    def __getitem__(self, index: int | slice) -> SpanMove | list[SpanMove]:
+        if isinstance(index, slice):
+            return [SpanMove(self, i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Move index out of range")
+        return SpanMove(self, index)
+
+    @override
+    def __len__(self) -> int:
+        return len(self.move_starts)
+
+    @override
+    def __iter__(self) -> Iterator[SpanMove]:
+        return (SpanMove(self, index) for index in range(len(self)))
+
+    def mainline(self) -> Iterator[SpanMove]:
+        """Generate the mainline moves, skipping all variations."""
+        return (SpanMove(self, index) for index in range(len(self)) if self.depths[index] == 0)
+
+
+def _subtree(el: ParseTree | Token) -> ParseTree:
+    if not isinstance(el, Tree):
+        raise InvalidPGNTreeError(f"Expected a tree, found token: {el}")
+    return el
+
+
+def _token(el: ParseTree | Token) -> Token:
+    if not isinstance(el, Token):
+        raise InvalidPGNTreeError(f"Expected a token, found tree: {el.data}")
+    return el
+
+
+def _start(token: Token) -> int:
+    if token.start_pos is None:
+        raise InvalidPGNTreeError(f"Token has no position: {token}")
+    return token.start_pos
+
+
+def _end(token: Token) -> int:
+    if token.end_pos is None:
+        raise InvalidPGNTreeError(f"Token has no position: {token}")
+    return token.end_pos
@@ -0,0 +1,220 @@
+from array import array
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Final, Literal, final
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as exc:
+    raise ImportError(
+        "The pgnparse.tag_columns module requires the optional NumPy dependency (pgnparse[numpy])",
+    ) from exc
+
+from pgnparse.encoding import RESULT_LABELS
+from pgnparse.pgn import PGN, PGNGameResult
+from pgnparse.reader import GameSource, iter_games
+
+__all__ = ["ECO_CODES", "TagColumns", "eco_code", "eco_name"]
+
+ECO_CODES: Final = 500
+"""The amount of the ECO codes (A00 to E99)."""
+
+_RESULT_LABEL: Final = {result.value: label for label, result in enumerate(RESULT_LABELS)}
+_UNSPECIFIED_LABEL: Final = RESULT_LABELS.index(PGNGameResult.UNSPECIFIED)
+_MAX_INT32: Final = (1 << 31) - 1
+
+
+def eco_code(eco: str) -> int:
+    """Convert an ECO code (such as "B90") into its index, from 0 (A00) to 499 (E99), or -1 if it's invalid."""
+    if len(eco) != 3 or eco[0] not in "ABCDE" or not eco[1:].isdecimal():
+        return -1
+    return (ord(eco[0]) - ord("A")) * 100 + int(eco[1:])
+
+
+def eco_name(code: int) -> str:
+    """Convert an ECO code index (see `eco_code`) back into the ECO code."""
+    if not 0 <= code < ECO_CODES:
+        raise ValueError(f"Invalid ECO code index: {code}")
+    return f"{chr(ord('A') + code // 100)}{code % 100:02}"
+
+
+def _parse_int(value: str | None) -> int:
+    """Parse a non-negative integer fitting into the (int32) buffers, or -1 if it's invalid or too large."""
+    if value is None or not value.isdecimal() or len(value) > len(str(_MAX_INT32)):
+        return -1
+    number = int(value)
+    return number if number <= _MAX_INT32 else -1
+
+
+@lru_cache(maxsize=1 << 16)
+def _parse_date(value: str) -> tuple[int, int, int]:
+    """Parse a PGN date ("YYYY.MM.DD", with "??" for the unknown parts) into the year, month and day (or -1)."""
+    parts = value.split(".")
+    if len(parts) != 3:
+        return -1, -1, -1
+    year, month, day = map(_parse_int, parts)
+    return year, month if 1 <= month <= 12 else -1, day if 1 <= day <= 31 else -1
+
+
+@lru_cache(maxsize=1 << 12)
+def _parse_time_control(value: str) -> tuple[int, int]:
+    """Parse a PGN time control into the base time and the increment, in seconds (-1 if unknown).
+
+    Only the first period of the multi-period time controls (e.g. "40/7200:3600") is used. The
+    unknown ("?"), unlimited ("-") and sandclock ("*180") time controls are treated as missing.
+    """
+    period = value.partition(":")[0]
+    if "/" in period:
+        period = period.partition("/")[2]
+    base, _, increment = period.partition("+")
+    base_time, increment_time = _parse_int(base), _parse_int(increment) if increment else 0
+    if base_time < 0 or increment_time < 0:
+        return -1, -1
+    return base_time, increment_time
+
+
+def _column(values: array[int], dtype: type[np.signedinteger]) -> npt.NDArray[np.signedinteger]:
+    column = np.frombuffer(values, dtype=np.int32)
+    # The values which don't fit into the column are treated as missing, rather than wrapping around
+    return np.where(column <= np.iinfo(dtype).max, column, -1).astype(dtype)
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class TagColumns:
+    """Typed columns of the tag values of a game collection, for vectorized analytics.
+
+    Each column holds a value per game, with -1 for the missing (or unparsable) values; the
+    null masks of the columns are available in `masks`. The results are given by their labels
+    (see `pgnparse.encoding.RESULT_LABELS`), with the games without a Result tag labeled as
+    `PGNGameResult.UNSPECIFIED`.
+    """
+
+    white_elo: npt.NDArray[np.int32]
+    black_elo: npt.NDArray[np.int32]
+    year: npt.NDArray[np.int16]
+    month: npt.NDArray[np.int8]
+    day: npt.NDArray[np.int8]
+    base_time: npt.NDArray[np.int32]
+    """The base time of the time control, in seconds."""
+    increment: npt.NDArray[np.int32]
+    """The increment per move of the time control, in seconds."""
+    results: npt.NDArray[np.int8]
+    eco: npt.NDArray[np.int16]
+    """The ECO codes, as their indices (see `eco_code`)."""
+    masks: dict[str, npt.NDArray[np.bool_]]
+    """The column names mapped to their masks, True for the games with the value present."""
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    @classmethod
+    def from_tags(cls, tags: Iterable[Mapping[str, str]]) -> "TagColumns":
+        """Build the columns from the tags of the games.
+
+        The values are parsed into flat typed buffers (with the repeated dates and time controls
+        parsed just once), which are then converted into the NumPy arrays at once.
+        """
+        white_elo, black_elo = array("i"), array("i")
+        year, month, day = array("i"), array("i"), array("i")
+        base_time, increment = array("i"), array("i")
+        results, eco = array("i"), array("i")
+
+        for game_tags in tags:
+            white_elo.append(_parse_int(game_tags.get("WhiteElo")))
+            black_elo.append(_parse_int(game_tags.get("BlackElo")))
+
+            game_year, game_month, game_day = _parse_date(game_tags.get("Date", ""))
+            year.append(game_year)
+            month.append(game_month)
+            day.append(game_day)
+
+            game_base_time, game_increment = _parse_time_control(game_tags.get("TimeControl", ""))
+            base_time.append(game_base_time)
+            increment.append(game_increment)
+
+            results.append(_RESULT_LABEL.get(game_tags.get("Result", ""), _UNSPECIFIED_LABEL))
+            eco.append(eco_code(game_tags.get("ECO", "")))
+
+        columns = {
+            "white_elo": _column(white_elo, np.int32),
+            "black_elo": _column(black_elo, np.int32),
+            "year": _column(year, np.int16),
+            "month": _column(month, np.int8),
+            "day": _column(day, np.int8),
+            "base_time": _column(base_time, np.int32),
+            "increment": _column(increment, np.int32),
+            "eco": _column(eco, np.int16),
+        }
+        masks = {name: column >= 0 for name, column in columns.items()}
+        return cls(
+            columns["white_elo"],
+            columns["black_elo"],
+            columns["year"],
+            columns["month"],
+            columns["day"],
+            columns["base_time"],
+            columns["increment"],
+            _column(results, np.int8),
+            columns["eco"],
+            masks,
+        )
+
+    @classmethod
+    def from_games(cls, games: Iterable[PGN]) -> "TagColumns":
+        """Build the columns from the tags of the parsed games."""
+        return cls.from_tags(game.tags for game in games)
+
+    @classmethod
+    def from_source(cls, source: GameSource) -> "TagColumns":
+        """Build the columns from the games of a multi-game PGN source, only extracting their tags (no parsing)."""
+        return cls.from_tags(game.tags() for game in iter_games(source))
+
+    def rating_buckets(
+        self,
+        bucket_size: int = 100,
+        player: Literal["white", "black", "average"] = "average",
+    ) -> npt.NDArray[np.int32]:
+        """Get the rating bucket of each game (the rating divided by the bucket size), or -1 if the rating is missing.
+
+        The average rating requires the ratings of both of the players.
+        """
+        if bucket_size < 1:
+            raise ValueError("The bucket size must be positive")
+
+        if player == "white":
+            ratings, valid = self.white_elo, self.masks["white_elo"]
+        elif player == "black":
+            ratings, valid = self.black_elo, self.masks["black_elo"]
+        else:
+            ratings = (self.white_elo + self.black_elo) // 2
+            valid = self.masks["white_elo"] & self.masks["black_elo"]
+        return np.where(valid, ratings // bucket_size, -1).astype(np.int32)
+
+    def rating_histogram(
+        self,
+        bucket_size: int = 100,
+        player: Literal["white", "black", "average"] = "average",
+    ) -> npt.NDArray[np.int64]:
+        """Count the games in each rating bucket (the bucket `i` starts at the rating `i * bucket_size`)."""
+        buckets = self.rating_buckets(bucket_size, player)
+        return np.bincount(buckets[buckets >= 0])
+
+    def results_by(self, keys: npt.NDArray[np.integer], groups: int | None = None) -> npt.NDArray[np.int64]:
+        """Count the results of the games grouped by given integer keys (e.g. the rating buckets).
+
+        Returns a `(groups, len(RESULT_LABELS))` array of the counts of each result label, for the keys
+        from 0 to `groups - 1` (by default, up to the highest key). The games with negative keys are skipped.
+        """
+        valid = keys >= 0
+        keys = keys[valid].astype(np.int64)
+        if groups is None:
+            groups = int(keys.max(initial=-1)) + 1
+        counts = np.bincount(keys * len(RESULT_LABELS) + self.results[valid], minlength=groups * len(RESULT_LABELS))
+        return counts[: groups * len(RESULT_LABELS)].reshape(groups, len(RESULT_LABELS))
+
+    def results_by_eco(self) -> npt.NDArray[np.int64]:
+        """Count the results of the games by their ECO codes, as a `(ECO_CODES, len(RESULT_LABELS))` array."""
+        return self.results_by(self.eco, ECO_CODES)
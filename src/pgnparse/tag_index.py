@@ -0,0 +1,199 @@
+import heapq
+import struct
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from os import PathLike
+from typing import BinaryIO, Final, final
+
+from pgnparse.reader import GameSource, RawGame, iter_games, read_games_at
+
+__all__ = ["DATE_TAGS", "DEFAULT_TAGS", "TagIndex"]
+
+DEFAULT_TAGS: Final = ("White", "Black", "Event", "Site", "Date", "ECO")
+"""Tags which are indexed by default."""
+
+DATE_TAGS: Final = frozenset({"Date", "EventDate", "UTCDate"})
+"""Tags holding (possibly partial) dates, such as "1992.??.??".
+
+The unknown parts ("??") of these values are ordered as zeroes, so partial dates sort
+before all of the full dates they could represent. This makes the range queries work.
+"""
+
+_MAGIC: Final = b"PGNTIDX1"
+_LENGTH: Final = struct.Struct("<I")
+
+
+def _sort_key(tag: str, value: str) -> str:
+    return value.replace("?", "0") if tag in DATE_TAGS else value
+
+
+def _encode_offsets(offsets: list[int]) -> bytes:
+    """Compress a sorted list of offsets, storing the deltas between them as varints."""
+    out = bytearray()
+    previous = 0
+    for offset in offsets:
+        delta = offset - previous
+        previous = offset
+        while delta >= 0x80:
+            out.append(delta & 0x7F | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def _decode_offsets(data: bytes) -> list[int]:
+    offsets: list[int] = []
+    offset = delta = shift = 0
+    for byte in data:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            offset += delta
+            offsets.append(offset)
+            delta = shift = 0
+    return offsets
+
+
+@final
+class _TagPostings:
+    """The values of a single tag (sorted), along with the compressed offsets of the games having them."""
+
+    __slots__ = ("keys", "postings", "values")
+
+    def __init__(self, tag: str, offsets_by_value: dict[str, list[int]]):
+        self.values = sorted(offsets_by_value, key=lambda value: _sort_key(tag, value))
+        self.keys = [_sort_key(tag, value) for value in self.values]
+        self.postings = [_encode_offsets(offsets_by_value[value]) for value in self.values]
+
+    def offsets(self, start: int, stop: int) -> list[int]:
+        """Get the sorted offsets of the games with any of the values in given (index) range."""
+        if stop - start == 1:
+            return _decode_offsets(self.postings[start])
+        return list(heapq.merge(*(_decode_offsets(posting) for posting in self.postings[start:stop])))
+
+
+@final
+class TagIndex:
+    """A persistent inverted index over the tag values of a multi-game PGN source.
+
+    For each of the indexed tags, this maps every value to the sorted byte offsets of the
+    games having it, stored as delta-encoded varints. The values are kept sorted, so exact,
+    prefix and range lookups are all binary searches, rather than scans over the games.
+
+    The offsets can then be used to read the games directly (see `games`).
+    """
+
+    def __init__(self, postings: dict[str, _TagPostings]):
+        self._postings = postings
+
+    @property
+    def tags(self) -> tuple[str, ...]:
+        """The indexed tags."""
+        return tuple(self._postings)
+
+    @classmethod
+    def build(cls, source: GameSource, tags: Iterable[str] = DEFAULT_TAGS) -> "TagIndex":
+        """Build the index by scanning the tag sections of all games in a PGN source."""
+        offsets_by_tag: dict[str, dict[str, list[int]]] = {tag: {} for tag in tags}
+        for game in iter_games(source):
+            game_tags = game.tags()
+            for tag, offsets_by_value in offsets_by_tag.items():
+                if (value := game_tags.get(tag)) is not None:
+                    offsets_by_value.setdefault(value, []).append(game.offset)
+
+        return cls({tag: _TagPostings(tag, offsets) for tag, offsets in offsets_by_tag.items()})
+
+    def _get_postings(self, tag: str) -> _TagPostings:
+        try:
+            return self._postings[tag]
+        except KeyError:
+            raise KeyError(f"Tag {tag!r} is not indexed") from None
+
+    def values(self, tag: str) -> list[str]:
+        """Get all of the distinct values of given tag (in sorted order)."""
+        return list(self._get_postings(tag).values)
+
+    def lookup(self, tag: str, value: str) -> list[int]:
+        """Get the offsets of the games with given tag value."""
+        postings = self._get_postings(tag)
+        key = _sort_key(tag, value)
+        # Multiple values can share the same sort key (partial dates), so check all of them
+        for index in range(bisect_left(postings.keys, key), bisect_right(postings.keys, key)):
+            if postings.values[index] == value:
+                return postings.offsets(index, index + 1)
+        return []
+
+    def prefix(self, tag: str, prefix: str) -> list[int]:
+        """Get the offsets of the games with the tag value starting with given prefix."""
+        postings = self._get_postings(tag)
+        key = _sort_key(tag, prefix)
+        start = bisect_left(postings.keys, key)
+        stop = bisect_left(postings.keys, key + "\U0010ffff", lo=start)
+        return postings.offsets(start, stop) if start < stop else []
+
+    def range(self, tag: str, start: str | None = None, stop: str | None = None) -> list[int]:
+        """Get the offsets of the games with the tag value in given (inclusive) range of values.
+
+        Leaving out a bound makes the range open from that side.
+        """
+        postings = self._get_postings(tag)
+        lo = 0 if start is None else bisect_left(postings.keys, _sort_key(tag, start))
+        hi = len(postings.keys) if stop is None else bisect_right(postings.keys, _sort_key(tag, stop))
+        return postings.offsets(lo, hi) if lo < hi else []
+
+    def date_range(self, start: str | None = None, stop: str | None = None, tag: str = "Date") -> list[int]:
+        """Get the offsets of the games played within given (inclusive) range of dates, like "2024.01.01".
+
+        Games with partial dates are ordered as if the unknown parts were zeroes.
+        """
+        return self.range(tag, start, stop)
+
+    def games(self, source: GameSource, offsets: Iterable[int]) -> Iterator[RawGame]:
+        """Read the (unparsed) games at given offsets from the indexed source."""
+        return read_games_at(source, offsets)
+
+    def save(self, path: str | PathLike[str]) -> None:
+        """Persist the index into a binary sidecar file."""
+        with open(path, "wb") as f:  # noqa: PTH123
+            _ = f.write(_MAGIC)
+            _ = f.write(_LENGTH.pack(len(self._postings)))
+            for tag, postings in self._postings.items():
+                _write_bytes(f, tag.encode())
+                _ = f.write(_LENGTH.pack(len(postings.values)))
+                for value, posting in zip(postings.values, postings.postings, strict=True):
+                    _write_bytes(f, value.encode())
+                    _write_bytes(f, posting)
+
+    @classmethod
+    def load(cls, path: str | PathLike[str]) -> "TagIndex":
+        """Load an index previously persisted with `save`."""
+        with open(path, "rb") as f:  # noqa: PTH123
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"Not a tag index file: {path!s}")
+
+            all_postings: dict[str, _TagPostings] = {}
+            for _ in range(_read_length(f)):
+                tag = _read_bytes(f).decode()
+                postings = _TagPostings(tag, {})
+                for _ in range(_read_length(f)):
+                    postings.values.append(_read_bytes(f).decode())
+                    postings.postings.append(_read_bytes(f))
+                postings.keys = [_sort_key(tag, value) for value in postings.values]
+                all_postings[tag] = postings
+
+        return cls(all_postings)
+
+
+def _write_bytes(f: BinaryIO, data: bytes) -> None:
+    _ = f.write(_LENGTH.pack(len(data)))
+    _ = f.write(data)
+
+
+def _read_length(f: BinaryIO) -> int:
+    (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+    return length
+
+
+def _read_bytes(f: BinaryIO) -> bytes:
+    return f.read(_read_length(f))
@@ -0,0 +1,174 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Literal, TextIO, final
+
+from pgnparse.pgn import PGN, PGNGameResult, PGNTurn, PGNTurnList, PGNTurnMove, SEVEN_TAG_ROSTER
+
+__all__ = ["PGNWriter"]
+
+
+@final
+@dataclass(frozen=True, slots=True, kw_only=True)
+class PGNWriter:
+    """A configurable writer, normalizing the games into the PGN export format.
+
+    Unlike `str(game)`, which writes all of the movetext on a single line, the writer produces
+    the output in a single streaming pass over the tags and the movetext tokens, wrapping the
+    movetext lines as it goes:
+
+    - The tags are written one per line, in the Seven Tag Roster order, followed by the other
+      tags in the ASCII order (or in their original order, with `tag_order="original"`).
+    - The movetext is wrapped to `line_width` columns (no wrapping if None). The comments are
+      split on their whitespace, so that they can be wrapped as well.
+    - Each white move is preceded by its move number, as well as the black moves following
+      a comment or starting a variation (e.g. "1. e4 {Best by test} 1... e5").
+    - The game always ends with a termination marker ("*" for the games without a result).
+
+    The comments, variations, basic annotations (such as "!") and NAGs can be stripped, and
+    `movetext_only` leaves out the tags (as well as the game comment), producing just the moves.
+    """
+
+    line_width: int | None = 80
+    tag_order: Literal["export", "original"] = "export"
+    escape_tags: bool = False
+    """Escape the quotes and backslashes in the tag values.
+
+    The parsed tag values are kept in their escaped form, so this is only needed for the
+    tag values set from unescaped data.
+    """
+    comments: bool = True
+    variations: bool = True
+    annotations: bool = True
+    nags: bool = True
+    movetext_only: bool = False
+
+    def __post_init__(self) -> None:
+        if self.line_width is not None and self.line_width < 1:
+            raise ValueError("The line width must be positive")
+
+    def format(self, game: PGN) -> str:
+        """Write a single game into a string (ending with a newline)."""
+        return "".join(line + "\n" for line in self.iter_lines(game))
+
+    def write(self, game: PGN, fp: TextIO) -> None:
+        """Write a single game into a text stream."""
+        for line in self.iter_lines(game):
+            _ = fp.write(line)
+            _ = fp.write("\n")
+
+    def write_all(self, games: Iterable[PGN], fp: TextIO) -> int:
+        """Write a stream of games into a text stream, separated by blank lines, returning the amount of games."""
+        count = 0
+        for game in games:
+            if count:
+                _ = fp.write("\n")
+            self.write(game, fp)
+            count += 1
+        return count
+
+    def iter_lines(self, game: PGN) -> Iterator[str]:
+        """Generate the lines of a game (without the line endings)."""
+        if not self.movetext_only:
+            tags = self._ordered_tags(game.tags)
+            for name in tags:
+                value = game.tags[name]
+                if self.escape_tags:
+                    value = value.replace("\\", "\\\\").replace('"', '\\"')
+                yield f'[{name} "{value}"]'
+            if tags:
+                yield ""
+
+        yield from self._wrap(_attach_parentheses(self._game_tokens(game)))
+
+    def _ordered_tags(self, tags: dict[str, str]) -> list[str]:
+        if self.tag_order == "original":
+            return list(tags)
+        roster = [name for name in SEVEN_TAG_ROSTER if name in tags]
+        return roster + sorted(tags.keys() - SEVEN_TAG_ROSTER)
+
+    def _wrap(self, tokens: Iterable[str]) -> Iterator[str]:
+        width = self.line_width
+        line: list[str] = []
+        length = 0
+        for token in tokens:
+            if line and width is not None and length + 1 + len(token) > width:
+                yield " ".join(line)
+                line = []
+                length = 0
+            length += len(token) + 1 if line else len(token)
+            line.append(token)
+        if line:
+            yield " ".join(line)
+
+    def _game_tokens(self, game: PGN) -> Iterator[str]:
+        if game.comment and self.comments and not self.movetext_only:
+            yield from _comment_tokens(game.comment)
+        yield from self._turn_tokens(game.turns)
+        yield (game.result or PGNGameResult.UNFINISHED).value
+
+    def _turn_tokens(self, turns: PGNTurnList) -> Iterator[str]:
+        for turn in turns:
+            if isinstance(turn, PGNTurnList):
+                if self.variations and turn:
+                    yield "("
+                    yield from self._turn_tokens(turn)
+                    yield ")"
+                continue
+
+            yield from self._turn_move_tokens(turn)
+
+    def _turn_move_tokens(self, turn: PGNTurn) -> Iterator[str]:
+        # The black move needs its own move number, unless it directly follows the white move
+        black_numbered = True
+        if turn.white_move is not None:
+            yield f"{turn.turn_number}."
+            yield from self._move_tokens(turn.white_move)
+            black_numbered = bool(turn.white_move.comment) and self.comments
+
+        if turn.black_move is not None:
+            if black_numbered:
+                yield f"{turn.turn_number}..."
+            yield from self._move_tokens(turn.black_move)
+
+    def _move_tokens(self, move: PGNTurnMove) -> Iterator[str]:
+        if move.annotation is not None and self.annotations:
+            yield move.move_string + move.annotation
+        else:
+            yield move.move_string
+
+        if self.nags:
+            for nag in move.numeric_annotations:
+                yield f"${nag}"
+
+        if move.comment and self.comments:
+            yield from _comment_tokens(move.comment)
+
+
+def _comment_tokens(comment: str) -> Iterator[str]:
+    words = comment.split()
+    if not words:
+        return
+    if len(words) == 1:
+        yield "{" + words[0] + "}"
+        return
+    yield "{" + words[0]
+    yield from words[1:-1]
+    yield words[-1] + "}"
+
+
+def _attach_parentheses(tokens: Iterable[str]) -> Iterator[str]:
+    """Attach the parentheses to the neighbouring tokens, so that they're never separated by wrapping."""
+    pending: str | None = None
+    opening = ""
+    for token in tokens:
+        if token == ")" and pending is not None:
+            pending += token
+        elif token == "(":
+            opening += token
+        else:
+            if pending is not None:
+                yield pending
+            pending = opening + token
+            opening = ""
+    if pending is not None:
+        yield pending
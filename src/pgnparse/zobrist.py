@@ -0,0 +1,135 @@
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from os import PathLike
+from typing import Final, final
+
+from pgnparse.board import Board
+from pgnparse.fen import starting_board
+from pgnparse.pgn import PGN, PGNTurnList
+
+__all__ = ["PositionIndex", "position_hashes"]
+
+_MAGIC: Final = b"PGNZIDX1"
+_HEADER: Final = struct.Struct("<8sQ")
+# Each index entry packs the game id and the ply into a single 64-bit integer
+_PLY_BITS: Final = 16
+_PLY_MASK: Final = (1 << _PLY_BITS) - 1
+
+
+def position_hashes(game: PGN | PGNTurnList, board: Board | None = None) -> list[int]:
+    """Replay the mainline of a game and return the Zobrist hashes of all of the reached positions.
+
+    The hash at index n is the hash of the position after n plies, so the first hash is of the
+    starting position. If no board is given, the starting position of the game is used (from
+    the FEN tag, if present), or the standard one for turn lists. The given board is not modified.
+    """
+    if isinstance(game, PGN):
+        turns = game.turns
+        board = starting_board(game) if board is None else board.copy()
+    else:
+        turns = game
+        board = Board() if board is None else board.copy()
+
+    hashes = [board.zobrist]
+    for move in turns.mainline_moves():
+        board.push_san(move.move_string)
+        hashes.append(board.zobrist)
+    return hashes
+
+
+@final
+class PositionIndex:
+    """An index mapping Zobrist position hashes to the games (and plies) in which they occur.
+
+    As the index is keyed by positions rather than move sequences, transpositions are found
+    too: a lookup returns all games reaching the position, regardless of the move order.
+
+    The entries are kept in two flat arrays (hashes and packed game id/ply references), which
+    are sorted lazily on the first lookup after adding games, so lookups are binary searches.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: array[int] = array("Q")
+        self._refs: array[int] = array("Q")
+        self._sorted = True
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add_game(self, game_id: int, game: PGN | PGNTurnList, board: Board | None = None) -> None:
+        """Replay the mainline of a game and add all of its positions to the index.
+
+        The board can be used to override the starting position of the game.
+        """
+        hashes = position_hashes(game, board)
+        if len(hashes) > _PLY_MASK:
+            raise ValueError(f"Game {game_id} is too long to be indexed ({len(hashes)} plies)")
+
+        self._hashes.extend(hashes)
+        base = game_id << _PLY_BITS
+        self._refs.extend(range(base, base + len(hashes)))
+        self._sorted = False
+
+    def add_games(self, games: Iterable[PGN | PGNTurnList], start_id: int = 0) -> None:
+        """Add multiple games to the index, numbering them sequentially from the start id."""
+        for game_id, game in enumerate(games, start_id):
+            self.add_game(game_id, game)
+
+    def lookup(self, position: Board | int) -> list[tuple[int, int]]:
+        """Find all occurrences of a position (a board, or its Zobrist hash).
+
+        Returns a list of (game id, ply) tuples, where the ply is the number of half-moves
+        played before the position was reached.
+        """
+        self._ensure_sorted()
+        key = position.zobrist if isinstance(position, Board) else position
+        start = bisect_left(self._hashes, key)
+        stop = bisect_right(self._hashes, key, lo=start)
+        return [(ref >> _PLY_BITS, ref & _PLY_MASK) for ref in self._refs[start:stop]]
+
+    def games(self, position: Board | int) -> list[int]:
+        """Find the ids of all games which reach given position (a board, or its Zobrist hash)."""
+        return sorted({game_id for game_id, _ in self.lookup(position)})
+
+    def _ensure_sorted(self) -> None:
+        if self._sorted:
+            return
+
+        # Sorting is stable, so the references for a single hash stay ordered by insertion
+        order = sorted(range(len(self._hashes)), key=self._hashes.__getitem__)
+        self._hashes = array("Q", map(self._hashes.__getitem__, order))
+        self._refs = array("Q", map(self._refs.__getitem__, order))
+        self._sorted = True
+
+    def save(self, path: str | PathLike[str]) -> None:
+        """Persist the index into a binary file."""
+        self._ensure_sorted()
+        hashes, refs = self._hashes, self._refs
+        if sys.byteorder == "big":
+            hashes, refs = array("Q", hashes), array("Q", refs)
+            hashes.byteswap()
+            refs.byteswap()
+
+        with open(path, "wb") as f:  # noqa: PTH123
+            _ = f.write(_HEADER.pack(_MAGIC, len(hashes)))
+            hashes.tofile(f)
+            refs.tofile(f)
+
+    @classmethod
+    def load(cls, path: str | PathLike[str]) -> "PositionIndex":
+        """Load an index previously persisted with `save`."""
+        index = cls()
+        with open(path, "rb") as f:  # noqa: PTH123
+            magic, count = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"Not a position index file: {path!s}")
+            index._hashes.fromfile(f, count)
+            index._refs.fromfile(f, count)
+
+        if sys.byteorder == "big":
+            index._hashes.byteswap()
+            index._refs.byteswap()
+        return index
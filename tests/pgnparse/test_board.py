@@ -0,0 +1,88 @@
+import pytest
+
+from pgnparse import PGN
+from pgnparse.board import BLACK, Board, IllegalMoveError, KNIGHT, PAWN, QUEEN, ROOK, WHITE, parse_square
+
+FISCHER_SPASSKY = (
+    "1.e4 e5 2.Nf3 Nc6 3.Bb5 a6 4.Ba4 Nf6 5.O-O Be7 6.Re1 b5 7.Bb3 d6 8.c3 O-O 9.h3 Nb8 10.d4 Nbd7 "
+    "11.c4 c6 12.cxb5 axb5 13.Nc3 Bb7 14.Bg5 b4 15.Nb1 h6 16.Bh4 c5 17.dxe5 Nxe4 18.Bxe7 Qxe7 19.exd6 Qf6 "
+    "20.Nbd2 Nxd6 21.Nc4 Nxc4 22.Bxc4 Nb6 23.Ne5 Rae8 24.Bxf7+ Rxf7 25.Nxf7 Rxe1+ 26.Qxe1 Kxf7 27.Qe3 Qg5 "
+    "28.Qxg5 hxg5 29.b3 Ke6 30.a3 Kd6 31.axb4 cxb4 32.Ra5 Nd5 33.f3 Bc8 34.Kf2 Bf5 35.Ra7 g6 36.Ra6+ Kc5 "
+    "37.Ke1 Nf4 38.g3 Nxh3 39.Kd2 Kb5 40.Rd6 Kc5 41.Ra6 Nf2 42.g4 Bd3 43.Re6 1/2-1/2"
+)
+
+
+def play(moves: str) -> Board:
+    """Play the mainline moves of given PGN movetext on a new board."""
+    board = Board()
+    for move in PGN.from_string(moves).turns.mainline_moves():
+        board.push_san(move.move_string)
+    return board
+
+
+def test_full_game_replay():
+    """Test that a full game can be replayed, keeping the incremental hash in sync."""
+    board = Board()
+    for move in PGN.from_string(FISCHER_SPASSKY).turns.mainline_moves():
+        board.push_san(move.move_string)
+        assert board.zobrist == board.compute_zobrist()
+
+    assert board.turn == BLACK
+    assert board.fullmove_number == 43
+    assert board.squares[parse_square("e6")] == ROOK | WHITE
+
+
+def test_castling():
+    """Test that castling moves both the king and the rook and clears castling rights."""
+    board = play("1. e4 e5 2. Nf3 Nc6 3. Bc4 Bc5 4. O-O")
+    assert board.king_square(WHITE) == parse_square("g1")
+    assert board.squares[parse_square("f1")] == ROOK | WHITE
+    assert board.castling == 0b1100
+
+
+def test_en_passant():
+    """Test that an en-passant capture removes the captured pawn."""
+    board = play("1. e4 a6 2. e5 d5 3. exd6")
+    assert board.squares[parse_square("d6")] == PAWN | WHITE
+    assert board.squares[parse_square("d5")] == 0
+
+
+def test_promotion():
+    """Test that a pawn is replaced by the promoted piece."""
+    board = play("1. h4 g5 2. hxg5 Nf6 3. g6 Ng8 4. g7 Nf6 5. gxh8=Q")
+    assert board.squares[parse_square("h8")] == QUEEN | WHITE
+
+
+def test_pinned_piece_disambiguation():
+    """Test that a pinned piece isn't considered when resolving an ambiguous SAN move."""
+    # After 3... Bb4+, the knight on c3 is pinned, so Ne2 can only be played by the g1 knight
+    board = play("1. d4 e6 2. Nc3 Bb4 3. e3 d6 4. Ne2")
+    assert board.squares[parse_square("e2")] == KNIGHT | WHITE
+    assert board.squares[parse_square("c3")] == KNIGHT | WHITE
+
+
+@pytest.mark.parametrize(
+    "moves",
+    [
+        pytest.param("1. e5", id="pawn-push-too-far"),
+        pytest.param("1. Nf4", id="unreachable-square"),
+        pytest.param("1. O-O", id="castling-blocked"),
+        pytest.param("1. exd3", id="capture-nothing"),
+        pytest.param("1. Nc3 a6 2. Nf3 a5 3. Ne4 b6 4. Ng5", id="ambiguous"),
+    ],
+)
+def test_illegal_moves(moves: str):
+    """Test that moves which can't be played raise an IllegalMoveError."""
+    with pytest.raises(IllegalMoveError):
+        _ = play(moves)
+
+
+def test_equality():
+    """Test that the boards are compared by their positions, and can't be hashed, as they're mutable."""
+    board = Board()
+    copy = board.copy()
+    assert board == copy
+    copy.push_san("e4")
+    assert board != copy
+    with pytest.raises(TypeError):
+        _ = hash(board)
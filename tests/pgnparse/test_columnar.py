@@ -0,0 +1,65 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pgnparse import PGN
+from pgnparse.columnar import iter_batches, read_columnar, write_columnar
+
+GAMES = [
+    PGN.from_string('[Event "First"]\n[White "Alice"]\n\n1. e4 $1 {Best} e5 (1... c5) 2. Nf3!? 1-0'),
+    PGN.from_string('[Event "Second"]\n\n1. d4 d5 $2 $4 0-1'),
+    PGN.from_string("1. c4 *"),
+]
+
+
+def _concat(batches: list[dict[str, list[Any]]]) -> dict[str, list[Any]]:
+    return {name: [value for batch in batches for value in batch[name]] for name in batches[0]}
+
+
+def test_columns():
+    """Test that the games are converted into the tag and move columns."""
+    (batch,) = iter_batches(GAMES, tags=["Event", "White"])
+    assert batch == {
+        "Event": ["First", "Second", None],
+        "White": ["Alice", None, None],
+        "result": ["1-0", "0-1", "*"],
+        "moves": [["e4", "e5", "Nf3"], ["d4", "d5"], ["c4"]],
+        "annotations": [[None, None, "!?"], [None, None], [None]],
+        "nags": [[[1], [], []], [[], [2, 4]], [[]]],
+        "comments": [["Best", None, None], [None, None], [None]],
+        "movetext": ["1. e4 $1 {Best} e5 (1... c5) 2. Nf3!?", "1. d4 d5 $2 $4", "1. c4"],
+    }
+
+
+def test_batch_size():
+    """Test that the batches have at most the requested amount of rows."""
+    batches = list(iter_batches(GAMES * 5, batch_size=4))
+    assert [len(batch["result"]) for batch in batches] == [4, 4, 4, 3]
+    assert _concat(batches) == next(iter_batches(GAMES * 5))
+
+
+def test_tag_conflict():
+    """Test that tags named like the move columns are rejected."""
+    with pytest.raises(ValueError, match="moves"):
+        _ = next(iter_batches(GAMES, tags=["moves"]))
+
+
+def test_builtin_round_trip(tmp_path: Path):
+    """Test that the built-in format can be read back, in row groups."""
+    path = tmp_path / "games.col"
+    assert write_columnar(GAMES * 3, path, batch_size=2, file_format="builtin") == 9
+    row_groups = list(read_columnar(path))
+    assert [len(batch["result"]) for batch in row_groups] == [2, 2, 2, 2, 1]
+    assert _concat(row_groups) == next(iter_batches(GAMES * 3))
+
+
+def test_parquet_round_trip(tmp_path: Path):
+    """Test that the games are written as Parquet (with the optional pyarrow installed), in row groups."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "games.parquet"
+    assert write_columnar(GAMES * 3, path, batch_size=2) == 9
+
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.num_row_groups == 5
+    assert parquet_file.read().to_pydict() == next(iter_batches(GAMES * 3))
@@ -0,0 +1,72 @@
+import math
+from array import array
+
+import pytest
+
+from pgnparse import PGN
+from pgnparse.commands import commands_from_comments, extract_commands, parse_commands
+from pgnparse.spans import MoveSpans
+
+GAME = (
+    "1. e4 { [%eval 0.17] [%clk 0:03:00] } 1... e5 { [%clk 0:02:58.5] } "
+    "(1... c5 { [%clk 0:01:00] }) 2. Nf3 { Good move [%eval #3] [%emt 0:00:05] indeed } "
+    "2... Nc6 { [%eval -1.5,22] } 3. Bb5 *"
+)
+
+
+def assert_values(values: array[float], expected: list[float]):
+    """Assert that the array holds the expected values, with NaN matching NaN."""
+    assert len(values) == len(expected)
+    for value, expected_value in zip(values, expected, strict=True):
+        assert value == expected_value or (math.isnan(value) and math.isnan(expected_value))
+
+
+def test_extract_commands():
+    """Test that the values of the commands are extracted for each mainline ply."""
+    commands = extract_commands(PGN.from_string(GAME))
+    nan = math.nan
+    assert_values(commands.clocks, [180, 178.5, nan, nan, nan])
+    assert_values(commands.elapsed, [nan, nan, 5, nan, nan])
+    assert_values(commands.evals, [0.17, nan, nan, -1.5, nan])
+    assert_values(commands.mates, [nan, nan, 3, nan, nan])
+
+
+def test_strip():
+    """Test that the commands can be stripped from the comments."""
+    game = PGN.from_string(GAME)
+    _ = extract_commands(game, strip=True)
+    assert [move.comment for move in game.turns.mainline_moves()] == [None, None, "Good move indeed", None, None]
+
+    # The variations are kept as they are
+    assert "[%clk 0:01:00]" in str(game)
+
+
+@pytest.mark.parametrize(
+    ("comment", "expected"),
+    [
+        pytest.param("No commands", {}, id="none"),
+        pytest.param("[%clk 1:00:00] [%csl Ga4,Rb5]", {"clk": "1:00:00", "csl": "Ga4,Rb5"}, id="multiple"),
+        pytest.param("Text [%eval  0.5 ] text", {"eval": "0.5"}, id="whitespace"),
+    ],
+)
+def test_parse_commands(comment: str, expected: dict[str, str]):
+    """Test that the commands are found in the comments."""
+    assert parse_commands(comment) == expected
+
+
+def test_malformed_values():
+    """Test that the malformed values are treated as missing."""
+    commands = commands_from_comments(["[%clk soon] [%eval 0.5]", "[%eval #x]", None])
+    assert_values(commands.clocks, [math.nan] * 3)
+    assert_values(commands.evals, [0.5, math.nan, math.nan])
+
+
+def test_from_spans():
+    """Test that the commands can be extracted from the span-based moves too."""
+    spans = MoveSpans.from_string(GAME)
+    commands = commands_from_comments(move.comment for move in spans.mainline())
+    expected = extract_commands(PGN.from_string(GAME))
+    assert_values(commands.clocks, list(expected.clocks))
+    assert_values(commands.elapsed, list(expected.elapsed))
+    assert_values(commands.evals, list(expected.evals))
+    assert_values(commands.mates, list(expected.mates))
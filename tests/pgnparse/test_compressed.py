@@ -0,0 +1,121 @@
+import bz2
+import gzip
+import importlib.util
+import io
+import lzma
+import threading
+import zipfile
+from collections.abc import Buffer, Callable
+from pathlib import Path
+from typing import BinaryIO, cast, override
+
+import pytest
+
+from pgnparse.compressed import register_decompressor
+from pgnparse.parallel import parse_file
+from pgnparse.reader import iter_games
+
+GAMES = b"".join(b'[Event "Game %d"]\n\n1. e4 {Comment %d} e5 2. Nf3 1-0\n\n' % (i, i) for i in range(200))
+EVENTS = [f"Game {i}" for i in range(200)]
+
+
+def _zip(data: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("README.txt", "Not a PGN file")
+        archive.writestr("games.pgn", data)
+    return buffer.getvalue()
+
+
+COMPRESSORS = [
+    pytest.param(gzip.compress, id="gzip"),
+    pytest.param(bz2.compress, id="bz2"),
+    pytest.param(lzma.compress, id="xz"),
+    pytest.param(_zip, id="zip"),
+]
+
+
+@pytest.mark.parametrize("compress", COMPRESSORS)
+def test_compressed_path(tmp_path: Path, compress: Callable[[bytes], bytes]):
+    """Test that compressed files are detected and decompressed."""
+    path = tmp_path / "games.pgn.compressed"
+    _ = path.write_bytes(compress(GAMES))
+    assert [game.tags()["Event"] for game in iter_games(path)] == EVENTS
+
+
+@pytest.mark.parametrize("compress", COMPRESSORS)
+def test_compressed_bytes(compress: Callable[[bytes], bytes]):
+    """Test that compressed in-memory sources are detected and decompressed."""
+    assert [game.tags()["Event"] for game in iter_games(compress(GAMES))] == EVENTS
+
+
+def test_compressed_stream():
+    """Test that compressed non-seekable buffered streams (like pipes) are decompressed."""
+    raw = io.BytesIO(gzip.compress(GAMES))
+    raw.seekable = lambda: False
+    stream: BinaryIO = io.BufferedReader(raw)
+    assert [game.tags()["Event"] for game in iter_games(stream)] == EVENTS
+
+
+class _RawPipe(io.RawIOBase):
+    """A non-seekable raw stream without a peek method, returning short reads (like a pipe or a socket)."""
+
+    def __init__(self, data: bytes):
+        self._data = memoryview(data)
+
+    @override
+    def readable(self) -> bool:
+        return True
+
+    @override
+    def readinto(self, buffer: Buffer, /) -> int:
+        size = min(len(self._data), memoryview(buffer).nbytes, 7)
+        memoryview(buffer).cast("B")[:size] = self._data[:size]
+        self._data = self._data[size:]
+        return size
+
+
+@pytest.mark.parametrize("source", [GAMES, gzip.compress(GAMES)], ids=["plain", "gzip"])
+def test_unbuffered_stream(source: bytes):
+    """Test that compressed streams which are neither buffered, nor seekable are still detected."""
+    # Raw streams aren't typed as BinaryIO, even though they implement everything needed for reading
+    stream = cast("BinaryIO", cast("object", _RawPipe(source)))
+    assert [game.tags()["Event"] for game in iter_games(stream)] == EVENTS
+
+
+@pytest.mark.parametrize("source", [GAMES, gzip.compress(GAMES)], ids=["plain", "gzip"])
+def test_prefetch(source: bytes):
+    """Test that reading ahead in a background thread produces the same games."""
+    games = list(iter_games(source, prefetch=True))
+    assert [game.data for game in games] == [game.data for game in iter_games(GAMES)]
+
+
+def test_prefetch_early_stop():
+    """Test that the background thread is stopped when the reading doesn't finish."""
+    thread_count = threading.active_count()
+    games = iter_games(gzip.compress(GAMES * 1000), prefetch=True)
+    assert next(games).tags()["Event"] == "Game 0"
+    assert threading.active_count() == thread_count + 1
+    del games
+    assert threading.active_count() == thread_count
+
+
+def test_register_decompressor():
+    """Test that custom formats can be supported by registering a decompressor."""
+    register_decompressor(b"PGNX", lambda f: io.BytesIO(f.read()[4:][::-1]))
+    assert [game.tags()["Event"] for game in iter_games(b"PGNX" + GAMES[::-1])] == EVENTS
+
+
+@pytest.mark.skipif(importlib.util.find_spec("compression") is not None, reason="zstd is supported")
+def test_zstd_unsupported():
+    """Test that zstd sources produce a helpful error when there's no zstd support."""
+    with pytest.raises(ValueError, match="zstd"):
+        _ = list(iter_games(b"\x28\xb5\x2f\xfd" + b"\0" * 16))
+
+
+def test_parse_file_compressed(tmp_path: Path):
+    """Test that compressed files are rejected by the byte range reader."""
+    path = tmp_path / "games.pgn.gz"
+    _ = path.write_bytes(gzip.compress(GAMES))
+    with pytest.raises(ValueError, match="Compressed"):
+        _ = list(parse_file(path, executor=None))
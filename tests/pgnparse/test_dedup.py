@@ -0,0 +1,69 @@
+import textwrap
+from pathlib import Path
+
+from pgnparse import PGN
+from pgnparse.dedup import BloomFilter, Deduplicator, canonical_movetext, game_fingerprint
+
+GAMES = textwrap.dedent(
+    """
+    [Event "TWIC"]
+    [Result "1-0"]
+
+    1. e4 e5 2. Bc4 Nc6 3. Qh5 Nf6 4. Qxf7# 1-0
+
+    [Event "Federation feed"]
+    [Result "1-0"]
+
+    1.e4 e5 2.Bc4 {Italian} Nc6 3.Qh5 Nf6?? 4.Qxf7 1-0
+
+    [Event "Other"]
+    [Result "1/2-1/2"]
+
+    1. d4 d5 1/2-1/2
+    """,
+).encode()
+
+
+def test_canonical_movetext():
+    """Test that the canonical movetext strips everything but the (normalized) mainline moves."""
+    pgn = PGN.from_string("1. e4! {Best} e5 (1... c5) 2. Nf3+ $1 Nc6 3. 0-0 O-O-O#")
+    assert canonical_movetext(pgn.turns) == "e4 e5 Nf3 Nc6 O-O O-O-O"
+
+
+def test_fingerprint():
+    """Test that the fingerprint ignores formatting differences, but can include selected tags."""
+    first, second = PGN.from_string("1. e4 e5+ 1-0"), PGN.from_string('[Site "?"]\n\n1.e4 {Hi} e5 0-1')
+    assert game_fingerprint(first) == game_fingerprint(second)
+    assert game_fingerprint(first, ["Site"]) != game_fingerprint(second, ["Site"])
+
+
+def test_unique_raw():
+    """Test that duplicate games are filtered out of a multi-game source."""
+    dedup = Deduplicator()
+    unique = [game.tags()["Event"] for game in dedup.unique_raw(GAMES)]
+    assert unique == ["TWIC", "Other"]
+    assert (dedup.unique_count, dedup.duplicate_count) == (2, 1)
+
+
+def test_duplicates_raw():
+    """Test that the duplicate games can be reported."""
+    assert [game.tags()["Event"] for game in Deduplicator().duplicates_raw(GAMES)] == ["Federation feed"]
+
+
+def test_bloom_filter(tmp_path: Path):
+    """Test that a (file-backed) Bloom filter can be used for bounded memory deduplication."""
+    with BloomFilter(capacity=1000, path=tmp_path / "seen.bloom") as bloom:
+        dedup = Deduplicator(bloom_filter=bloom)
+        assert [game.tags()["Event"] for game in dedup.unique_raw(GAMES)] == ["TWIC", "Other"]
+
+    # The filter persists, so a new run sees the games as duplicates
+    with BloomFilter(capacity=1000, path=tmp_path / "seen.bloom") as bloom:
+        assert list(Deduplicator(bloom_filter=bloom).unique_raw(GAMES)) == []
+
+
+def test_bloom_filter_membership():
+    """Test that added fingerprints are always found in the filter."""
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    fingerprints = [game_fingerprint(PGN.from_string(f"1. e4 e5 2. {move}")) for move in ("a3", "b3", "c3", "d3")]
+    assert not any(bloom.add(fingerprint) for fingerprint in fingerprints)
+    assert all(fingerprint in bloom for fingerprint in fingerprints)
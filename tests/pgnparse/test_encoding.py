@@ -0,0 +1,61 @@
+import pytest
+
+from pgnparse import PGN, PGNGameResult
+
+np = pytest.importorskip("numpy")
+
+from pgnparse.encoding import MoveVocabulary, RESULT_LABELS, encode_games, iter_encoded_games  # noqa: E402
+
+GAMES = [
+    PGN.from_string('[WhiteElo "1500"]\n[BlackElo "?"]\n\n1. e4 e5 (1... c5) 2. Nf3 1-0'),
+    PGN.from_string('[WhiteElo "99999999999"]\n[BlackElo "2100"]\n\n1. d4 *'),
+    PGN(),
+    PGN.from_string('[WhiteElo "\u00b2"]\n\n1. e4 d5 2. exd5 1/2-1/2'),
+]
+
+
+def test_encode_games():
+    """Test that the games are encoded into padded arrays of the mainline move ids."""
+    encoded = encode_games(GAMES)
+    assert encoded.moves.dtype == np.int32
+    assert encoded.moves.tolist() == [[2, 3, 4], [5, 0, 0], [0, 0, 0], [2, 6, 7]]
+    assert encoded.lengths.tolist() == [3, 1, 0, 3]
+    assert [RESULT_LABELS[label] for label in encoded.results] == [
+        PGNGameResult.WHITE_WINS,
+        PGNGameResult.UNFINISHED,
+        PGNGameResult.UNSPECIFIED,
+        PGNGameResult.DRAW,
+    ]
+    assert encoded.white_elo.tolist() == [1500, -1, -1, -1]
+    assert encoded.black_elo.tolist() == [-1, 2100, -1, -1]
+
+
+def test_max_plies():
+    """Test that the games longer than the maximum are truncated."""
+    encoded = encode_games(GAMES, max_plies=2)
+    assert encoded.moves.shape == (4, 2)
+    assert encoded.lengths.tolist() == [2, 1, 0, 2]
+
+
+def test_frozen_vocabulary():
+    """Test that the moves missing in a frozen vocabulary are encoded as unknown."""
+    vocabulary = MoveVocabulary(["e4", "Nf3"], frozen=True)
+    encoded = encode_games(GAMES, vocabulary)
+    assert encoded.moves[0].tolist() == [2, MoveVocabulary.UNKNOWN, 3]
+    assert vocabulary.moves() == [None, None, "e4", "Nf3"]
+
+
+def test_empty_batch():
+    """Test that an empty batch produces empty arrays."""
+    encoded = encode_games([])
+    assert encoded.moves.shape == (0, 0)
+    assert len(encoded.lengths) == 0
+
+
+def test_iter_encoded_games():
+    """Test that the batches of a stream share a single vocabulary."""
+    vocabulary = MoveVocabulary()
+    batches = list(iter_encoded_games(iter(GAMES), batch_size=3, vocabulary=vocabulary))
+    assert [len(batch.lengths) for batch in batches] == [3, 1]
+    assert batches[1].moves.tolist() == [[vocabulary["e4"], vocabulary["d5"], vocabulary["exd5"]]]
+    assert batches[1].moves[0, 0] == batches[0].moves[0, 0]
@@ -0,0 +1,76 @@
+import textwrap
+
+import pytest
+
+from pgnparse import PGN
+from pgnparse.board import Board
+from pgnparse.fen import InvalidFENError, STARTING_FEN, format_fen, parse_fen, starting_board
+from pgnparse.zobrist import position_hashes
+
+
+def test_starting_position():
+    """Test that the starting FEN describes the same position as a new board."""
+    assert parse_fen(STARTING_FEN) == Board()
+    assert format_fen(Board()) == STARTING_FEN
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        pytest.param(STARTING_FEN, id="starting-position"),
+        pytest.param("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1", id="en-passant"),
+        pytest.param("r3k2r/8/8/8/8/8/8/R3K2R w Kq - 12 40", id="partial-castling"),
+        pytest.param("8/5k2/8/8/8/8/1K6/8 b - - 0 73", id="kings-only"),
+    ],
+)
+def test_round_trip(fen: str):
+    """Test that formatting a parsed FEN produces the same FEN."""
+    assert format_fen(parse_fen(fen)) == fen
+
+
+def test_optional_move_counters():
+    """Test that the move counter fields can be omitted."""
+    board = parse_fen("8/5k2/8/8/8/8/1K6/8 w - -")
+    assert board.halfmove_clock == 0
+    assert board.fullmove_number == 1
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        pytest.param("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1", id="missing-rank"),
+        pytest.param("rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", id="too-many-squares"),
+        pytest.param("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQXBNR w KQkq - 0 1", id="invalid-piece"),
+        pytest.param("rnbq1bnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQ - 0 1", id="missing-king"),
+        pytest.param("Pnbqkbnr/pppppppp/8/8/8/8/1PPPPPPP/RNBQKBNR w KQkq - 0 1", id="pawn-on-last-rank"),
+        pytest.param("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1", id="invalid-turn"),
+        pytest.param("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBN1 w KQkq - 0 1", id="castling-without-rook"),
+        pytest.param("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KKkq - 0 1", id="duplicate-castling"),
+        pytest.param("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR b KQkq e3 0 1", id="en-passant-without-pawn"),
+        pytest.param("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - x 1", id="invalid-clock"),
+        pytest.param("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w", id="missing-fields"),
+    ],
+)
+def test_invalid_fen(fen: str):
+    """Test that invalid FEN strings raise an InvalidFENError."""
+    with pytest.raises(InvalidFENError):
+        _ = parse_fen(fen)
+
+
+def test_game_with_fen_tag():
+    """Test that games with a FEN tag are replayed from the described position."""
+    pgn = PGN.from_string(
+        textwrap.dedent(
+            """
+            [SetUp "1"]
+            [FEN "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"]
+
+            1. e4 Kd7 2. e5
+            """,
+        ).strip(),
+    )
+    assert starting_board(pgn) == parse_fen("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1")
+
+    hashes = position_hashes(pgn)
+    assert hashes[0] == starting_board(pgn).zobrist
+    assert hashes[-1] == parse_fen("8/3k4/8/4P3/8/8/8/4K3 b - - 0 2").zobrist
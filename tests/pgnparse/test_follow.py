@@ -0,0 +1,131 @@
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from pgnparse.follow import CheckpointMismatchError, FollowCheckpoint, GameFollower
+
+FIRST = textwrap.dedent(
+    """\
+    [Event "First"]
+
+    1. e4 e5 1-0
+
+    """,
+).encode()
+SECOND = textwrap.dedent(
+    """\
+    [Event "Second"]
+
+    1. d4 {A comment
+    1-0 inside} d5 0-1
+
+    """,
+).encode()
+
+
+def _append(path: Path, data: bytes) -> None:
+    with path.open("ab") as f:
+        _ = f.write(data)
+
+
+@pytest.mark.parametrize(
+    "split",
+    [pytest.param(split, id=str(split)) for split in (5, 20, 30, len(FIRST) + 25, len(FIRST) + 40)],
+)
+def test_poll_partial_writes(tmp_path: Path, split: int):
+    """Test that the games written in parts are only produced once they're complete."""
+    path = tmp_path / "games.pgn"
+    data = FIRST + SECOND
+    _append(path, data[:split])
+    follower = GameFollower(path)
+
+    games = follower.poll()
+    _append(path, data[split:])
+    games += follower.poll()
+
+    assert [game.tags()["Event"] for game in games] == ["First", "Second"]
+    assert [game.offset for game in games] == [0, len(FIRST)]
+    assert follower.poll() == []
+    assert follower.position.games == 2
+
+
+def test_incomplete_game(tmp_path: Path):
+    """Test that a game without a result (or inside a comment) is only complete once the next game starts."""
+    path = tmp_path / "games.pgn"
+    _append(path, b'[Event "First"]\n\n1. e4 e5\n')
+    follower = GameFollower(path)
+    assert follower.poll() == []
+
+    _append(path, b"2. Nf3 {1-0\n")
+    assert follower.poll() == []
+
+    _append(path, b'}\n\n[Event "Second"]\n\n1. d4\n')
+    assert [game.tags()["Event"] for game in follower.poll()] == ["First"]
+
+
+def test_checkpoint_resume(tmp_path: Path):
+    """Test that a restarted follower resumes after the last committed game."""
+    path, checkpoint = tmp_path / "games.pgn", tmp_path / "games.checkpoint"
+    _append(path, FIRST + SECOND[:30])
+    follower = GameFollower(path, checkpoint)
+    assert len(follower.poll()) == 1
+    assert not checkpoint.exists()
+    follower.commit()
+    saved = FollowCheckpoint.load(checkpoint)
+    assert (saved.offset, saved.games, saved.last_offset) == (len(FIRST), 1, 0)
+
+    _append(path, SECOND[30:])
+    follower = GameFollower(path, checkpoint)
+    games = follower.poll()
+    assert [game.tags()["Event"] for game in games] == ["Second"]
+    assert games[0].offset == len(FIRST)
+    assert follower.checkpoint.games == 1
+    follower.commit()
+    assert follower.checkpoint.games == 2
+
+
+def test_uncommitted_games(tmp_path: Path):
+    """Test that the games polled but not committed are produced again after a restart."""
+    path, checkpoint = tmp_path / "games.pgn", tmp_path / "games.checkpoint"
+    _append(path, FIRST)
+    follower = GameFollower(path, checkpoint)
+    _ = follower.poll()
+    follower.commit()
+
+    _append(path, SECOND)
+    assert len(follower.poll()) == 1
+    assert [game.tags()["Event"] for game in GameFollower(path, checkpoint).poll()] == ["Second"]
+
+
+def test_checkpoint_mismatch(tmp_path: Path):
+    """Test that a replaced or truncated file is detected."""
+    path, checkpoint = tmp_path / "games.pgn", tmp_path / "games.checkpoint"
+    _append(path, FIRST + SECOND)
+    follower = GameFollower(path, checkpoint)
+    assert len(follower.poll()) == 2
+    follower.commit()
+
+    _ = path.write_bytes(SECOND + FIRST)
+    with pytest.raises(CheckpointMismatchError):
+        _ = GameFollower(path, checkpoint)
+
+    _ = path.write_bytes(FIRST + SECOND)
+    follower = GameFollower(path, checkpoint)
+    _ = path.write_bytes(FIRST)
+    with pytest.raises(CheckpointMismatchError, match="truncated"):
+        _ = follower.poll()
+
+
+def test_follow(tmp_path: Path):
+    """Test that following yields the games until stopped, committing each batch once it was consumed."""
+    path, checkpoint = tmp_path / "games.pgn", tmp_path / "games.checkpoint"
+    _append(path, FIRST + SECOND)
+    interrupted = GameFollower(path, checkpoint).follow(interval=0)
+    _ = next(interrupted)
+    assert not checkpoint.exists()
+
+    polls = iter([False, False, True])
+    games = list(GameFollower(path, checkpoint).follow(interval=0, stop=lambda: next(polls)))
+    assert len(games) == 2
+    assert FollowCheckpoint.load(checkpoint).games == 2
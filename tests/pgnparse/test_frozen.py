@@ -0,0 +1,64 @@
+import pytest
+
+from pgnparse import PGN, PGNBasicAnnotation
+from pgnparse.frozen import FrozenTurn, FrozenTurnList, FrozenTurnMove, freeze
+
+MOVETEXT = "1. e4! {Best by test} e5 $1 (1... c5 2. Nf3 (2. c3)) 2. Nf3 Nc6"
+
+
+def test_round_trip():
+    """Test that freezing and thawing produces an equal turn list."""
+    turns = PGN.from_string(MOVETEXT).turns
+    frozen = freeze(turns)
+    assert frozen.thaw() == turns
+    assert str(frozen) == str(turns)
+
+
+def test_frozen_move():
+    """Test that the frozen move keeps all of the move data."""
+    move = freeze(PGN.from_string(MOVETEXT).turns)[0]
+    assert isinstance(move, FrozenTurn)
+    assert move.white_move == FrozenTurnMove("e4", PGNBasicAnnotation.GOOD_MOVE, (), "Best by test")
+    assert move.black_move == FrozenTurnMove("e5", None, (1,), None)
+
+
+def test_hashable():
+    """Test that equal frozen turn lists can be used as the same dict keys."""
+    first = freeze(PGN.from_string(MOVETEXT).turns)
+    second = freeze(PGN.from_string(MOVETEXT).turns)
+    assert first == second
+    assert first is not second
+    assert {first: "analysis"}[second] == "analysis"
+    assert first != freeze(PGN.from_string("1. e4 e5").turns)
+
+
+def test_immutable():
+    """Test that the frozen objects can't be modified."""
+    frozen = freeze(PGN.from_string(MOVETEXT).turns)
+    turn = frozen[0]
+    assert isinstance(turn, FrozenTurn)
+    with pytest.raises(AttributeError):
+        turn.turn_number = 2  # pyright: ignore[reportAttributeAccessIssue]
+
+
+def test_slice():
+    """Test that slicing produces a frozen turn list sharing the original turns."""
+    frozen = freeze(PGN.from_string(MOVETEXT).turns)
+    sliced = frozen[1:]
+    assert isinstance(sliced, FrozenTurnList)
+    assert sliced[0] is frozen[1]
+
+
+def test_interned():
+    """Test that equal sub-variations of separately frozen games share the same objects."""
+    interned: dict[object, object] = {}
+    first = freeze(PGN.from_string("1. e4 (1. d4 d5) 1... e5").turns, interned)
+    second = freeze(PGN.from_string("1. c4 (1. d4 d5) 1... e5").turns, interned)
+    assert first[1] is second[1]
+    assert first[2] is second[2]
+
+
+def test_mainline_moves():
+    """Test that the mainline moves skip the variations."""
+    frozen = freeze(PGN.from_string(MOVETEXT).turns)
+    assert [move.move_string for move in frozen.mainline_moves()] == ["e4", "e5", "Nf3", "Nc6"]
@@ -0,0 +1,106 @@
+from collections.abc import Iterable
+
+import pytest
+
+from pgnparse import PGN, PGNTurnMove
+
+GAME = PGN.from_string("1. e4 e5 (1... c5 2. Nf3) (1... e6) 2. Nf3 (2. f4 exf4) 2... Nc6 3. Bb5 a6 *")
+
+
+def move_strings(moves: Iterable[PGNTurnMove]) -> list[str]:
+    """Get the move strings of given moves."""
+    return [move.move_string for move in moves]
+
+
+def test_mainline_matches_moves():
+    """Test that the mainline view contains the same moves as `mainline_moves`."""
+    mainline = GAME.turns.mainline()
+    assert list(mainline) == list(GAME.turns.mainline_moves())
+    assert len(mainline) == 6
+    assert mainline[-1].move_string == "a6"
+
+
+def test_mainline_cached():
+    """Test that the ply index is only built once."""
+    assert GAME.turns.mainline() is GAME.turns.mainline()
+
+
+@pytest.mark.parametrize(
+    ("text", "plies"),
+    [
+        pytest.param("1. e4 e5 2. Nf3 *", range(1, 4), id="start"),
+        pytest.param("12... e5 13. Nf3 *", range(24, 26), id="black-first"),
+        pytest.param("*", range(1, 1), id="empty"),
+    ],
+)
+def test_ply_numbers(text: str, plies: range):
+    """Test that the plies are numbered based on the turn numbers of the game."""
+    assert PGN.from_string(text).turns.mainline().ply_numbers == plies
+
+
+def test_ply():
+    """Test accessing the moves by their plies."""
+    mainline = GAME.turns.mainline()
+    assert move_strings(mainline.ply(ply) for ply in range(1, 7)) == ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6"]
+    with pytest.raises(IndexError):
+        _ = mainline.ply(7)
+    with pytest.raises(IndexError):
+        _ = mainline.ply(0)
+
+
+@pytest.mark.parametrize(
+    ("index", "expected", "plies"),
+    [
+        pytest.param(slice(1, 3), ["e5", "Nf3"], range(2, 4), id="range"),
+        pytest.param(slice(None, None, 2), ["e4", "Nf3", "Bb5"], range(1, 7, 2), id="white-moves"),
+        pytest.param(slice(4, 100), ["Bb5", "a6"], range(5, 7), id="beyond-end"),
+    ],
+)
+def test_slicing(index: slice, expected: list[str], plies: range):
+    """Test that slicing produces views of the right moves and plies."""
+    view = GAME.turns.mainline()[index]
+    assert move_strings(view) == expected
+    assert view.ply_numbers == plies
+
+
+def test_plies_view():
+    """Test the ply-range views, including views of views."""
+    mainline = GAME.turns.mainline()
+    view = mainline.plies(2, 5)
+    assert move_strings(view) == ["e5", "Nf3", "Nc6"]
+    assert view.ply(3) is mainline.ply(3)
+    with pytest.raises(IndexError):
+        _ = view.ply(5)
+
+    assert move_strings(view.plies(3)) == ["Nf3", "Nc6"]
+    assert move_strings(mainline[::2].plies(2, 6)) == ["Nf3", "Bb5"]
+
+
+def test_variation_anchors():
+    """Test that the variations are anchored to the plies of the moves they're alternatives to."""
+    mainline = GAME.turns.mainline()
+    assert mainline.variation_plies() == [2, 3]
+    assert [move_strings(variation.mainline()) for variation in mainline.variations(2)] == [["c5", "Nf3"], ["e6"]]
+    assert [move_strings(variation.mainline()) for variation in mainline.variations(3)] == [["f4", "exf4"]]
+    assert mainline.variations(4) == []
+    assert mainline.plies(3).variation_plies() == [3]
+
+
+@pytest.mark.parametrize(
+    "pgn",
+    [
+        pytest.param(str(GAME), id="nested"),
+        pytest.param("1. e4 e5 (1. d4 d5) 2. Nf3 *", id="white-alternative"),
+        pytest.param("1. e4 (1... e5 2. Nf3) 1... c5 *", id="before-alternative"),
+    ],
+)
+def test_variation_anchors_match_flatten(pgn: str):
+    """Test that the anchored variations branch off the mainline at the same plies as in `flatten`."""
+    turns = PGN.from_string(pgn).turns
+    mainline = turns.mainline()
+    expected = [
+        move_strings(mainline.plies(mainline.ply_numbers.start, ply)) + move_strings(variation.mainline())
+        for ply in mainline.variation_plies()
+        for variation in mainline.variations(ply)
+    ]
+    assert [move_strings(game.mainline_moves()) for game in turns.flatten()][:-1] == expected
@@ -0,0 +1,117 @@
+import pytest
+
+from pgnparse import PGN
+from pgnparse.move_search import MoveIndex, MovePattern
+from pgnparse.san import SANMove
+
+GAMES = [
+    PGN.from_string("1. e4 e5 2. Bc4 Nc6 3. Qh5 Nf6 4. Qxf7# 1-0"),
+    PGN.from_string(
+        "1. e4 e5 2. Nf3 Nc6 (2... d6 3. Bc4 Be7 4. Nxf7 Kxf7) 3. Bc4 Nf6 4. Ng5 d5 5. exd5 Nxd5 "
+        "6. Nxf7 Kxf7 7. Qf3+ Ke6 *",
+    ),
+    PGN.from_string("1. d4 d5 2. c4 e6 (2... dxc4 3. e4 b5) *"),
+    PGN.from_string("1. e4 d5 2. exd5 Qxd5 3. Nc3 Qa5 4. d4 c6 5. Nf3 Bg4 6. h3 Bh5 7. g4 Bg6 8. Bc4 e8=Q *"),
+]
+
+
+def matching(pattern: MovePattern, *, variations: bool = False) -> list[int]:
+    """Get the indices of the games matching the pattern."""
+    return [i for i, game in enumerate(GAMES) if pattern.matches(game, variations=variations)]
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        pytest.param("Nxf7 Kxf7", [1], id="subsequence"),
+        pytest.param("Nxf7 Kxf7 Qf3+", [1], id="explicit-check"),
+        pytest.param("Nxf7 Kxf7 Qf3#", [], id="wrong-suffix"),
+        pytest.param("Qxf7", [0], id="suffix-ignored"),
+        pytest.param("e4 ? ? Nc6", [0, 1], id="any-move"),
+        pytest.param("e4 * Qxf7", [0], id="gap"),
+        pytest.param("Nf6 * Qh5", [], id="gap-order"),
+        pytest.param("N?f7 K*", [1], id="glob"),
+        pytest.param("c4 e6", [2], id="not-in-variation"),
+    ],
+)
+def test_mainline_patterns(pattern: str, expected: list[int]):
+    """Test matching the string patterns against the mainlines."""
+    assert matching(MovePattern(pattern)) == expected
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        pytest.param("Bc4 Be7", [1], id="variation"),
+        pytest.param("d6 Bc4 Be7 Nxf7", [1], id="from-variation-start"),
+        pytest.param("e5 Nf3 d6", [1], id="branching-off-mainline"),
+        pytest.param("Nf3 Nc6 Bc4 Be7", [], id="not-across-replaced-move"),
+        pytest.param("c4 dxc4 e4", [2], id="second-variation"),
+    ],
+)
+def test_variation_patterns(pattern: str, expected: list[int]):
+    """Test matching the patterns against the variations, continuing from the mainline before them."""
+    assert matching(MovePattern(pattern), variations=True) == expected
+
+
+@pytest.mark.parametrize(
+    "pgn",
+    [
+        pytest.param("1. e4 (1... e5 2. Nf3) 1... c5 *", id="before-replaced-move"),
+        pytest.param("1. e4 c5 (1. e4 e5 2. Nf3) *", id="replacing-whole-turn"),
+    ],
+)
+def test_variation_branch_point(pgn: str):
+    """Test that the variations branch off at the ply of their first move, the same as in `flatten`."""
+    game = PGN.from_string(pgn)
+    assert str(next(game.turns.flatten())) == "1. e4 e5 2. Nf3"
+    assert MovePattern("e4 e5 Nf3").matches(game, variations=True)
+    assert MovePattern("e4 e5 Nf3", anchored=True).matches(game, variations=True)
+    assert not MovePattern("c5 e5").matches(game, variations=True)
+    assert list(MoveIndex([game], n=2, variations=True).search("e4 e5")) == [game]
+
+
+def test_predicates():
+    """Test the structured SAN predicates, along with the ply limits."""
+
+    def queen_promotion(move: SANMove) -> bool:
+        return move.promotion == "Q"
+
+    assert matching(MovePattern([queen_promotion])) == [3]
+    assert matching(MovePattern([queen_promotion], before_ply=16)) == []
+    assert matching(MovePattern([queen_promotion], before_ply=17)) == [3]
+    assert matching(MovePattern(["Bc4", queen_promotion])) == [3]
+
+
+def test_anchored():
+    """Test that the anchored patterns only match from the first move."""
+    assert matching(MovePattern("d4 d5", anchored=True)) == [2]
+    assert matching(MovePattern("d5", anchored=True)) == []
+    assert matching(MovePattern("e4 d5", anchored=True)) == [3]
+    assert matching(MovePattern("* c4 e6", anchored=True)) == [2]
+    assert MovePattern("* e4", anchored=True).matches(PGN.from_string("1. d4 d5 2. e4 *"))
+
+
+def test_empty_pattern():
+    """Test that the patterns without any moves are rejected."""
+    with pytest.raises(ValueError, match="at least one move"):
+        _ = MovePattern("*")
+
+
+@pytest.mark.parametrize(
+    ("pattern", "variations", "candidates", "expected"),
+    [
+        pytest.param("Nxf7 Kxf7", False, [1], [1], id="mainline"),
+        pytest.param("Bc4 Be7", True, [1], [1], id="variations"),
+        pytest.param("Bc4 Be7", False, [], [], id="variations-not-indexed"),
+        pytest.param("e4 e5", False, [0, 1], [0, 1], id="common"),
+        pytest.param("Qh5 Nf6 * Nc6", False, [0], [], id="candidate-rejected"),
+        pytest.param("Kxf7", False, [0, 1, 2, 3], [1], id="too-short-run"),
+        pytest.param("Nxf7 Ke1", False, [], [], id="unknown-move"),
+    ],
+)
+def test_index(pattern: str, variations: bool, candidates: list[int], expected: list[int]):
+    """Test that the index selects the candidate games, which are then verified by the automaton."""
+    index = MoveIndex(GAMES, n=2, variations=variations)
+    assert index.candidates(MovePattern(pattern)) == candidates
+    assert [GAMES.index(game) for game in index.search(pattern)] == expected
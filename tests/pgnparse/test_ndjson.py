@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+from pgnparse import PGN, PGNBasicAnnotation, PGNGameResult, PGNTurn, PGNTurnList, PGNTurnMove
+from pgnparse.ndjson import dump_ndjson, load_ndjson
+
+GAMES = [
+    (
+        '[Event "Test"]\n[White "Müller"]\n\n{Intro} 1. e4! {Best by test} e5 $1 $2 (1... c5 2. Nf3 (2. c3 d5) '
+        "2... d6) 2. Nf3 Nc6?! 1-0"
+    ),
+    "1. d4 d5 *",
+    '[Event "Empty"]',
+]
+
+
+@pytest.mark.parametrize("text", [pytest.param(text, id=str(i)) for i, text in enumerate(GAMES)])
+def test_dict_round_trip(text: str):
+    """Test that converting a game into a dict and back produces the same game."""
+    game = PGN.from_string(text)
+    assert PGN.from_dict(game.to_dict()) == game
+
+
+def test_to_dict():
+    """Test the dict representation, including the variations, annotations and NAGs."""
+    game = PGN(
+        {"Event": "Test"},
+        PGNTurnList(
+            [
+                PGNTurn(1, PGNTurnMove("e4", PGNBasicAnnotation.GOOD_MOVE, [1, 2], "Best"), PGNTurnMove("e5")),
+                PGNTurnList([PGNTurn(1, None, PGNTurnMove("c5"))]),
+            ],
+        ),
+        PGNGameResult.DRAW,
+    )
+    assert game.to_dict() == {
+        "tags": {"Event": "Test"},
+        "turns": [
+            {
+                "turn_number": 1,
+                "white_move": {
+                    "move_string": "e4",
+                    "annotation": "!",
+                    "numeric_annotations": [1, 2],
+                    "comment": "Best",
+                },
+                "black_move": {"move_string": "e5"},
+            },
+            [{"turn_number": 1, "black_move": {"move_string": "c5"}}],
+        ],
+        "result": "1/2-1/2",
+    }
+
+
+def test_to_dict_doesnt_share_state():
+    """Test that modifying the dict doesn't affect the game."""
+    game = PGN.from_string(GAMES[0])
+    data = game.to_dict()
+    data["tags"]["Event"] = "Changed"
+    turn = data["turns"][0]
+    assert isinstance(turn, dict)
+    assert "white_move" in turn
+    turn["white_move"]["numeric_annotations"] = [3]
+    assert game == PGN.from_string(GAMES[0])
+
+
+def test_ndjson_round_trip():
+    """Test that games written as NDJSON are read back the same, one game per line."""
+    games = [PGN.from_string(text) for text in GAMES]
+    fp = io.StringIO()
+    assert dump_ndjson(games, fp) == len(games)
+
+    text = fp.getvalue()
+    assert text.count("\n") == len(games)
+    assert "Müller" in text
+
+    assert list(load_ndjson(io.StringIO(text + "\n\n"))) == games
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+from pgnparse import PGN
+from pgnparse.opening_tree import OpeningStats, OpeningTree
+
+GAMES = [
+    PGN.from_string("1. e4 e5 2. Nf3 Nc6 1-0"),
+    PGN.from_string("1. e4 e5 2. Nf3 Nf6 1/2-1/2"),
+    PGN.from_string("1. e4 c5 2. Nf3 0-1"),
+    PGN.from_string("1. d4 d5 *"),
+]
+
+
+def build(games: list[PGN], **kwargs: int) -> OpeningTree:
+    """Build an opening tree over given games."""
+    tree = OpeningTree(**kwargs)
+    tree.add_games(games)
+    return tree
+
+
+def test_stats():
+    """Test that the results are aggregated for every move sequence."""
+    tree = build(GAMES)
+    assert tree.stats() == OpeningStats(4, 1, 1, 1)
+    assert tree.stats(["e4"]) == OpeningStats(3, 1, 1, 1)
+    assert tree.stats(["e4", "e5", "Nf3"]) == OpeningStats(2, 1, 1, 0)
+    assert tree.stats(["d4", "d5"]) == OpeningStats(1, 0, 0, 0)
+    assert tree.stats(["c4"]) is None
+
+
+def test_continuations():
+    """Test that the continuations are listed with the most played moves first."""
+    tree = build(GAMES)
+    assert [move for move, _ in tree.continuations()] == ["e4", "d4"]
+    assert tree.continuations(["e4", "e5", "Nf3"]) == [
+        ("Nf6", OpeningStats(1, 0, 1, 0)),
+        ("Nc6", OpeningStats(1, 1, 0, 0)),
+    ]
+
+
+def test_max_depth():
+    """Test that the sequences are only tracked up to the maximum depth."""
+    tree = build(GAMES, max_depth=2)
+    assert tree.stats(["e4", "e5"]) is not None
+    assert tree.stats(["e4", "e5", "Nf3"]) is None
+
+
+def test_memory_budget():
+    """Test that rare sequences are pruned when the node budget is exceeded."""
+    tree = build(GAMES, max_nodes=8)
+    assert len(tree) <= 8
+    assert tree.prune_threshold > 0
+    assert tree.stats(["e4"]) == OpeningStats(3, 1, 1, 1)
+
+
+def test_merge():
+    """Test that merging trees built over parts of the games equals a tree built over all of them."""
+    full = build(GAMES)
+    merged = build(GAMES[:2])
+    merged.merge(build(GAMES[2:]))
+
+    assert len(merged) == len(full)
+    assert merged.stats() == full.stats()
+    assert merged.stats(["e4", "c5", "Nf3"]) == full.stats(["e4", "c5", "Nf3"])
+
+
+def test_persistence(tmp_path: Path):
+    """Test that the tree can be saved to disk and loaded back."""
+    tree = build(GAMES)
+    tree.save(tmp_path / "tree.bin")
+    loaded = OpeningTree.load(tmp_path / "tree.bin")
+
+    assert len(loaded) == len(tree)
+    assert loaded.continuations(["e4"]) == tree.continuations(["e4"])
+
+
+def test_repeated_pruning(tmp_path: Path):
+    """Test that overflowing the budget many times keeps the threshold (and the common counts) sensible."""
+    openings = ["1. e4 e5", "1. d4 d5", "1. c4 e5", "1. Nf3 d5"]
+    games = [
+        PGN.from_string(f"{openings[i % 4]} 2. a{3 + i % 2} h{3 + i % 5} 3. b{3 + i % 3} g{3 + i % 4} *")
+        for i in range(400)
+    ]
+    tree = build(games, max_nodes=40)
+
+    assert len(tree) <= 40
+    assert tree.prune_threshold <= len(games)
+    assert tree.stats(["e4", "e5"]) == OpeningStats(100, 0, 0, 0)
+    assert tree.stats() == OpeningStats(400, 0, 0, 0)
+
+    tree.save(tmp_path / "tree.bin")
+    loaded = OpeningTree.load(tmp_path / "tree.bin")
+    assert loaded.prune_threshold == tree.prune_threshold
+    assert loaded.stats(["e4"]) == tree.stats(["e4"])
@@ -0,0 +1,115 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Literal
+
+import pytest
+from lark import Lark
+
+from pgnparse import PGN
+from pgnparse.parallel import parse_file, parse_many
+from pgnparse.pgn import PGN_PARSER, get_parser
+
+GAMES = [
+    f'[Round "{i}"]\n\n1. e4 e5 2. Nf3 {{Game {i}}} Nc6 (2... d6 3. d4) 3. Bb5 a6 {"1-0" if i % 2 else "0-1"}'
+    for i in range(40)
+]
+
+
+@pytest.mark.parametrize("executor", [None, "thread", "process"])
+def test_parse_many(executor: Literal["thread", "process"] | None):
+    """Test that parsing multiple games produces the same games, in the same order, in every mode."""
+    expected = [PGN.from_string(text) for text in GAMES]
+    assert list(parse_many(GAMES, executor=executor, max_workers=4)) == expected
+
+
+def test_parse_many_existing_executor():
+    """Test that an existing executor can be used."""
+    with ThreadPoolExecutor(2) as pool:
+        games = list(parse_many(GAMES, executor=pool))
+    assert [game.tags["Round"] for game in games] == [str(i) for i in range(40)]
+
+
+def test_parser_per_thread():
+    """Test that each thread gets its own parser instance, reused within the thread."""
+    assert get_parser() is PGN_PARSER
+
+    parsers: list[Lark] = []
+
+    def worker():
+        parsers.extend((get_parser(), get_parser()))
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert parsers[0] is parsers[1]
+    assert parsers[2] is parsers[3]
+    assert parsers[0] is not parsers[2]
+    assert PGN_PARSER not in parsers
+
+
+def test_concurrent_parsing():
+    """Test that parsing from many threads at once produces correct results."""
+    barrier = threading.Barrier(8)
+
+    def parse(text: str) -> PGN:
+        _ = barrier.wait()
+        return PGN.from_string(text)
+
+    with ThreadPoolExecutor(8) as pool:
+        games = list(pool.map(parse, GAMES[:8] * 8))
+    assert games == [PGN.from_string(text) for text in GAMES[:8] * 8]
+
+
+@pytest.mark.parametrize(
+    ("executor", "chunk_size"),
+    [
+        pytest.param(None, 1500, id="serial"),
+        pytest.param("thread", 500, id="thread"),
+        pytest.param("process", None, id="process"),
+        pytest.param("thread", 10, id="more-chunks-than-games"),
+    ],
+)
+def test_parse_file(tmp_path: Path, executor: Literal["thread", "process"] | None, chunk_size: int | None):
+    """Test that a file split into byte ranges parses into all of its games, in order."""
+    path = tmp_path / "games.pgn"
+    _ = path.write_text("\n\n".join(GAMES) + "\n")
+    if chunk_size is None:
+        games = list(parse_file(path, executor=executor, max_workers=2))
+    else:
+        games = list(parse_file(path, executor=executor, max_workers=2, chunk_size=chunk_size))
+    assert games == [PGN.from_string(text) for text in GAMES]
+
+
+def test_parse_many_lazy():
+    """Test that the texts are consumed lazily, with a bounded amount of them in flight."""
+    consumed = 0
+
+    def texts():
+        nonlocal consumed
+        for i in range(100):
+            consumed += 1
+            yield GAMES[i % len(GAMES)]
+
+    games = parse_many(texts(), executor="thread", max_workers=2, chunksize=4)
+    assert next(games) == PGN.from_string(GAMES[0])
+    assert consumed <= 2 * 2 * 4 + 4
+    assert sum(1 for _ in games) == 99
+
+
+def test_parse_file_comments(tmp_path: Path):
+    """Test that the range boundaries aren't placed at tag-like lines inside of multi-line comments."""
+    text = '[Event "A"]\n\n1. e4 {Quoted:\n\n[Event "B"]\n\n1. d4} e5 *\n\n[Event "C"]\n\n1. c4 *\n'
+    path = tmp_path / "games.pgn"
+    _ = path.write_text(text * 20)
+    games = list(parse_file(path, executor=None, chunk_size=17))
+    assert [game.tags["Event"] for game in games] == ["A", "C"] * 20
+
+    text = '[Event "A"]\n\n1. e4 {x\n\n[Event "fake1"]\n\n[Event "fake2"]\ny} e5 *\n\n[Event "B"]\n\n1. d4 *\n'
+    _ = path.write_text(text)
+    for chunk_size in range(1, len(text) + 1):
+        games = list(parse_file(path, executor=None, chunk_size=chunk_size))
+        assert [game.tags["Event"] for game in games] == ["A", "B"], chunk_size
@@ -0,0 +1,73 @@
+import textwrap
+
+import pgnparse
+from pgnparse import PGNGameResult
+
+GAMES = textwrap.dedent(
+    """
+    [White "Carlsen, Magnus"]
+    [Result "1-0"]
+    [ECO "B22"]
+
+    1. e4 c5 2. c3 1-0
+
+    [White "Carlsen, Magnus"]
+    [Result "0-1"]
+    [ECO "B27"]
+
+    1. e4 c5 2. Nf3 0-1
+
+    [White "Nakamura, Hikaru"]
+    [Result "1-0"]
+    [ECO "B20"]
+
+    1. e4 c5 1-0
+
+    [White "Carlsen, Magnus"]
+    [Result "1-0"]
+    [ECO "C20"]
+
+    1. e4 e5 1-0
+    """,
+).encode()
+
+
+def test_where_tags():
+    """Test that games are filtered by exact tag values."""
+    games = list(pgnparse.query(GAMES).where(White="Carlsen, Magnus", Result="1-0"))
+    assert [game.tags["ECO"] for game in games] == ["B22", "C20"]
+
+
+def test_where_eco_and_limit():
+    """Test that glob patterns and limits compose."""
+    q = pgnparse.query(GAMES).where_eco("B2*")
+    assert q.count() == 3
+    assert [game.tags["ECO"] for game in q.limit(2)] == ["B22", "B27"]
+    assert [game.tags["ECO"] for game in q.where_tag("White", "Naka*")] == ["B20"]
+
+
+def test_game_predicate():
+    """Test that predicates on the parsed game are applied after the tag conditions."""
+    q = pgnparse.query(GAMES).where(lambda game: len(game.turns) == 2, Result="1-0")
+    assert [game.tags["ECO"] for game in q] == ["B22"]
+
+
+def test_tag_predicate_and_missing_tag():
+    """Test that tag predicates receive the tag value, and games without the tag don't match."""
+    assert pgnparse.query(GAMES).where(ECO=lambda eco: eco.startswith("C")).count() == 1
+    assert pgnparse.query(GAMES).where(Event="Anything").count() == 0
+
+
+def test_raw_games_are_not_parsed():
+    """Test that raw results expose the matching games without parsing them."""
+    raw = list(pgnparse.query(GAMES).where(Result="0-1").raw())
+    assert len(raw) == 1
+    assert raw[0].parse().result is PGNGameResult.BLACK_WINS
+
+
+def test_first():
+    """Test that the first matching game is returned, or None."""
+    first = pgnparse.query(GAMES).where(White="Nakamura, Hikaru").first()
+    assert first is not None
+    assert first.tags["ECO"] == "B20"
+    assert pgnparse.query(GAMES).where(White="Nobody").first() is None
@@ -0,0 +1,116 @@
+import itertools
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from pgnparse import PGN
+from pgnparse.reader import game_ranges, iter_games, parse_tags, read_range
+
+MULTI_GAME = textwrap.dedent(
+    """
+
+    [Event "First"]
+    [White "Alice"]
+
+    1. e4 e5 {A comment
+    [%clk 0:03:00] spanning lines} 2. Nf3 1-0
+
+    [Event "Second"]
+    [White "Bob"]
+
+    1. d4 d5 0-1
+    [Event "Third"]
+
+    1. c4 *
+    """,
+).encode()
+
+
+def test_split_games():
+    """Test that a multi-game source is split into individual games."""
+    games = list(iter_games(MULTI_GAME))
+    assert [game.tags()["Event"] for game in games] == ["First", "Second", "Third"]
+    assert games[1].parse() == PGN.from_string('[Event "Second"]\n[White "Bob"]\n\n1. d4 d5 0-1')
+
+
+def test_offsets():
+    """Test that the game offsets point to the start of each game in the source."""
+    for game in iter_games(MULTI_GAME):
+        assert MULTI_GAME[game.offset : game.end] == game.data
+        assert game.data.startswith(b"[Event")
+
+
+def test_path_source(tmp_path: Path):
+    """Test that games can be read from a file path."""
+    path = tmp_path / "games.pgn"
+    _ = path.write_bytes(MULTI_GAME)
+    assert [game.data for game in iter_games(path)] == [game.data for game in iter_games(MULTI_GAME)]
+
+
+def test_parse_tags_matches_parser():
+    """Test that the header-only tag scan produces the same tags as the full parser."""
+    data = b'[Event "A \\"quoted\\" event"]\n[Site "?"]\n\n1. e4 {[Fake "tag"]} *\n'
+    assert parse_tags(data) == PGN.from_string(data.decode()).tags
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 7, 50, 500])
+def test_read_range(parts: int):
+    """Test that reading adjacent byte ranges produces every game exactly once, however the source is split."""
+    bounds = [len(MULTI_GAME) * i // parts for i in range(parts + 1)]
+    games = [game for start, end in itertools.pairwise(bounds) for game in read_range(MULTI_GAME, start, end)]
+    assert [game.data for game in games] == [game.data for game in iter_games(MULTI_GAME)]
+
+
+COMMENTED_GAMES = textwrap.dedent(
+    """\
+    [Event "First"]
+
+    1. e4 {A comment quoting a game:
+
+    [Event "Quoted"]
+
+    1. d4 d5} e5 {Short} 1-0
+
+    [Event "Second"]
+
+    1. c4 {Another
+
+    [Site "?"]
+    } c5 *
+
+    [Event "Third"]
+
+    1. Nf3 {Quoting two games:
+
+    [Event "Fake1"]
+
+    [Event "Fake2"]
+    } Nf6 *
+
+    [Event "Fourth"]
+
+    1. g3 *
+    """,
+).encode()
+
+
+def test_read_range_comments():
+    """Test that the ranges starting inside of multi-line comments don't split the games at tag-like lines."""
+    expected = [game.data for game in iter_games(COMMENTED_GAMES)]
+    assert len(expected) == 4
+    for split in range(len(COMMENTED_GAMES) + 1):
+        games = [*read_range(COMMENTED_GAMES, 0, split), *read_range(COMMENTED_GAMES, split, len(COMMENTED_GAMES))]
+        assert [game.data for game in games] == expected, split
+
+
+@pytest.mark.parametrize("size", [pytest.param(size, id=str(size)) for size in (1, 15, 40, 1000)])
+def test_game_ranges(size: int):
+    """Test that the ranges start at the games (never inside of comments), reading every game exactly once."""
+    ranges = list(game_ranges(COMMENTED_GAMES, size))
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(COMMENTED_GAMES)
+    assert all(end == start for (_, end), (start, _) in itertools.pairwise(ranges))
+
+    games = [game for start, end in ranges for game in read_range(COMMENTED_GAMES, start, end, aligned=True)]
+    assert [game.data for game in games] == [game.data for game in iter_games(COMMENTED_GAMES)]
@@ -0,0 +1,71 @@
+import random
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from pgnparse.reader import iter_games
+from pgnparse.sampling import reservoir_sample, sample_at, sample_games, stratified_sample
+
+SOURCE = b"".join(f'[Event "{i}"]\n[ECO "{"ABC"[i % 3]}00"]\n\n1. e4 e5 *\n\n'.encode() for i in range(30))
+
+
+@pytest.mark.parametrize(("n", "k"), [pytest.param(10, 2, id="few"), pytest.param(10, 9, id="most")])
+def test_reservoir_uniform(n: int, k: int):
+    """Test that every item is sampled with (roughly) the same probability."""
+    rng = random.Random(0)  # noqa: S311
+    trials = 4000
+    counts = Counter(item for _ in range(trials) for item in reservoir_sample(range(n), k, rng))
+    expected = trials * k / n
+    assert sorted(counts) == list(range(n))
+    assert all(abs(count - expected) < expected * 0.15 for count in counts.values())
+
+
+@pytest.mark.parametrize(
+    ("n", "k", "expected"),
+    [
+        pytest.param(5, 0, 0, id="empty-sample"),
+        pytest.param(5, 5, 5, id="exact"),
+        pytest.param(3, 5, 3, id="fewer-items"),
+        pytest.param(1000, 7, 7, id="many-items"),
+    ],
+)
+def test_reservoir_size(n: int, k: int, expected: int):
+    """Test that the sample has k distinct items (or all of them, if there are fewer)."""
+    sample = reservoir_sample(range(n), k, random.Random(1))  # noqa: S311
+    assert len(set(sample)) == expected
+
+
+def test_sample_games():
+    """Test that the games are sampled reproducibly, in the order of the source."""
+    sample = sample_games(SOURCE, 5, seed=42)
+    assert len(sample) == 5
+    assert [game.offset for game in sample] == sorted(game.offset for game in sample)
+    assert [game.data for game in sample] == [game.data for game in sample_games(SOURCE, 5, seed=42)]
+    assert sample[0].parse().tags["Event"] == sample[0].tags()["Event"]
+
+    with pytest.raises(ValueError, match="can't be negative"):
+        _ = sample_games(SOURCE, -1)
+
+
+def test_stratified_sample(tmp_path: Path):
+    """Test that each stratum is sampled separately."""
+    path = tmp_path / "games.pgn"
+    _ = path.write_bytes(SOURCE)
+    sample = stratified_sample(path, 4, "ECO", seed=3)
+    assert sorted(sample) == ["A00", "B00", "C00"]
+    for eco, games in sample.items():
+        assert len(games) == 4
+        assert all(game.tags()["ECO"] == eco for game in games)
+
+    everything = stratified_sample(path, 100, lambda tags: tags["Event"][-1], seed=3)
+    assert sum(map(len, everything.values())) == 30
+
+
+def test_sample_at():
+    """Test that the games are sampled from the given offsets only."""
+    offsets = [game.offset for game in iter_games(SOURCE) if game.tags()["ECO"] == "B00"]
+    sample = sample_at(SOURCE, offsets, 3, seed=5)
+    assert len(sample) == 3
+    assert all(game.tags()["ECO"] == "B00" for game in sample)
+    assert [game.offset for game in sample_at(SOURCE, offsets, 50)] == offsets
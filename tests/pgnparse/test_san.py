@@ -0,0 +1,45 @@
+import pytest
+
+from pgnparse import PGNTurnMove
+from pgnparse.san import InvalidSANError, SANMove, decode_san
+
+
+@pytest.mark.parametrize(
+    ("san", "expected"),
+    [
+        pytest.param("e4", SANMove("P", 28), id="pawn-push"),
+        pytest.param("exd5", SANMove("P", 35, from_file=4, capture=True), id="pawn-capture"),
+        pytest.param("e8=Q#", SANMove("P", 60, promotion="Q", check=True, mate=True), id="promotion"),
+        pytest.param("Nf3", SANMove("N", 21), id="piece"),
+        pytest.param("Bxc6+", SANMove("B", 42, capture=True, check=True), id="piece-capture"),
+        pytest.param("Nbd7", SANMove("N", 51, from_file=1), id="file-disambiguation"),
+        pytest.param("R1xa3", SANMove("R", 16, from_rank=0, capture=True), id="rank-disambiguation"),
+        pytest.param("Qh4xe1", SANMove("Q", 4, from_file=7, from_rank=3, capture=True), id="square-disambiguation"),
+        pytest.param("O-O", SANMove("K", -1, castling="kingside"), id="kingside-castling"),
+        pytest.param("0-0-0+", SANMove("K", -1, castling="queenside", check=True), id="queenside-castling"),
+    ],
+)
+def test_decode_san(san: str, expected: SANMove):
+    """Test that the move strings are decoded correctly, both from the precomputed table and outside of it."""
+    assert decode_san(san) == expected
+
+
+@pytest.mark.parametrize("san", ["e4", "Qh4xe1"])
+def test_decodings_interned(san: str):
+    """Test that decoding the same move string produces the same instance."""
+    assert decode_san(san) is decode_san(san)
+
+
+@pytest.mark.parametrize("san", ["", "e9", "Pe4", "Nf3!", "O-O-O-O"])
+def test_invalid_san(san: str):
+    """Test that invalid move strings are rejected."""
+    with pytest.raises(InvalidSANError):
+        _ = decode_san(san)
+
+
+def test_move_property():
+    """Test that the decoding is exposed on the moves, following the changes of the move string."""
+    move = PGNTurnMove("Nf3")
+    assert move.san.piece == "N"
+    move.move_string = "e4"
+    assert move.san is decode_san("e4")
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+
+from pgnparse.reader import iter_games
+from pgnparse.sharding import ShardWriter, shard_games, shard_name
+
+SOURCE = b"".join(
+    f'[Event "{event}"]\n[Date "{date}"]\n\n1. e4 e5 *\n\n'.encode()
+    for event, date in [
+        ("Open/A", "2024.01.05"),
+        ("Blitz", "2024.02.01"),
+        ("Open/A", "2024.01.20"),
+        ("Rapid", "2024.02.11"),
+        ("Blitz", "2024.03.02"),
+    ]
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        pytest.param("Open/A", "Open_A", id="separator"),
+        pytest.param("../..", "unknown", id="traversal"),
+        pytest.param("", "unknown", id="empty"),
+        pytest.param("2024.01", "2024.01", id="safe"),
+        pytest.param("CON", "CON_", id="reserved"),
+        pytest.param("nul.txt", "nul_.txt", id="reserved-extension"),
+        pytest.param("COM1/x", "COM1_x", id="not-reserved"),
+    ],
+)
+def test_shard_name(value: str, expected: str):
+    """Test that the key values are converted into safe file names."""
+    assert shard_name(value) == expected
+
+
+@pytest.mark.parametrize("max_open", [pytest.param(1, id="one-open"), pytest.param(64, id="all-open")])
+def test_shard_games(tmp_path: Path, max_open: int):
+    """Test that the games are partitioned by the key, regardless of the amount of the open files."""
+    counts = shard_games(SOURCE, tmp_path / "events", "Event", max_open=max_open)
+    assert counts == {"Open/A": 2, "Blitz": 2, "Rapid": 1}
+    assert sorted(path.name for path in (tmp_path / "events").iterdir()) == ["Blitz.pgn", "Open_A.pgn", "Rapid.pgn"]
+    dates = [game.tags()["Date"] for game in iter_games(tmp_path / "events" / "Blitz.pgn")]
+    assert dates == ["2024.02.01", "2024.03.02"]
+
+
+def test_shard_by_function(tmp_path: Path):
+    """Test that the games can be partitioned by a function of their tags."""
+    counts = shard_games(SOURCE, tmp_path, lambda tags: tags["Date"][:7], max_open=2)
+    assert counts == {"2024.01": 2, "2024.02": 2, "2024.03": 1}
+    assert len(list(iter_games(tmp_path / "2024.02.pgn"))) == 2
+
+
+def test_shared_file_name(tmp_path: Path):
+    """Test that the values sharing a file name don't overwrite each other."""
+    with ShardWriter(tmp_path, max_open=1) as writer:
+        writer.write("a/b", b'[Event "1"]\n\n*')
+        writer.write("a_b", b'[Event "2"]\n\n*')
+    assert len(list(iter_games(tmp_path / "a_b.pgn"))) == 2
+
+
+def test_case_insensitive_names(tmp_path: Path):
+    """Test that the shards whose names only differ in case share a file, rather than overwriting each other."""
+    (tmp_path / "shards").mkdir()
+    with ShardWriter(tmp_path / "shards", max_open=1) as writer:
+        writer.write("Blitz", b'[Event "1"]\n\n*')
+        writer.write("blitz", b'[Event "2"]\n\n*')
+        writer.write("Blitz", b'[Event "3"]\n\n*')
+    assert writer.counts == {"Blitz": 2, "blitz": 1}
+    assert [path.name for path in (tmp_path / "shards").iterdir()] == ["Blitz.pgn"]
+    assert [game.tags()["Event"] for game in iter_games(tmp_path / "shards" / "Blitz.pgn")] == ["1", "2", "3"]
+
+    with pytest.raises(ValueError, match="must be positive"):
+        _ = ShardWriter(tmp_path, max_open=0)
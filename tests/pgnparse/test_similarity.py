@@ -0,0 +1,101 @@
+import struct
+from array import array
+from pathlib import Path
+
+import pytest
+
+from pgnparse import PGN
+from pgnparse.similarity import LSHIndex, MinHasher, estimate_similarity
+
+GAME = (
+    "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5 7. Bb3 d6 8. c3 O-O 9. h3 Nb8 "
+    "10. d4 Nbd7 11. c4 c6 12. cxb5 axb5 13. Nc3 Bb7 14. Bg5 b4 15. Nb1 h6 16. Bh4 c5 17. dxe5 Nxe4 "
+    "18. Bxe7 Qxe7 19. exd6 Qf6 20. Nbd2 Nxd6 *"
+)
+NEAR_DUPLICATE = GAME.replace("20. Nbd2 Nxd6", "20. Nbd2 Qxd6")
+TRUNCATED = GAME.partition(" 15.")[0] + " *"
+OTHER = "1. d4 d5 2. c4 e6 3. Nc3 Nf6 4. Bg5 Be7 5. e3 O-O 6. Nf3 h6 7. Bh4 b6 *"
+
+
+def test_signature():
+    """Test that the signatures ignore formatting differences, and are derived from the seed."""
+    hasher = MinHasher()
+    signature = hasher.signature(PGN.from_string(GAME))
+    assert len(signature) == hasher.num_perm
+    assert signature == hasher.signature(PGN.from_string(GAME.replace(" e5 ", " e5 {Hi} (1... c5) ")).turns)
+    assert signature == MinHasher().signature(PGN.from_string(GAME))
+    assert signature != MinHasher(seed=2).signature(PGN.from_string(GAME))
+
+
+@pytest.mark.parametrize(
+    ("other", "minimum", "maximum"),
+    [
+        pytest.param(GAME, 1.0, 1.0, id="same"),
+        pytest.param(NEAR_DUPLICATE, 0.8, 0.99, id="near-duplicate"),
+        pytest.param(TRUNCATED, 0.5, 0.8, id="truncated"),
+        pytest.param(OTHER, 0.0, 0.1, id="different"),
+    ],
+)
+def test_estimate_similarity(other: str, minimum: float, maximum: float):
+    """Test that the estimated similarity reflects the shared move n-grams."""
+    hasher = MinHasher()
+    similarity = estimate_similarity(hasher.signature(PGN.from_string(GAME)), hasher.signature(PGN.from_string(other)))
+    assert minimum <= similarity <= maximum
+
+
+def test_short_games():
+    """Test that the games shorter than the n-gram length (or without moves) still get signatures."""
+    hasher = MinHasher()
+    assert (
+        estimate_similarity(hasher.signature(PGN.from_string("1. e4 *")), hasher.signature(PGN.from_string("1. e4 *")))
+        == 1
+    )
+    assert hasher.shingles(PGN.from_string("*").turns) == set()
+    assert len(hasher.signature(PGN.from_string("*"))) == hasher.num_perm
+
+
+def test_query():
+    """Test that the index finds the near neighbours, sorted by their similarity."""
+    index = LSHIndex()
+    index.add_all((key, PGN.from_string(game)) for key, game in enumerate((OTHER, TRUNCATED, NEAR_DUPLICATE, GAME)))
+    assert len(index) == 4
+
+    results = index.query(PGN.from_string(GAME))
+    assert [key for key, _ in results] == [3, 2, 1]
+    assert results[0][1] == 1
+    assert [key for key, _ in index.query(PGN.from_string(GAME), threshold=0.8)] == [3, 2]
+    assert [key for key, _ in index.query(PGN.from_string(GAME), limit=1)] == [3]
+    assert index.signature(2) == index.hasher.signature(PGN.from_string(NEAR_DUPLICATE))
+
+
+def test_save_load(tmp_path: Path):
+    """Test that the index (with its hasher parameters) survives a save/load round-trip."""
+    index = LSHIndex(MinHasher(num_perm=64, n=2, seed=7), bands=16)
+    index.add_all((key * 1000, PGN.from_string(game)) for key, game in enumerate((GAME, NEAR_DUPLICATE, OTHER)))
+    index.save(tmp_path / "games.lsh")
+
+    loaded = LSHIndex.load(tmp_path / "games.lsh")
+    assert (loaded.hasher.num_perm, loaded.hasher.n, loaded.hasher.seed, loaded.bands) == (64, 2, 7, 16)
+    assert loaded.query(PGN.from_string(GAME)) == index.query(PGN.from_string(GAME))
+
+    # The arrays are stored in little-endian byte order, regardless of the platform
+    data = (tmp_path / "games.lsh").read_bytes()
+    keys_start = struct.calcsize("<8sIIQQQ")
+    assert data[keys_start + 8 : keys_start + 16] == (1000).to_bytes(8, "little")
+    assert data[keys_start + 24 : keys_start + 28] == index.signature(0)[0].to_bytes(4, "little")
+
+    _ = (tmp_path / "other.bin").write_bytes(b"not an index at all, just some bytes")
+    with pytest.raises(ValueError, match="Not an LSH index file"):
+        _ = LSHIndex.load(tmp_path / "other.bin")
+
+
+def test_validation():
+    """Test that the invalid parameters and mismatched signatures are rejected."""
+    with pytest.raises(ValueError, match="must be positive"):
+        _ = MinHasher(n=0)
+    with pytest.raises(ValueError, match="divisible"):
+        _ = LSHIndex(bands=30)
+    with pytest.raises(ValueError, match="doesn't match"):
+        LSHIndex().add(0, array("I", [1, 2, 3]))
+    with pytest.raises(ValueError, match="same length"):
+        _ = estimate_similarity(array("I", [1]), array("I", [1, 2]))
@@ -0,0 +1,101 @@
+import gzip
+import os
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+
+from pgnparse.reader import iter_games
+from pgnparse.sorting import GameKey, sort_games, tag_sort_key
+
+
+def _game(event: str, date: str, elo: str) -> bytes:
+    return f'[Event "{event}"]\n[Date "{date}"]\n[WhiteElo "{elo}"]\n\n1. e4 e5 *\n\n'.encode()
+
+
+GAMES = [
+    _game("A", "2024.03.01", "2100"),
+    _game("B", "2023.??.??", "950"),
+    _game("C", "2024.01.15", "1800"),
+    _game("D", "2023.12.31", "2400"),
+    _game("E", "2024.01.15", "1200"),
+]
+SOURCE = b"".join(GAMES)
+
+
+def _events_a_e_last(tags: Mapping[str, str]) -> str:
+    return tags["Event"] if tags["Event"] in "AE" else ""
+
+
+@pytest.mark.parametrize(
+    ("tag", "value", "expected"),
+    [
+        pytest.param("Date", "1992.??.??", "1992.00.00", id="partial-date"),
+        pytest.param("WhiteElo", "950", "00000000000000000950", id="number"),
+        pytest.param("Event", "Open", "Open", id="string"),
+    ],
+)
+def test_tag_sort_key(tag: str, value: str, expected: str):
+    """Test that the tag values are ordered naturally."""
+    assert tag_sort_key(tag, value) == expected
+
+
+@pytest.mark.parametrize("max_records", [pytest.param(n, id=f"runs-of-{n}") for n in (1, 2, 100)])
+@pytest.mark.parametrize(
+    ("key", "expected"),
+    [
+        pytest.param("Date", "BDCEA", id="date"),
+        pytest.param("WhiteElo", "BECAD", id="rating"),
+        pytest.param(_events_a_e_last, "BCDAE", id="function"),
+    ],
+)
+def test_sort_games(tmp_path: Path, key: GameKey, expected: str, max_records: int):
+    """Test that the games are sorted (stably) regardless of the size of the runs."""
+    output = tmp_path / "sorted.pgn"
+    assert sort_games(SOURCE, output, key, max_records=max_records, temp_dir=tmp_path) == len(GAMES)
+    assert "".join(game.tags()["Event"] for game in iter_games(output)) == expected
+    assert sorted(game.data for game in iter_games(output)) == sorted(GAMES)
+    assert list(tmp_path.iterdir()) == [output]
+
+
+def test_sort_unterminated(tmp_path: Path):
+    """Test that the games without a trailing newline are still separated in the output."""
+    output = tmp_path / "sorted.pgn"
+    _ = sort_games(GAMES[0] + GAMES[1].rstrip(), output)
+    assert [game.tags()["Event"] for game in iter_games(output)] == ["B", "A"]
+
+
+def test_sort_many_runs(tmp_path: Path):
+    """Test that the runs are merged in multiple passes when there are too many of them."""
+    games = [_game(str(i), "2024.01.01", str(1000 + (i * 7919) % 300)) for i in range(300)]
+    output = tmp_path / "sorted.pgn"
+    assert sort_games(b"".join(games), output, "WhiteElo", max_records=1) == 300
+    ratings = [int(game.tags()["WhiteElo"]) for game in iter_games(output)]
+    assert ratings == sorted(ratings)
+
+
+def test_sort_compressed(tmp_path: Path):
+    """Test that the compressed sources are rejected, rather than copying the compressed bytes at the offsets."""
+    path = tmp_path / "games.pgn.gz"
+    _ = path.write_bytes(gzip.compress(SOURCE))
+    with pytest.raises(ValueError, match="Compressed"):
+        _ = sort_games(path, tmp_path / "sorted.pgn")
+    with path.open("rb") as f, pytest.raises(ValueError, match="Compressed"):
+        _ = sort_games(f, tmp_path / "sorted.pgn")
+
+
+def test_sort_file_object(tmp_path: Path):
+    """Test that the file objects are sorted from their current position, and must be seekable."""
+    path = tmp_path / "games.pgn"
+    _ = path.write_bytes(GAMES[0] + SOURCE)
+    output = tmp_path / "sorted.pgn"
+    with path.open("rb") as f:
+        _ = f.seek(len(GAMES[0]))
+        assert sort_games(f, output, "Date") == len(GAMES)
+    assert [game.tags()["Event"] for game in iter_games(output)] == list("BDCEA")
+
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(write_fd, "wb") as pipe:
+        _ = pipe.write(SOURCE)
+    with os.fdopen(read_fd, "rb") as pipe, pytest.raises(ValueError, match="seekable"):
+        _ = sort_games(pipe, output)
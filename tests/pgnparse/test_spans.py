@@ -0,0 +1,64 @@
+import pytest
+
+from pgnparse import PGN, PGNBasicAnnotation
+from pgnparse.spans import MoveSpans
+
+GAME = '[Event "Test"]\n\n1. e4! {Best by test} e5 $1 $2 (1... c5 2. Nf3 {Sicilian}) 2. Nf3 Nc6 *'
+
+
+def test_spans_point_into_source():
+    """Test that the move and comment spans point to the right parts of the source."""
+    spans = MoveSpans.from_string(GAME)
+    first = spans[0]
+    start, end = first.move_span
+    assert GAME[start:end] == "e4"
+    assert first.comment_span is not None
+    assert GAME[first.comment_span[0] : first.comment_span[1]] == "Best by test"
+    assert spans[1].comment_span is None
+
+
+def test_move_data():
+    """Test that all of the move data are kept."""
+    spans = MoveSpans.from_string(GAME)
+    assert [move.move_string for move in spans] == ["e4", "e5", "c5", "Nf3", "Nf3", "Nc6"]
+    assert [move.depth for move in spans] == [0, 0, 1, 1, 0, 0]
+    assert [move.turn_number for move in spans] == [1, 1, 1, 2, 2, 2]
+    assert [move.is_black for move in spans] == [False, True, True, False, False, True]
+    assert spans[0].annotation is PGNBasicAnnotation.GOOD_MOVE
+    assert spans[1].numeric_annotations == [1, 2]
+    assert spans[3].comment == "Sicilian"
+
+
+def test_mainline():
+    """Test that the mainline skips the variation moves."""
+    spans = MoveSpans.from_string(GAME)
+    assert [move.move_string for move in spans.mainline()] == ["e4", "e5", "Nf3", "Nc6"]
+
+
+def test_matches_full_parser():
+    """Test that the materialized moves match the ones produced by the full parser."""
+    spans = MoveSpans.from_string(GAME)
+    expected = list(PGN.from_string(GAME).turns.mainline_moves())
+    assert [move.to_move() for move in spans.mainline()] == expected
+
+
+@pytest.mark.parametrize(
+    ("index", "expected"),
+    [
+        pytest.param(-1, "Nc6", id="negative"),
+        pytest.param(slice(1, 3), ["e5", "c5"], id="slice"),
+    ],
+)
+def test_indexing(index: int | slice, expected: str | list[str]):
+    """Test that the spans can be indexed like a sequence."""
+    result = MoveSpans.from_string(GAME)[index]
+    if isinstance(result, list):
+        assert [move.move_string for move in result] == expected
+    else:
+        assert result.move_string == expected
+
+
+def test_index_out_of_range():
+    """Test that indexing beyond the moves raises an IndexError."""
+    with pytest.raises(IndexError):
+        _ = MoveSpans.from_string(GAME)[6]
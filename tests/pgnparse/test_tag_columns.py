@@ -0,0 +1,134 @@
+from pathlib import Path
+from typing import Literal
+
+import pytest
+
+from pgnparse import PGN, PGNGameResult
+
+_ = pytest.importorskip("numpy")
+
+from pgnparse.encoding import RESULT_LABELS  # noqa: E402
+from pgnparse.tag_columns import TagColumns, eco_code, eco_name  # noqa: E402
+
+TAGS: list[dict[str, str]] = [
+    {
+        "WhiteElo": "1510",
+        "BlackElo": "1650",
+        "Date": "2024.03.15",
+        "TimeControl": "300+2",
+        "Result": "1-0",
+        "ECO": "B90",
+    },
+    {"WhiteElo": "2210", "BlackElo": "?", "Date": "2023.??.??", "TimeControl": "-", "Result": "0-1", "ECO": "B90"},
+    {"WhiteElo": "1590", "BlackElo": "1610", "Date": "????.??.??", "TimeControl": "40/7200:3600", "Result": "1/2-1/2"},
+    {},
+]
+
+
+def test_columns():
+    """Test that the tag values are parsed into the typed columns, with -1 for the missing values."""
+    columns = TagColumns.from_tags(TAGS)
+    assert len(columns) == 4
+    assert columns.white_elo.tolist() == [1510, 2210, 1590, -1]
+    assert columns.black_elo.tolist() == [1650, -1, 1610, -1]
+    assert columns.year.tolist() == [2024, 2023, -1, -1]
+    assert columns.month.tolist() == [3, -1, -1, -1]
+    assert columns.day.tolist() == [15, -1, -1, -1]
+    assert columns.base_time.tolist() == [300, -1, 7200, -1]
+    assert columns.increment.tolist() == [2, -1, 0, -1]
+    assert [RESULT_LABELS[label] for label in columns.results] == [
+        PGNGameResult.WHITE_WINS,
+        PGNGameResult.BLACK_WINS,
+        PGNGameResult.DRAW,
+        PGNGameResult.UNSPECIFIED,
+    ]
+    assert [eco_name(code) if code >= 0 else None for code in columns.eco] == ["B90", "B90", None, None]
+    assert columns.masks["black_elo"].tolist() == [True, False, True, False]
+
+
+def test_non_decimal_digits():
+    """Test that the values with non-decimal digits (which `int` rejects) are treated as missing."""
+    columns = TagColumns.from_tags([{"WhiteElo": "\u00b2", "Date": "2024.0\u00b2.15", "TimeControl": "3\u00b2+2"}])
+    assert columns.white_elo.tolist() == [-1]
+    assert columns.month.tolist() == [-1]
+    assert columns.base_time.tolist() == [-1]
+
+
+def test_out_of_range_values():
+    """Test that the values which don't fit into their columns are treated as missing, rather than wrapping around."""
+    tags = [
+        {"WhiteElo": "99999999999", "BlackElo": "2147483647", "Date": "70000.01.01", "TimeControl": "99999999999+2"},
+        {"WhiteElo": "1500", "Date": "32767.01.01", "TimeControl": "60+99999999999"},
+    ]
+    columns = TagColumns.from_tags(tags)
+    assert columns.white_elo.tolist() == [-1, 1500]
+    assert columns.black_elo.tolist() == [2147483647, -1]
+    assert columns.year.tolist() == [-1, 32767]
+    assert columns.masks["year"].tolist() == [False, True]
+    assert columns.base_time.tolist() == [-1, -1]
+    assert columns.increment.tolist() == [-1, -1]
+
+
+def test_from_source(tmp_path: Path):
+    """Test that the columns can be built from a PGN source without parsing the games, as well as from games."""
+    path = tmp_path / "games.pgn"
+    _ = path.write_text(
+        '[WhiteElo "1500"]\n[Result "1-0"]\n\n1. e4 1-0\n\n[WhiteElo "1700"]\n[Result "0-1"]\n\n1. d4 0-1\n',
+    )
+    from_source = TagColumns.from_source(path)
+    assert from_source.white_elo.tolist() == [1500, 1700]
+
+    games = [PGN.from_string('[WhiteElo "1500"]\n\n1. e4 1-0')]
+    assert TagColumns.from_games(games).white_elo.tolist() == [1500]
+
+
+@pytest.mark.parametrize(
+    ("player", "expected"),
+    [
+        pytest.param("white", [15, 22, 15, -1], id="white"),
+        pytest.param("black", [16, -1, 16, -1], id="black"),
+        pytest.param("average", [15, -1, 16, -1], id="average"),
+    ],
+)
+def test_rating_buckets(player: Literal["white", "black", "average"], expected: list[int]):
+    """Test that the games are bucketed by the ratings, with -1 for the missing ratings."""
+    columns = TagColumns.from_tags(TAGS)
+    assert columns.rating_buckets(100, player).tolist() == expected
+
+
+def test_rating_histogram():
+    """Test counting the games in the rating buckets."""
+    histogram = TagColumns.from_tags(TAGS).rating_histogram(500, "white")
+    assert histogram.tolist() == [0, 0, 0, 2, 1]
+
+
+def test_results_by_eco():
+    """Test counting the results by the ECO codes."""
+    counts = TagColumns.from_tags(TAGS).results_by_eco()
+    assert counts.shape == (500, len(RESULT_LABELS))
+    assert counts[eco_code("B90")].tolist() == [1, 1, 0, 0, 0]
+    assert counts.sum() == 2
+
+
+def test_results_by_rating():
+    """Test counting the results by the rating buckets."""
+    columns = TagColumns.from_tags(TAGS)
+    counts = columns.results_by(columns.rating_buckets(1000, "white"))
+    assert counts.tolist() == [[0, 0, 0, 0, 0], [1, 0, 1, 0, 0], [0, 1, 0, 0, 0]]
+
+
+@pytest.mark.parametrize(
+    ("eco", "code"),
+    [
+        pytest.param("A00", 0, id="first"),
+        pytest.param("E99", 499, id="last"),
+        pytest.param("F00", -1, id="invalid-letter"),
+        pytest.param("B9", -1, id="too-short"),
+        pytest.param("B9\u00b2", -1, id="superscript"),
+    ],
+)
+def test_eco_code(eco: str, code: int):
+    """Test converting the ECO codes into their indices."""
+    assert eco_code(eco) == code
+    if code >= 0:
+        assert eco_name(code) == eco
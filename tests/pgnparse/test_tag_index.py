@@ -0,0 +1,96 @@
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from pgnparse.reader import read_games_at
+from pgnparse.tag_index import TagIndex
+
+GAMES = textwrap.dedent(
+    """
+    [Event "Candidates"]
+    [White "Carlsen, Magnus"]
+    [Date "2024.04.05"]
+    [ECO "B22"]
+
+    1. e4 c5 1-0
+
+    [Event "Candidates"]
+    [White "Caruana, Fabiano"]
+    [Date "2024.04.06"]
+    [ECO "C42"]
+
+    1. e4 e5 0-1
+
+    [Event "Olympiad"]
+    [White "Carlsen, Magnus"]
+    [Date "2024.??.??"]
+    [ECO "B20"]
+
+    1. e4 c5 1/2-1/2
+
+    [Event "Blitz"]
+    [White "Nakamura, Hikaru"]
+    [Date "2023.12.31"]
+
+    1. d4 d5 *
+    """,
+).encode()
+
+
+@pytest.fixture
+def index() -> TagIndex:
+    """Build a tag index over the sample games."""
+    return TagIndex.build(GAMES)
+
+
+def events(offsets: list[int]) -> list[str]:
+    """Get the events of the games at given offsets."""
+    return [game.tags()["Event"] for game in read_games_at(GAMES, offsets)]
+
+
+def test_lookup(index: TagIndex):
+    """Test that exact lookups return the (sorted) offsets of the matching games."""
+    offsets = index.lookup("White", "Carlsen, Magnus")
+    assert offsets == sorted(offsets)
+    assert events(offsets) == ["Candidates", "Olympiad"]
+    assert index.lookup("White", "Nobody") == []
+    assert events(index.lookup("Date", "2024.??.??")) == ["Olympiad"]
+
+
+def test_prefix(index: TagIndex):
+    """Test that prefix lookups return the games with any of the matching values."""
+    assert events(index.prefix("White", "Car")) == ["Candidates", "Candidates", "Olympiad"]
+    assert events(index.prefix("ECO", "B2")) == ["Candidates", "Olympiad"]
+    assert index.prefix("ECO", "A") == []
+
+
+def test_date_range(index: TagIndex):
+    """Test that date ranges are inclusive, with partial dates ordered before the full ones."""
+    assert events(index.date_range("2024.04.06", "2024.12.31")) == ["Candidates"]
+    assert events(index.date_range("2024.01.01")) == ["Candidates", "Candidates"]
+    assert events(index.date_range(stop="2024.00.00")) == ["Olympiad", "Blitz"]
+
+
+def test_unindexed_tag(index: TagIndex):
+    """Test that querying a tag which isn't indexed raises a KeyError."""
+    with pytest.raises(KeyError):
+        _ = index.lookup("Round", "1")
+
+
+def test_read_games(index: TagIndex):
+    """Test that the indexed games can be read directly from the source."""
+    games = list(index.games(GAMES, index.lookup("ECO", "C42")))
+    assert games[0].parse().tags["White"] == "Caruana, Fabiano"
+
+
+def test_persistence(index: TagIndex, tmp_path: Path):
+    """Test that the index can be saved into a sidecar file and loaded back."""
+    index.save(tmp_path / "games.pgn.tags")
+    loaded = TagIndex.load(tmp_path / "games.pgn.tags")
+
+    assert loaded.tags == index.tags
+    for tag in index.tags:
+        assert loaded.values(tag) == index.values(tag)
+        for value in index.values(tag):
+            assert loaded.lookup(tag, value) == index.lookup(tag, value)
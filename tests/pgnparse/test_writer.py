@@ -0,0 +1,100 @@
+import io
+from dataclasses import replace
+
+import pytest
+
+from pgnparse import PGN, PGNTurn, PGNTurnList, PGNTurnMove
+from pgnparse.writer import PGNWriter
+
+GAME = PGN.from_string(
+    '[White "Kasparov"]\n[Annotator "Someone"]\n[Event "Test"]\n[Black "Topalov"]\n\n'
+    "{Intro} 1. e4! {Best by test, the king of openings} e5 $1 $2 (1... c5 2. Nf3 (2. c3 d5) 2... d6) "
+    "2. Nf3 Nc6?! 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5 7. Bb3 d6 8. c3 O-O 9. h3 Nb8 10. d4 Nbd7 1-0",
+)
+
+
+def test_export_format():
+    """Test the default output: the tag roster order, the move numbers and 80-column wrapping."""
+    assert PGNWriter().format(GAME) == (
+        '[Event "Test"]\n[White "Kasparov"]\n[Black "Topalov"]\n[Annotator "Someone"]\n\n'
+        "{Intro} 1. e4! {Best by test, the king of openings} 1... e5 $1 $2 (1... c5 2.\n"
+        "Nf3 (2. c3 d5) 2... d6) 2. Nf3 Nc6?! 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5\n"
+        "7. Bb3 d6 8. c3 O-O 9. h3 Nb8 10. d4 Nbd7 1-0\n"
+    )
+
+
+@pytest.mark.parametrize("line_width", [1, 12, 40, 80, None])
+def test_wrapping(line_width: int | None):
+    """Test that the lines fit the width (unless a single token is longer) and that the output parses back."""
+    text = PGNWriter(line_width=line_width).format(GAME)
+    movetext = text.split("\n\n", 1)[1]
+    for line in movetext.splitlines():
+        assert line_width is None or len(line) <= line_width or " " not in line
+        assert not line.startswith(")")
+        assert not line.endswith("(")
+
+    reparsed = PGN.from_string(text.strip())
+    assert [str(move).split() for move in reparsed.turns.mainline_moves()] == [
+        str(move).split() for move in GAME.turns.mainline_moves()
+    ]
+    assert PGNWriter(line_width=line_width).format(reparsed) == text
+
+
+def test_normalization_idempotent():
+    """Test that writing a game written by the writer produces the same output."""
+    text = PGNWriter().format(GAME)
+    assert PGNWriter().format(PGN.from_string(text.strip())) == text
+
+
+@pytest.mark.parametrize(
+    ("writer", "expected"),
+    [
+        pytest.param(
+            PGNWriter(comments=False, variations=False, annotations=False, nags=False, movetext_only=True),
+            "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6",
+            id="moves-only",
+        ),
+        pytest.param(
+            PGNWriter(variations=False, movetext_only=True),
+            "1. e4! {Best by test, the king of openings} 1... e5 $1 $2 2. Nf3 Nc6?! 3. Bb5 a6",
+            id="no-variations",
+        ),
+        pytest.param(
+            PGNWriter(comments=False, nags=False, movetext_only=True),
+            "1. e4! e5 (1... c5 2. Nf3 (2. c3 d5) 2... d6) 2. Nf3 Nc6?! 3. Bb5 a6",
+            id="no-comments-nags",
+        ),
+    ],
+)
+def test_stripping(writer: PGNWriter, expected: str):
+    """Test that the comments, variations and annotations can be stripped."""
+    text = replace(writer, line_width=None).format(GAME)
+    assert text.startswith(expected + " ")
+    assert "Intro" not in text
+    assert "[" not in text
+
+
+def test_tag_options():
+    """Test the original tag order and escaping of the unescaped tag values."""
+    game = PGN({"White": 'A "B" C\\D', "Event": "E"}, PGNTurnList([PGNTurn(1, PGNTurnMove("e4"), None)]))
+    assert PGNWriter(tag_order="original", escape_tags=True).format(game) == (
+        '[White "A \\"B\\" C\\\\D"]\n[Event "E"]\n\n1. e4 *\n'
+    )
+
+
+def test_empty_game():
+    """Test that a game without moves consists of just its termination marker."""
+    assert PGNWriter().format(PGN()) == "*\n"
+
+
+def test_write_all():
+    """Test that multiple games are separated by blank lines."""
+    fp = io.StringIO()
+    assert PGNWriter(movetext_only=True).write_all([GAME, PGN()], fp) == 2
+    assert fp.getvalue().endswith("1-0\n\n*\n")
+
+
+def test_invalid_line_width():
+    """Test that a non-positive line width is rejected."""
+    with pytest.raises(ValueError, match="line width"):
+        _ = PGNWriter(line_width=0)
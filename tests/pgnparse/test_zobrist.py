@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from pgnparse import PGN
+from pgnparse.board import Board
+from pgnparse.zobrist import PositionIndex, position_hashes
+
+GAMES = [
+    PGN.from_string("1. e4 e5 2. Nf3 Nc6 3. Bb5"),
+    PGN.from_string("1. Nf3 Nc6 2. e4 e5 3. Bc4"),
+    PGN.from_string("1. d4 d5 2. c4"),
+]
+
+
+def test_position_hashes():
+    """Test that the hashes are produced for every ply, including the starting position."""
+    hashes = position_hashes(GAMES[0])
+    assert len(hashes) == 6
+    assert hashes[0] == Board().zobrist
+    assert len(set(hashes)) == 6
+
+
+def test_transposition():
+    """Test that the same position reached through a different move order hashes equally."""
+    assert position_hashes(GAMES[0])[4] == position_hashes(GAMES[1])[4]
+
+
+def test_en_passant_doesnt_break_transposition():
+    """Test that an en-passant square only affects the hash when the capture is possible."""
+    first = position_hashes(PGN.from_string("1. e4 Nf6 2. Nf3"))
+    second = position_hashes(PGN.from_string("1. Nf3 Nf6 2. e4"))
+    assert first[-1] == second[-1]
+
+
+def test_index_lookup():
+    """Test that the index finds all games reaching a position, including transpositions."""
+    index = PositionIndex()
+    index.add_games(GAMES)
+
+    board = Board()
+    for move in ("e4", "e5", "Nf3", "Nc6"):
+        board.push_san(move)
+
+    assert index.lookup(board) == [(0, 4), (1, 4)]
+    assert index.games(board) == [0, 1]
+    assert index.games(Board()) == [0, 1, 2]
+    assert index.lookup(0) == []
+
+
+def test_index_persistence(tmp_path: Path):
+    """Test that the index can be saved to disk and loaded back."""
+    index = PositionIndex()
+    index.add_games(GAMES)
+    index.save(tmp_path / "positions.idx")
+
+    loaded = PositionIndex.load(tmp_path / "positions.idx")
+    assert len(loaded) == len(index)
+    for h in position_hashes(GAMES[2]):
+        assert loaded.lookup(h) == index.lookup(h)